@@ -1,98 +1,95 @@
-from flask import Flask, send_from_directory
+from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from backend.config import Config
 from flask_jwt_extended import JWTManager
-import os
+from backend.replica import REPLICA_BIND, RoutingSession
 
-# Inicializace rozšíření
-db = SQLAlchemy()
+# Inicializace rozšíření (session umí posílat vybraná čtení na read repliku)
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 migrate = Migrate()
 jwt = JWTManager()
 
-def create_app():
-    app = Flask(__name__, static_folder='../frontend/build', static_url_path='')
+def create_app(test_config=None):
+    # Vestavěné static view Flasku je vypnuté, build servíruje backend.static
+    app = Flask(__name__, static_folder=None)
     
-    # Konfigurace
+    # Konfigurace (test_config přepíše hodnoty před inicializací rozšíření)
     app.config.from_object(Config)
+    if test_config:
+        app.config.update(test_config)
     
+    # Profil poolu spojení (pokud ho konfigurace nenastavuje explicitně)
+    from backend.pool import configure_sqlite, engine_options, instrument_engine
+    app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", engine_options(app.config))
+    # Volitelná read replika jako další bind s vlastním poolem
+    from backend.replica import init_replica, replica_bind
+    replica = replica_bind(app.config)
+    if replica:
+        app.config["SQLALCHEMY_BINDS"] = {**app.config.get("SQLALCHEMY_BINDS", {}), REPLICA_BIND: replica}
+
     # Inicializace rozšíření s aplikací
+    from backend.schema import MIGRATIONS_DIR
     db.init_app(app)
-    migrate.init_app(app, db)
+    # Replika nemá vlastní modely: create_all/drop_all pracují jen s primárem
+    db.metadatas.pop(REPLICA_BIND, None)
+    migrate.init_app(app, db, directory=MIGRATIONS_DIR)
     jwt.init_app(app)
+
+    # Parametry hashování hesel (KDF běží v poolu procesů)
+    from backend.hashing import init_hashing
+    init_hashing(app)
+
+    # Cache rozbalených datových klíčů uživatelů (obálkové šifrování hesel)
+    from backend.security import init_security
+    init_security(app)
+
+    # Směrování čtení na repliku a připnutí uživatele na primár po zápisu
+    init_replica(app)
     
-    # Inicializace databáze pro produkci - vytvořit tabulky přímo
+    # Kontrola verze schématu - DDL (alembic upgrade) jen pokud schéma není aktuální
+    from backend.schema import ensure_schema
     with app.app_context():
-        try:
-            # Vytvořit tabulky přímo v PostgreSQL
-            from sqlalchemy import text
-            
-            # Vytvořit tabulku user
-            db.session.execute(text("""
-                CREATE TABLE IF NOT EXISTS "user" (
-                    id SERIAL PRIMARY KEY,
-                    username VARCHAR(150) UNIQUE NOT NULL,
-                    email VARCHAR(150) UNIQUE NOT NULL,
-                    password_hash VARCHAR(255) NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """))
-            
-            # Vytvořit indexy pro user
-            db.session.execute(text("CREATE INDEX IF NOT EXISTS ix_user_created_at ON \"user\" (created_at)"))
-            db.session.execute(text("CREATE INDEX IF NOT EXISTS ix_user_email ON \"user\" (email)"))
-            db.session.execute(text("CREATE INDEX IF NOT EXISTS ix_user_username ON \"user\" (username)"))
-            
-            # Vytvořit tabulku password
-            db.session.execute(text("""
-                CREATE TABLE IF NOT EXISTS password (
-                    id SERIAL PRIMARY KEY,
-                    site VARCHAR(255) NOT NULL,
-                    username VARCHAR(150) NOT NULL,
-                    password_encrypted TEXT NOT NULL,
-                    note TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    user_id INTEGER NOT NULL,
-                    FOREIGN KEY (user_id) REFERENCES "user" (id),
-                    CONSTRAINT uq_user_site_username UNIQUE (user_id, site, username)
-                )
-            """))
-            
-            # Vytvořit indexy pro password
-            db.session.execute(text("CREATE INDEX IF NOT EXISTS ix_password_created_at ON password (created_at)"))
-            db.session.execute(text("CREATE INDEX IF NOT EXISTS ix_password_user_id ON password (user_id)"))
-            
-            db.session.commit()
-            
-        except Exception as e:
-            # Fallback na db.create_all() pokud PostgreSQL selže
-            db.create_all()
-    
+        metrics = instrument_engine(db.engine)
+        # SQLite: WAL a další PRAGMA na každém spojení, zápisy přes zámek zapisovatele
+        configure_sqlite(db.engine, app.config, metrics)
+        if REPLICA_BIND in db.engines:
+            replica_engine = db.engines[REPLICA_BIND]
+            configure_sqlite(replica_engine, app.config, instrument_engine(replica_engine, REPLICA_BIND))
+        ensure_schema(app)
+
     # CORS konfigurace
     from flask_cors import CORS
-    CORS(app, origins=["http://localhost:3000"], supports_credentials=True)
+    CORS(app, origins=["http://localhost:3000"], supports_credentials=True, expose_headers=["X-Next-Cursor"])
     
+    # Metriky (/api/metrics) - registrují se před blueprintem, aby měřily i jeho požadavky
+    from backend.metrics import init_metrics
+    init_metrics(app)
+
+    # Skutečná IP klienta za reverzní proxy (pro limity na IP adresu)
+    if app.config["PROXY_FIX_X_FOR"]:
+        from werkzeug.middleware.proxy_fix import ProxyFix
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config["PROXY_FIX_X_FOR"])
+
+    # Kontrola vstupu pro drahé auth endpointy (rate limit, souběh)
+    from backend.admission import init_admission
+    init_admission(app)
+
+    # Profilování vybraných API požadavků (jen při PROFILING_ENABLED)
+    from backend.profiling import init_profiling
+    init_profiling(app)
+
     # Registrace blueprintu
     from backend.routes import api_bp
     app.register_blueprint(api_bp, url_prefix="/api")
+
+    # CLI příkazy (flask import-passwords, ...)
+    from backend.commands import register_commands
+    register_commands(app)
     
-    # Servírování React build souborů
-    @app.route('/', defaults={'path': ''})
-    @app.route('/<path:path>')
-    def serve_react_app(path):
-        if path.startswith('api/'):
-            # API routes jsou handled jinak
-            return "API route not found", 404
-        
-        if not app.static_folder or not os.path.exists(app.static_folder):
-            return "Static folder not found", 500
-        
-        # Servírování statických souborů
-        if path != "" and os.path.exists(os.path.join(app.static_folder, path)):
-            return send_from_directory(app.static_folder, path)
-        else:
-            # Pro SPA - všechny ostatní routes přesměruj na index.html
-            return send_from_directory(app.static_folder, 'index.html')
+    # Servírování React build souborů z manifestu sestaveného při startu
+    from backend.static import register_static
+    register_static(app, app.config["STATIC_BUILD_DIR"])
     
     # CORS headers pro development
     @app.after_request
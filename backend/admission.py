@@ -0,0 +1,185 @@
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, jsonify, request
+
+from backend.metrics import ADMISSION_REJECTED
+
+try:
+    import redis  # volitelná závislost, jen pro sdílený backend limitů
+except ImportError:  # pragma: no cover - záleží na prostředí
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryBackend:
+    """
+    Token buckety v paměti procesu. Počet klíčů je omezen (LRU); vyřazený klíč
+    začne znovu s plným bucketem, paměť ale nemůže růst s počtem IP adres.
+    """
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, rate: float, burst: float, cost: float = 1) -> tuple[bool, float]:
+        """Odebere `cost` tokenů. Vrací (povoleno, za kolik sekund to zkusit znovu)."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            if tokens >= cost:
+                tokens -= cost
+                allowed, retry_after = True, 0.0
+            else:
+                allowed, retry_after = False, (cost - tokens) / rate
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, retry_after
+
+
+# Atomický token bucket v Redisu; čas bere ze serveru, aby nezáleželo na hodinách workerů
+_REDIS_TAKE = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + (now - ts) * rate)
+local allowed = 0
+local retry = 0
+if tokens >= cost then
+  tokens = tokens - cost
+  allowed = 1
+else
+  retry = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return {allowed, tostring(retry)}
+"""
+
+
+class RedisBackend:
+    """
+    Token buckety sdílené všemi workery a instancemi přes Redis. Při výpadku
+    Redisu se požadavky propouštějí (limit je ochrana, ne podmínka provozu).
+    """
+
+    def __init__(self, url: str, prefix: str = "pm:admission:"):
+        if redis is None:
+            raise RuntimeError("Pro RATE_LIMIT_STORAGE_URL=redis://... je potřeba balíček redis (pip install redis).")
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url, socket_timeout=0.1)
+        self._take = self._client.register_script(_REDIS_TAKE)
+
+    def take(self, key: str, rate: float, burst: float, cost: float = 1) -> tuple[bool, float]:
+        try:
+            allowed, retry_after = self._take(keys=[self.prefix + key], args=[rate, burst, cost])
+        except redis.RedisError as exc:
+            logger.warning("Limit požadavků nelze ověřit v Redisu: %s", exc)
+            return True, 0.0
+        return bool(allowed), float(retry_after)
+
+
+def make_backend(url: str | None, max_keys: int = 100000):
+    """Vytvoří backend podle RATE_LIMIT_STORAGE_URL (prázdné nebo memory:// = paměť procesu)."""
+    if not url or url.startswith("memory://"):
+        return MemoryBackend(max_keys)
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBackend(url)
+    raise ValueError(f"Nepodporované úložiště limitů: {url}")
+
+
+class AdmissionController:
+    """
+    Vstupní kontrola drahých auth endpointů: token bucket na IP adresu, token bucket
+    na účet (email) a omezený počet současně zpracovávaných požadavků v procesu.
+    Nic se nefrontuje - požadavek nad limit hned dostane 429 nebo 503.
+    """
+
+    def __init__(self, config):
+        self.backend = make_backend(config["RATE_LIMIT_STORAGE_URL"], config["RATE_LIMIT_MAX_KEYS"])
+        self.ip_rate = config["AUTH_IP_RATE_PER_MINUTE"] / 60
+        self.ip_burst = config["AUTH_IP_BURST"]
+        self.account_rate = config["AUTH_ACCOUNT_RATE_PER_MINUTE"] / 60
+        self.account_burst = config["AUTH_ACCOUNT_BURST"]
+        self.queue_timeout = config["AUTH_QUEUE_TIMEOUT"]
+        self._slots = threading.BoundedSemaphore(config["AUTH_MAX_CONCURRENT"])
+
+    def check_rate(self, ip: str, account: str | None):
+        """Vrátí None, nebo (důvod, retry_after) při překročení některého bucketu."""
+        allowed, retry_after = self.backend.take(f"ip:{ip}", self.ip_rate, self.ip_burst)
+        if not allowed:
+            return "ip", retry_after
+        if account:
+            allowed, retry_after = self.backend.take(f"account:{account}", self.account_rate, self.account_burst)
+            if not allowed:
+                return "account", retry_after
+        return None
+
+    def acquire(self) -> bool:
+        if self.queue_timeout > 0:
+            return self._slots.acquire(timeout=self.queue_timeout)
+        return self._slots.acquire(blocking=False)
+
+    def release(self):
+        self._slots.release()
+
+
+def init_admission(app):
+    """Vytvoří kontrolér vstupu podle konfigurace (při ADMISSION_ENABLED=false nic)."""
+    if app.config["ADMISSION_ENABLED"]:
+        app.extensions["admission"] = AdmissionController(app.config)
+
+
+def _reject(status, reason, retry_after, message):
+    ADMISSION_REJECTED.labels(request.endpoint or "unknown", reason).inc()
+    error = "Příliš mnoho požadavků" if status == 429 else "Služba je přetížená"
+    response = jsonify({"success": False, "error": error, "message": message, "status_code": status})
+    response.status_code = status
+    response.headers["Retry-After"] = str(max(math.ceil(retry_after), 1))
+    return response
+
+
+def admission_control(account_field: str | None = None):
+    """
+    Dekorátor auth endpointu: před voláním ověří token buckety (IP a volitelně účet
+    podle pole `account_field` v JSON těle) a obsadí jeden slot souběhu.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            controller = current_app.extensions.get("admission")
+            if controller is None:
+                return view(*args, **kwargs)
+
+            account = None
+            if account_field:
+                body = request.get_json(silent=True)
+                # Pole nebo skalár v těle odmítne až view (400), tady jen není z čeho vzít účet
+                value = body.get(account_field) if isinstance(body, dict) else None
+                account = value.strip().lower() if isinstance(value, str) and value.strip() else None
+            limited = controller.check_rate(request.remote_addr or "unknown", account)
+            if limited:
+                reason, retry_after = limited
+                return _reject(429, reason, retry_after, f"Zkuste to znovu za {max(math.ceil(retry_after), 1)} s")
+
+            if not controller.acquire():
+                return _reject(503, "concurrency", 1, "Server zpracovává příliš mnoho přihlášení, zkuste to za chvíli")
+            try:
+                return view(*args, **kwargs)
+            finally:
+                controller.release()
+        return wrapper
+    return decorator
@@ -0,0 +1,107 @@
+"""
+Benchmark offline kontroly uniklých hesel.
+
+Spuštění z kořene repozitáře:
+    python -m backend.benchmarks.bench_breach [--records 100000000] [--lookups 200000]
+    python -m backend.benchmarks.bench_breach --corpus backend/instance/breached.bin
+
+Bez --corpus vygeneruje syntetický korpus s náhodnými hashi přímo v binárním
+formátu (100 milionů záznamů ~ 2,2 GB, výpis HIBP má kolem 900 milionů), jinak
+změří existující soubor z `flask build-breach-corpus`. Měří načtení přes mmap,
+vyhledání nalezených i nenalezených hashů za sekundu, kontrolu hesla včetně
+SHA-1 a dávku count_many jako u auditu trezoru. Stránky souboru zůstávají v cache
+OS, pro studený start je vyprázdni (echo 1 > /proc/sys/vm/drop_caches).
+"""
+import argparse
+import os
+import random
+import struct
+import tempfile
+import time
+
+
+def _generate(path, records, rng):
+    from backend.breach import _HEADER, _RECORD, _SUFFIX_SIZE, MAGIC, PREFIX_BITS
+
+    buckets = 1 << PREFIX_BITS
+    per_bucket, extra = divmod(records, buckets)
+    offsets, total = [], 0
+    with open(path, "wb") as out:
+        out.seek(_HEADER.size + 8 * (buckets + 1))
+        for prefix in range(buckets):
+            count = per_bucket + (prefix < extra)
+            data = rng.randbytes(_SUFFIX_SIZE * count)
+            suffixes = sorted(data[i:i + _SUFFIX_SIZE] for i in range(0, len(data), _SUFFIX_SIZE))
+            out.write(b"".join(_RECORD.pack(s, rng.randint(1, 1000)) for s in suffixes))
+            offsets.append(total)
+            total += count
+        offsets.append(total)
+        out.seek(0)
+        out.write(_HEADER.pack(MAGIC, PREFIX_BITS, _RECORD.size, total))
+        out.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+
+
+def _sample_hits(corpus, count, rng):
+    from backend.breach import _RECORD, _SUFFIX_SIZE, PREFIX_BYTES
+
+    hits = []
+    for _ in range(count):
+        prefix = rng.randrange(1 << (8 * PREFIX_BYTES))
+        lo, hi = corpus._table[prefix], corpus._table[prefix + 1]
+        if lo == hi:
+            continue
+        offset = corpus._base + rng.randrange(lo, hi) * _RECORD.size
+        hits.append(prefix.to_bytes(PREFIX_BYTES, "big") + corpus._mm[offset:offset + _SUFFIX_SIZE])
+    return hits
+
+
+def _rate(name, items, func):
+    start = time.perf_counter()
+    for item in items:
+        func(item)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<28} {len(items) / elapsed:>12.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="existující korpus místo syntetického")
+    parser.add_argument("--records", type=int, default=20_000_000, help="počet záznamů syntetického korpusu")
+    parser.add_argument("--lookups", type=int, default=200_000, help="počet vyhledání na scénář")
+    args = parser.parse_args()
+
+    from backend.breach import BreachCorpus
+
+    rng = random.Random(1)
+    path = args.corpus
+    if path is None:
+        fd, path = tempfile.mkstemp(suffix=".bin")
+        os.close(fd)
+        start = time.perf_counter()
+        _generate(path, args.records, rng)
+        print(f"generování: {args.records} záznamů, {os.path.getsize(path) / 2**30:.2f} GiB, "
+              f"{time.perf_counter() - start:.1f} s")
+    try:
+        start = time.perf_counter()
+        corpus = BreachCorpus(path)
+        print(f"načtení přes mmap: {(time.perf_counter() - start) * 1000:.2f} ms, {corpus.records} záznamů")
+
+        hits = _sample_hits(corpus, args.lookups, rng)
+        misses = [rng.randbytes(20) for _ in range(args.lookups)]
+        passwords = [f"heslo-{rng.getrandbits(64):x}" for _ in range(args.lookups)]
+        assert all(corpus.count_digest(d) for d in hits[:1000])
+
+        print(f"\n{'scénář':<28} {'vyhledání/s':>12}")
+        _rate("nalezené hashe", hits, corpus.count_digest)
+        _rate("nenalezené hashe", misses, corpus.count_digest)
+        _rate("heslo (SHA-1 + vyhledání)", passwords, corpus.count)
+        start = time.perf_counter()
+        corpus.count_many(passwords)
+        print(f"{'count_many (audit trezoru)':<28} {len(passwords) / (time.perf_counter() - start):>12.0f}")
+    finally:
+        if args.corpus is None:
+            os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark formátu uložených hesel: Fernet tokeny vs. binární AES-GCM.
+
+Spuštění z kořene repozitáře:
+    python -m backend.benchmarks.bench_ciphertext [--passwords 20000] [--rows 100000]
+
+Pro hesla typických délek porovná velikost uloženého šifrového textu, počet
+zašifrování a dešifrování za sekundu v jednom vlákně (Fernet hlavním klíčem a
+AES-GCM datovým klíčem) a nakonec velikost
+SQLite souboru s `--rows` řádky v každém formátu (sloupec stejný jako v tabulce
+password).
+"""
+import argparse
+import os
+import random
+import sqlite3
+import string
+import tempfile
+import time
+
+
+def _sqlite_size(tokens):
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    try:
+        with sqlite3.connect(path) as conn:
+            conn.execute("CREATE TABLE password (id INTEGER PRIMARY KEY, password_encrypted BLOB NOT NULL)")
+            conn.executemany("INSERT INTO password (password_encrypted) VALUES (?)", ((t,) for t in tokens))
+        conn.close()
+        return os.path.getsize(path)
+    finally:
+        os.unlink(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--passwords", type=int, default=20000, help="počet hesel pro měření rychlosti")
+    parser.add_argument("--rows", type=int, default=100000, help="počet řádků pro porovnání velikosti databáze")
+    args = parser.parse_args()
+
+    from cryptography.fernet import Fernet
+
+    from backend import security
+
+    rng = random.Random(1)
+    alphabet = string.ascii_letters + string.digits + "!@#$%^&*"
+    data_key = security.DataKey(Fernet.generate_key())
+    context = security.record_context(1, "example.com", "uzivatel")
+    formats = {
+        "Fernet (hlavní klíč)": (None, lambda p: security.fernet.encrypt(p.encode())),
+        "AES-GCM (datový klíč)": (data_key, lambda p: security.encrypt_with_key(data_key, p, context)),
+    }
+
+    print(f"{'délka hesla':<12}" + "".join(f"{name:>26}" for name in formats))
+    for length in (8, 16, 32, 64):
+        password = "".join(rng.choice(alphabet) for _ in range(length))
+        print(f"{length:<12}" + "".join(f"{len(encrypt(password)):>24} B" for _, encrypt in formats.values()))
+
+    passwords = ["".join(rng.choice(alphabet) for _ in range(rng.randint(10, 24))) for _ in range(args.passwords)]
+    print(f"\n{'formát':<26} {'šifrování/s':>12} {'dešifrování/s':>14}")
+    for name, (key, encrypt) in formats.items():
+        start = time.perf_counter()
+        tokens = [encrypt(p) for p in passwords]
+        encrypted = time.perf_counter() - start
+        start = time.perf_counter()
+        plaintexts = [security.decrypt_with_key(key, t, context) for t in tokens]
+        decrypted = time.perf_counter() - start
+        assert plaintexts == passwords
+        print(f"{name:<26} {len(passwords) / encrypted:>12.0f} {len(passwords) / decrypted:>14.0f}")
+
+    rows = [passwords[i % len(passwords)] for i in range(args.rows)]
+    print(f"\n{'formát':<26} {'SQLite soubor':>14}")
+    for name, (_, encrypt) in formats.items():
+        size = _sqlite_size(encrypt(p) for p in rows)
+        print(f"{name:<26} {size / 2**20:>11.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmark hromadného generátoru hesel.
+
+Spuštění z kořene repozitáře:
+    python -m backend.benchmarks.bench_generator [--count 20000] [--repeat 5]
+
+Vypisuje počet vygenerovaných hesel za sekundu pro různé délky a sady znaků
+a pro srovnání i naivní variantu se `secrets.choice` po jednotlivých znacích.
+"""
+import argparse
+import secrets
+import time
+
+from backend.generator import build_charset, generate_passwords, NUMBERS
+
+CHARSETS = {
+    "čísla (10)": NUMBERS,
+    "písmena (52)": build_charset(numbers=False, symbols=False),
+    "alfanum (62)": build_charset(symbols=False),
+    "vše (88)": build_charset(),
+}
+LENGTHS = (8, 16, 32, 64)
+
+
+def _naive(count, length, charset):
+    return ["".join(secrets.choice(charset) for _ in range(length)) for _ in range(count)]
+
+
+def _best_rate(func, count, length, charset, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(count, length, charset)
+        best = min(best, time.perf_counter() - start)
+    return count / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=20000, help="počet hesel v jednom běhu")
+    parser.add_argument("--repeat", type=int, default=5, help="počet opakování (bere se nejlepší)")
+    args = parser.parse_args()
+
+    print(f"{'sada znaků':<14} {'délka':>5} {'batched hesel/s':>16} {'naivní hesel/s':>15} {'zrychlení':>9}")
+    for name, charset in CHARSETS.items():
+        for length in LENGTHS:
+            fast = _best_rate(generate_passwords, args.count, length, charset, args.repeat)
+            naive = _best_rate(_naive, max(args.count // 10, 1), length, charset, 1)
+            print(f"{name:<14} {length:>5} {fast:>16,.0f} {naive:>15,.0f} {fast / naive:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Benchmark ověřování hesel při přihlášení podle velikosti poolu procesů.
+
+Spuštění z kořene repozitáře:
+    python -m backend.benchmarks.bench_hashing [--logins 64] [--threads 8] [--method scrypt]
+
+Simuluje `--threads` souběžných požadavků (jako gthread worker gunicornu), které
+ověřují heslo proti uloženému hashi, a vypisuje počet přihlášení za sekundu
+pro různé velikosti poolu (0 = KDF přímo ve vlákně požadavku).
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.security import generate_password_hash
+
+from backend import hashing
+
+
+def _measure(workers, logins, threads, password_hash):
+    hashing.shutdown_pool()
+    hashing._workers = workers
+    # Zahřátí poolu (spuštění procesů) se do měření nepočítá
+    hashing.verify_password(password_hash, "Test123!")
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as requests:
+        results = list(requests.map(lambda _: hashing.verify_password(password_hash, "Test123!"), range(logins)))
+    elapsed = time.perf_counter() - start
+    assert all(results)
+    return logins / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=64, help="počet ověření v jednom běhu")
+    parser.add_argument("--threads", type=int, default=8, help="počet souběžných požadavků")
+    parser.add_argument("--method", default="scrypt", help="metoda werkzeugu, např. scrypt nebo pbkdf2:sha256:600000")
+    args = parser.parse_args()
+
+    hashing._method = hashing.canonical_method(args.method)
+    password_hash = generate_password_hash("Test123!", hashing._method)
+    cpus = os.cpu_count() or 1
+    counts = sorted({0, 1, 2, 4, cpus})
+
+    print(f"metoda {hashing._method}, {args.threads} souběžných požadavků, {cpus} CPU")
+    print(f"{'workerů':>8} {'přihlášení/s':>13}")
+    for workers in counts:
+        print(f"{workers:>8} {_measure(workers, args.logins, args.threads, password_hash):>13.1f}")
+    hashing.shutdown_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark vyhledávání a našeptávání nad jedním velkým trezorem.
+
+Spuštění z kořene repozitáře:
+    python -m backend.benchmarks.bench_search [--entries 10000] [--queries 200]
+
+Naplní dočasnou SQLite databázi (schéma přes migrace, tedy i s FTS5 indexem)
+a změří p50/p95 latence search_passwords (podřetězec i překlep) a prefixového
+indexu pro našeptávání, zvlášť první sestavení indexu.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+
+def _percentiles(samples):
+    samples = sorted(samples)
+    return samples[len(samples) // 2] * 1000, samples[int(len(samples) * 0.95) - 1] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=10000, help="počet hesel v trezoru")
+    parser.add_argument("--queries", type=int, default=200, help="počet dotazů na scénář")
+    args = parser.parse_args()
+
+    from backend import create_app
+    from backend.benchmarks.seed import seed
+    from backend.models import User
+    from backend.search import get_prefix_index, search_passwords
+
+    db_fd, db_path = tempfile.mkstemp(suffix=".db")
+    try:
+        app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{db_path}"})
+        with app.app_context():
+            seed(1, args.entries)
+            user_id = User.query.first().id
+            rng = random.Random(1)
+            words = ("alpha", "bravo", "charlie", "delta", "echo", "golf", "hotel")
+
+            start = time.perf_counter()
+            get_prefix_index(user_id)
+            print(f"sestavení prefixového indexu: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+            scenarios = {
+                "search podřetězec": lambda: search_passwords(user_id, f"{rng.choice(words)}-{rng.randint(0, 999):03d}"),
+                "search překlep": lambda: search_passwords(user_id, rng.choice(words)[:-1] + "x"),
+                "suggest prefix": lambda: get_prefix_index(user_id).lookup(rng.choice(words)[:rng.randint(1, 4)], 10),
+            }
+            print(f"\n{'scénář':<20} {'p50 ms':>8} {'p95 ms':>8}")
+            for name, func in scenarios.items():
+                samples = []
+                for _ in range(args.queries):
+                    start = time.perf_counter()
+                    func()
+                    samples.append(time.perf_counter() - start)
+                p50, p95 = _percentiles(samples)
+                print(f"{name:<20} {p50:>8.2f} {p95:>8.2f}")
+    finally:
+        os.close(db_fd)
+        os.unlink(db_path)
+
+
+if __name__ == "__main__":
+    main()
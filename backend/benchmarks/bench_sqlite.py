@@ -0,0 +1,159 @@
+"""
+Benchmark souběžného přístupu k SQLite: původní nastavení vs. profil sqlite s PRAGMA.
+
+Spuštění z kořene repozitáře:
+    python -m backend.benchmarks.bench_sqlite [--processes 2] [--threads 8] [--seconds 5]
+        [--write-ratio 0.1] [--rows 20000]
+
+Pro každou variantu vytvoří novou dočasnou databázi s tabulkami user a password,
+naplní ji `--rows` hesly a spustí `--processes` procesů (jako workery gunicornu)
+po `--threads` vláknech. Každé vlákno opakuje operace podobné API: čtení je
+stránka trezoru (GET /api/passwords), zápis je transakce jako POST /api/passwords
+(SELECT uživatele, INSERT hesla, UPDATE verze trezoru). Vypíše operace za sekundu,
+p50/p95/p99 čtení a zápisů a počet chyb "database is locked".
+
+Varianty:
+    původní   - pool z profilu sqlite bez PRAGMA (rollback žurnál, synchronous=FULL),
+    WAL       - PRAGMA ze SQLITE_* bez zámku zapisovatele,
+    WAL+zámek - PRAGMA a serializace zápisů (výchozí nastavení aplikace).
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+
+VARIANTS = {
+    "původní": {"pragmas": False, "serialize": False},
+    "WAL": {"pragmas": True, "serialize": False},
+    "WAL+zámek": {"pragmas": True, "serialize": True},
+}
+USERS = 50
+
+
+def _config(uri, variant):
+    from backend.config import Config
+
+    config = {name: getattr(Config, name) for name in dir(Config) if name.isupper()}
+    config.update(SQLALCHEMY_DATABASE_URI=uri, DB_POOL_PROFILE="sqlite", SQLITE_SERIALIZE_WRITES=variant["serialize"])
+    return config
+
+
+def _engine(uri, variant):
+    from sqlalchemy import create_engine
+
+    from backend.pool import configure_sqlite, engine_options
+
+    config = _config(uri, variant)
+    engine = create_engine(uri, **engine_options(config))
+    if variant["pragmas"]:
+        configure_sqlite(engine, config)
+    return engine
+
+
+def _seed(uri, rows):
+    from sqlalchemy import create_engine, text
+
+    engine = create_engine(uri)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE user (id INTEGER PRIMARY KEY, username TEXT, vault_version INTEGER NOT NULL)"))
+        conn.execute(text("CREATE TABLE password (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, site TEXT, "
+                          "username TEXT, password_encrypted BLOB, created_at REAL)"))
+        conn.execute(text("CREATE INDEX ix_password_user ON password (user_id, id)"))
+        conn.execute(text("INSERT INTO user (id, username, vault_version) VALUES (:id, :name, 0)"),
+                     [{"id": i, "name": f"user{i}"} for i in range(1, USERS + 1)])
+        conn.execute(text("INSERT INTO password (user_id, site, username, password_encrypted, created_at) "
+                          "VALUES (:user_id, :site, 'u', :blob, :ts)"),
+                     [{"user_id": i % USERS + 1, "site": f"site{i}.com", "blob": os.urandom(45), "ts": time.time()}
+                      for i in range(rows)])
+    engine.dispose()
+
+
+def _worker(uri, variant, threads, seconds, write_ratio, seed):
+    import sqlite3
+    import threading
+
+    from sqlalchemy import exc, text
+
+    engine = _engine(uri, variant)
+    reads, writes, errors = [], [], []
+    deadline = time.perf_counter() + seconds
+
+    def run(thread_seed):
+        rng = random.Random(thread_seed)
+        while time.perf_counter() < deadline:
+            user_id = rng.randint(1, USERS)
+            start = time.perf_counter()
+            try:
+                if rng.random() < write_ratio:
+                    with engine.begin() as conn:
+                        conn.execute(text("SELECT id, vault_version FROM user WHERE id = :id"), {"id": user_id}).one()
+                        conn.execute(text("INSERT INTO password (user_id, site, username, password_encrypted, created_at) "
+                                          "VALUES (:id, 'new.com', 'u', :blob, :ts)"),
+                                     {"id": user_id, "blob": os.urandom(45), "ts": time.time()})
+                        conn.execute(text("UPDATE user SET vault_version = vault_version + 1 WHERE id = :id"),
+                                     {"id": user_id})
+                    writes.append(time.perf_counter() - start)
+                else:
+                    with engine.connect() as conn:
+                        conn.execute(text("SELECT id, site, username, password_encrypted FROM password "
+                                          "WHERE user_id = :id ORDER BY id LIMIT 50"), {"id": user_id}).all()
+                    reads.append(time.perf_counter() - start)
+            except (exc.OperationalError, sqlite3.OperationalError):
+                errors.append(time.perf_counter() - start)
+
+    workers = [threading.Thread(target=run, args=(seed * 1000 + i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    engine.dispose()
+    return reads, writes, errors
+
+
+def _percentile(values, q):
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", type=int, default=2, help="počet procesů (workerů)")
+    parser.add_argument("--threads", type=int, default=8, help="počet vláken v procesu")
+    parser.add_argument("--seconds", type=float, default=5, help="délka měření jedné varianty")
+    parser.add_argument("--write-ratio", type=float, default=0.1, help="podíl zápisů mezi operacemi")
+    parser.add_argument("--rows", type=int, default=20000, help="počet hesel v databázi")
+    args = parser.parse_args()
+
+    print(f"{args.processes} procesy × {args.threads} vláken, {args.write_ratio:.0%} zápisů, {args.seconds:g} s\n")
+    print(f"{'varianta':<11} {'operace/s':>10} {'zápisy/s':>9} {'chyby':>6} "
+          f"{'čtení p50/p95/p99 ms':>22} {'zápis p50/p95/p99 ms':>22}")
+    context = multiprocessing.get_context("spawn")
+    for name, variant in VARIANTS.items():
+        tmpdir = tempfile.mkdtemp(prefix="bench-sqlite-")
+        path = os.path.join(tmpdir, "app.db")
+        uri = f"sqlite:///{path}"
+        try:
+            _seed(uri, args.rows)
+            with context.Pool(args.processes) as pool:
+                results = pool.starmap(_worker, [(uri, variant, args.threads, args.seconds, args.write_ratio, i)
+                                                 for i in range(args.processes)])
+            reads = [t for r, _, _ in results for t in r]
+            writes = [t for _, w, _ in results for t in w]
+            errors = sum(len(e) for _, _, e in results)
+            read_p = "/".join(f"{_percentile(reads, q):.1f}" for q in (0.5, 0.95, 0.99))
+            write_p = "/".join(f"{_percentile(writes, q):.1f}" for q in (0.5, 0.95, 0.99))
+            print(f"{name:<11} {(len(reads) + len(writes)) / args.seconds:>10.0f} {len(writes) / args.seconds:>9.0f} "
+                  f"{errors:>6} {read_p:>22} {write_p:>22}")
+        finally:
+            for suffix in ("", "-wal", "-shm", "-journal"):
+                if os.path.exists(path + suffix):
+                    os.unlink(path + suffix)
+            os.rmdir(tmpdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark studeného startu aplikace (jako nový gunicorn worker).
+
+Spuštění z kořene repozitáře:
+    python -m backend.benchmarks.bench_startup [--runs 10] [--database-url URL]
+
+Každý běh je samostatný proces, který importuje backend a zavolá create_app().
+Vypisuje čas importu, čas create_app() a počet SQL příkazů (z toho DDL), a to
+zvlášť pro první start nad prázdnou databází a pro starty nad aktuálním schématem.
+Bez --database-url se použije dočasná SQLite databáze.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_CHILD = r"""
+import json, time
+t0 = time.perf_counter()
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+statements = []
+event.listen(Engine, "before_cursor_execute", lambda c, cur, stmt, *a: statements.append(stmt))
+from backend import create_app
+t1 = time.perf_counter()
+create_app()
+t2 = time.perf_counter()
+ddl = [s for s in statements if s.lstrip().split(None, 1)[0].upper() in ("CREATE", "ALTER", "DROP")]
+print(json.dumps({"import": t1 - t0, "create_app": t2 - t1, "sql": len(statements), "ddl": len(ddl)}))
+"""
+
+
+def _run_child(database_url):
+    env = dict(os.environ, DATABASE_URL=database_url, PYTHONPATH=REPO_ROOT, PASSWORD_HASH_WORKERS="0")
+    out = subprocess.run([sys.executable, "-c", _CHILD], env=env, check=True, capture_output=True, text=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _report(label, results):
+    ms = lambda key: statistics.median(r[key] for r in results) * 1000
+    print(f"{label:<22} {ms('import'):>9.1f} {ms('create_app'):>14.1f} {results[-1]['sql']:>6} {results[-1]['ddl']:>5}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="počet startů nad aktuálním schématem")
+    parser.add_argument("--database-url", help="databáze pro měření (výchozí: dočasná SQLite)")
+    args = parser.parse_args()
+
+    tmp = None
+    database_url = args.database_url
+    if not database_url:
+        tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+        tmp.close()
+        os.unlink(tmp.name)
+        database_url = f"sqlite:///{tmp.name}"
+
+    try:
+        print(f"{'scénář':<22} {'import ms':>9} {'create_app ms':>14} {'SQL':>6} {'DDL':>5}")
+        _report("první start", [_run_child(database_url)])
+        _report("aktuální schéma", [_run_child(database_url) for _ in range(args.runs)])
+    finally:
+        if tmp:
+            os.unlink(tmp.name)
+
+
+if __name__ == "__main__":
+    main()
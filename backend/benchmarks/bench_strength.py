@@ -0,0 +1,75 @@
+"""
+Benchmark odhadu síly hesel.
+
+Spuštění z kořene repozitáře:
+    python -m backend.benchmarks.bench_strength [--passwords 5000]
+
+Zkompiluje slovníky do dočasného souboru, změří jejich načtení přes mmap
+a počet ohodnocených hesel za sekundu pro typická slabá hesla, slova s čísly
+a náhodná hesla z generátoru. Nakonec ohodnotí "trezor" s opakujícími se
+hesly přes score_many.
+"""
+import argparse
+import os
+import random
+import string
+import tempfile
+import time
+
+
+def _samples(count, rng):
+    from backend.strength import WORDLIST_DIR
+
+    with open(os.path.join(WORDLIST_DIR, "passwords.txt"), encoding="utf-8") as f:
+        common = [line.strip() for line in f if line.strip()]
+    with open(os.path.join(WORDLIST_DIR, "english.txt"), encoding="utf-8") as f:
+        words = [line.strip() for line in f if line.strip()]
+    alphabet = string.ascii_letters + string.digits + "!@#$%^&*"
+    return {
+        "běžná hesla": [rng.choice(common) for _ in range(count)],
+        "slovo + číslo": [rng.choice(words).capitalize() + str(rng.randint(0, 9999)) + rng.choice("!.?")
+                          for _ in range(count)],
+        "náhodná (16 znaků)": ["".join(rng.choice(alphabet) for _ in range(16)) for _ in range(count)],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--passwords", type=int, default=5000, help="počet hesel na scénář")
+    args = parser.parse_args()
+
+    from backend.strength import StrengthDictionary, build_dictionary, estimate_strength, score_many
+
+    rng = random.Random(1)
+    fd, path = tempfile.mkstemp(suffix=".dict")
+    os.close(fd)
+    try:
+        start = time.perf_counter()
+        words = build_dictionary(path)
+        print(f"kompilace slovníku: {words} slov, {os.path.getsize(path) / 1024:.1f} KiB, "
+              f"{(time.perf_counter() - start) * 1000:.1f} ms")
+        start = time.perf_counter()
+        dictionary = StrengthDictionary(path)
+        print(f"načtení přes mmap: {(time.perf_counter() - start) * 1000:.2f} ms")
+
+        print(f"\n{'scénář':<22} {'hesel/s':>10} {'průměr skóre':>13}")
+        for name, passwords in _samples(args.passwords, rng).items():
+            start = time.perf_counter()
+            scores = [estimate_strength(p, dictionary=dictionary)["score"] for p in passwords]
+            elapsed = time.perf_counter() - start
+            print(f"{name:<22} {len(passwords) / elapsed:>10.0f} {sum(scores) / len(scores):>13.2f}")
+
+        # Trezor: třetina hesel se opakuje, score_many je počítá jednou
+        unique = ["".join(rng.choice(string.ascii_letters + string.digits) for _ in range(12))
+                  for _ in range(args.passwords * 2 // 3)]
+        vault = unique + [rng.choice(unique) for _ in range(args.passwords - len(unique))]
+        start = time.perf_counter()
+        score_many(vault, dictionary=dictionary)
+        elapsed = time.perf_counter() - start
+        print(f"{'score_many (trezor)':<22} {len(vault) / elapsed:>10.0f}")
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
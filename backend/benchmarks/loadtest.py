@@ -0,0 +1,297 @@
+"""
+Zátěžový benchmark hlavních API endpointů přes skutečný WSGI server (gunicorn).
+
+Spuštění z kořene repozitáře:
+    python -m backend.benchmarks.loadtest [--database-url URL] [--users 20] [--entries 1000]
+        [--requests 500] [--concurrency 8] [--workers 2] [--threads 4]
+        [--save-baseline NAME] [--compare NAME]
+
+Postup: naplní databázi syntetickými uživateli a trezory (backend.benchmarks.seed),
+spustí gunicorn, přihlásí uživatele a postupně zatíží login, seznam hesel,
+zobrazení hesla, hromadné zobrazení, vytvoření, úpravu a smazání. Pro každý
+endpoint vypíše p50/p95/p99 a požadavky za sekundu.
+
+Bez --database-url se použije nová dočasná SQLite databáze; pro PostgreSQL předej
+URL prázdné lokální databáze (např. postgresql+psycopg://localhost/pm_bench).
+Výsledky lze uložit jako baseline (backend/benchmarks/baselines/NAME.json) a další
+běh s ní porovnat; při zhoršení nad --threshold skončí skript s kódem 1.
+"""
+import argparse
+import http.client
+import json
+import os
+import secrets
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+
+class Client:
+    """Jedno keep-alive HTTP spojení na testovaný server."""
+
+    def __init__(self, port, token=None):
+        self.conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        self.token = token
+
+    def request(self, method, path, body=None):
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        payload = json.dumps(body) if body is not None else None
+        self.conn.request(method, path, body=payload, headers=headers)
+        response = self.conn.getresponse()
+        data = response.read()
+        return response.status, (json.loads(data) if data else None)
+
+    def close(self):
+        self.conn.close()
+
+
+# --- Scénáře: (klient, stav vlákna, pořadí požadavku) -> HTTP status ---
+
+def _login(client, state, i):
+    from backend.benchmarks.seed import SEED_PASSWORD, bench_email
+    status, _ = client.request("POST", "/api/login", {"email": bench_email(state["user"]), "password": SEED_PASSWORD})
+    return status
+
+
+def _list(client, state, i):
+    return client.request("GET", "/api/passwords")[0]
+
+
+def _list_page(client, state, i):
+    return client.request("GET", "/api/passwords?limit=100")[0]
+
+
+def _reveal(client, state, i):
+    pid = state["ids"][i % len(state["ids"])]
+    return client.request("GET", f"/api/passwords/{pid}/reveal")[0]
+
+
+def _reveal_batch(client, state, i):
+    start = (i * 50) % max(len(state["ids"]) - 50, 1)
+    return client.request("POST", "/api/passwords/reveal", {"ids": state["ids"][start:start + 50]})[0]
+
+
+def _create(client, state, i):
+    status, body = client.request("POST", "/api/passwords", {
+        "site": f"load-{state['thread']}-{i}.example", "username": "load", "password": f"Load{i}!"
+    })
+    if status == 200:
+        state["created"].append(body["id"])
+    return status
+
+
+def _update(client, state, i):
+    pid = state["created"][i % len(state["created"])]
+    return client.request("PUT", f"/api/passwords/{pid}", {"password": f"Updated{i}!"})[0]
+
+
+def _delete(client, state, i):
+    if not state["created"]:
+        return 0
+    return client.request("DELETE", f"/api/passwords/{state['created'].pop()}")[0]
+
+
+SCENARIOS = [
+    ("POST /api/login", _login),
+    ("GET /api/passwords", _list),
+    ("GET /api/passwords?limit=100", _list_page),
+    ("GET /api/passwords/<id>/reveal", _reveal),
+    ("POST /api/passwords/reveal (50)", _reveal_batch),
+    ("POST /api/passwords", _create),
+    ("PUT /api/passwords/<id>", _update),
+    ("DELETE /api/passwords/<id>", _delete),
+]
+
+
+def percentile(sorted_values, pct):
+    """Percentil metodou nejbližšího pořadí."""
+    if not sorted_values:
+        return 0.0
+    index = max(int(round(pct / 100 * len(sorted_values))) - 1, 0)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def run_scenario(func, states, port, total_requests):
+    """
+    Spustí scénář ve vláknech (jedno vlákno = jeden stav a jedno spojení)
+    a vrátí statistiky latencí a propustnosti.
+    """
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+    per_thread = max(total_requests // len(states), 1)
+
+    def worker(state):
+        nonlocal errors
+        client = Client(port, state["token"])
+        local, local_errors = [], 0
+        try:
+            for i in range(per_thread):
+                start = time.perf_counter()
+                status = func(client, state, i)
+                local.append(time.perf_counter() - start)
+                if not 200 <= status < 300:
+                    local_errors += 1
+        finally:
+            client.close()
+        with lock:
+            latencies.extend(local)
+            errors += local_errors
+
+    threads = [threading.Thread(target=worker, args=(state,)) for state in states]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_server(env, port, workers, threads):
+    cmd = [
+        sys.executable, "-m", "gunicorn", "-c", os.path.join(REPO_ROOT, "backend", "gunicorn.conf.py"),
+        "--workers", str(workers), "--threads", str(threads), "--bind", f"127.0.0.1:{port}",
+        "--log-level", "warning", "backend.app:app",
+    ]
+    server = subprocess.Popen(cmd, cwd=REPO_ROOT, env=env)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            client = Client(port)
+            status, _ = client.request("GET", "/api/health")
+            client.close()
+            if status == 200:
+                return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("Server se nepodařilo spustit.")
+
+
+def compare(results, baseline, threshold):
+    """Vypíše změny proti baseline a vrátí seznam zhoršených endpointů."""
+    regressions = []
+    print(f"\nSrovnání s baseline ({baseline['label']}), práh {threshold:.0%}:")
+    for name, current in results.items():
+        old = baseline["results"].get(name)
+        if not old:
+            continue
+        p95_change = (current["p95_ms"] - old["p95_ms"]) / old["p95_ms"] if old["p95_ms"] else 0.0
+        rps_change = (current["rps"] - old["rps"]) / old["rps"] if old["rps"] else 0.0
+        worse = p95_change > threshold or rps_change < -threshold
+        if worse:
+            regressions.append(name)
+        print(f"  {name:<34} p95 {p95_change:+7.1%}  rps {rps_change:+7.1%}  {'ZHORŠENÍ' if worse else 'ok'}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="prázdná databáze pro test (výchozí: dočasná SQLite)")
+    parser.add_argument("--users", type=int, default=20, help="počet syntetických uživatelů")
+    parser.add_argument("--entries", type=int, default=1000, help="počet hesel na uživatele")
+    parser.add_argument("--requests", type=int, default=500, help="počet požadavků na scénář")
+    parser.add_argument("--concurrency", type=int, default=8, help="počet souběžných klientů")
+    parser.add_argument("--workers", type=int, default=2, help="počet gunicorn workerů")
+    parser.add_argument("--threads", type=int, default=4, help="počet vláken na worker")
+    parser.add_argument("--seed", type=int, default=42, help="seed generátoru dat")
+    parser.add_argument("--save-baseline", metavar="NAME", help="uložit výsledky jako baseline")
+    parser.add_argument("--compare", metavar="NAME", help="porovnat s uloženou baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="povolené zhoršení p95/rps (0.2 = 20 %%)")
+    args = parser.parse_args()
+
+    tmp_db = None
+    database_url = args.database_url
+    if not database_url:
+        tmp_db = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+        tmp_db.close()
+        os.unlink(tmp_db.name)
+        database_url = f"sqlite:///{tmp_db.name}"
+
+    # Server dostane databázi a klíče přes prostředí. Config tohoto procesu je už
+    # načtený (import balíčku backend), proto se URI pro seed předává přímo.
+    from cryptography.fernet import Fernet
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("FERNET_KEY", Fernet.generate_key().decode())
+    os.environ.setdefault("FINGERPRINT_KEY", secrets.token_hex(32))
+    os.environ.setdefault("FLASK_ENV", "production")
+    os.environ.setdefault("SECRET_KEY", "bench-secret")
+    os.environ.setdefault("JWT_SECRET_KEY", "bench-jwt-secret-key-with-32-bytes!")
+    # Všechny požadavky jdou z jedné IP, limity pro login by měřily jen odmítnutí
+    os.environ.setdefault("ADMISSION_ENABLED", "false")
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+
+    from backend import create_app
+    from backend.benchmarks.seed import SEED_PASSWORD, bench_email, seed
+    app = create_app({"SQLALCHEMY_DATABASE_URI": database_url})
+    with app.app_context():
+        started = time.perf_counter()
+        seeded = seed(args.users, args.entries, args.seed)
+        print(f"Naplněno {seeded['users']} uživatelů, {seeded['entries']} hesel za {time.perf_counter() - started:.1f} s")
+
+    port = _free_port()
+    server = _start_server(env, port, args.workers, args.threads)
+    try:
+        states = []
+        for t in range(args.concurrency):
+            user = t % args.users
+            state = {"thread": t, "user": user, "token": None, "created": []}
+            _, body = Client(port).request("POST", "/api/login", {"email": bench_email(user), "password": SEED_PASSWORD})
+            state["token"] = body["access_token"]
+            state["ids"] = [p["id"] for p in Client(port, state["token"]).request("GET", "/api/passwords")[1]]
+            states.append(state)
+
+        results = {}
+        print(f"\n{'endpoint':<34} {'req':>6} {'chyb':>5} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+        for name, func in SCENARIOS:
+            stats = run_scenario(func, states, port, args.requests)
+            results[name] = stats
+            print(f"{name:<34} {stats['requests']:>6} {stats['errors']:>5} {stats['rps']:>8.1f} "
+                  f"{stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f}")
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+        if tmp_db:
+            os.unlink(tmp_db.name)
+
+    exit_code = 0
+    if args.compare:
+        with open(os.path.join(BASELINE_DIR, f"{args.compare}.json")) as f:
+            if compare(results, json.load(f), args.threshold):
+                exit_code = 1
+    if args.save_baseline:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        meta = {k: getattr(args, k) for k in ("users", "entries", "requests", "concurrency", "workers", "threads")}
+        meta["database"] = database_url.split(":", 1)[0]
+        with open(os.path.join(BASELINE_DIR, f"{args.save_baseline}.json"), "w") as f:
+            json.dump({"label": args.save_baseline, "config": meta, "results": results}, f, indent=2, ensure_ascii=False)
+        print(f"\nBaseline uložena jako {args.save_baseline}")
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
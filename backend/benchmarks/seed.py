@@ -0,0 +1,84 @@
+"""
+Naplnění databáze syntetickými uživateli a trezory pro benchmarky.
+
+Volá se z backend.benchmarks.loadtest, lze ho ale spustit i samostatně:
+    DATABASE_URL=... python -m backend.benchmarks.seed --users 20 --entries 1000
+
+Všichni uživatelé mají stejné heslo (SEED_PASSWORD), KDF se tak počítá jen jednou.
+Každý uživatel dostane vlastní datový klíč a hesla se šifrují jím, stejně jako u
+uživatelů z registrace. Záznamy se vkládají víceřádkovými INSERTy po dávkách.
+"""
+import argparse
+import random
+
+SEED_PASSWORD = "Bench123!"
+_WORDS = ("alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel", "india", "juliet")
+_BATCH = 1000
+
+
+def bench_email(index: int) -> str:
+    return f"bench{index}@example.com"
+
+
+def seed(users: int, entries: int, rng_seed: int = 42) -> dict:
+    """
+    Vytvoří `users` uživatelů s `entries` hesly každý. Musí běžet v app contextu.
+    Vrací {"users": počet, "entries": počet}.
+    """
+    from backend import db
+    from backend.hashing import hash_password
+    from backend.models import Password, User
+    from backend.security import encrypt_text, new_data_key
+
+    rng = random.Random(rng_seed)
+    password_hash = hash_password(SEED_PASSWORD)
+    user_table = User.__table__
+    password_table = Password.__table__
+
+    db.session.execute(user_table.insert(), [
+        {"username": f"bench{i}", "email": bench_email(i), "password_hash": password_hash, "data_key": new_data_key()}
+        for i in range(users)
+    ])
+    db.session.commit()
+    user_ids = [row.id for row in db.session.execute(
+        user_table.select().with_only_columns(user_table.c.id).where(user_table.c.email.like("bench%@example.com"))
+    )]
+
+    total = 0
+    for user_id in user_ids:
+        rows = []
+        for j in range(entries):
+            site = f"{rng.choice(_WORDS)}-{j:05d}.example"
+            username = f"{rng.choice(_WORDS)}{rng.randint(1, 999)}"
+            rows.append({
+                "user_id": user_id,
+                "site": site,
+                "username": username,
+                "password_encrypted": encrypt_text(f"pw-{rng.getrandbits(64):016x}", user_id, site, username),
+            })
+            if len(rows) >= _BATCH:
+                db.session.execute(password_table.insert(), rows)
+                total += len(rows)
+                rows = []
+        if rows:
+            db.session.execute(password_table.insert(), rows)
+            total += len(rows)
+        db.session.commit()
+    return {"users": len(user_ids), "entries": total}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--entries", type=int, default=1000, help="počet hesel na uživatele")
+    parser.add_argument("--seed", type=int, default=42, help="seed generátoru náhodných dat")
+    args = parser.parse_args()
+
+    from backend import create_app
+    app = create_app()
+    with app.app_context():
+        print(seed(args.users, args.entries, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+import hashlib
+import mmap
+import os
+import re
+import shutil
+import struct
+import tempfile
+import threading
+
+DEFAULT_CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "instance", "breached.bin")
+
+# --- Korpus uniklých hesel -------------------------------------------------
+# Textový výpis ve formátu HIBP ("SHA1:počet" na řádek) se převede na binární
+# soubor se záznamy pevné délky seřazenými podle hashe. Soubor se mapuje přes
+# mmap, takže všechny workery gunicornu sdílejí jeho stránky v cache OS.
+# Formát (little endian):
+#   hlavička: magic 8 B, bitů prefixu u32, velikost záznamu u32, počet záznamů u64
+#   tabulka prefixů: u64[2^16 + 1] - index prvního záznamu s daným 2B prefixem
+#   záznamy: zbytek SHA-1 (18 B) + počet výskytů u32
+# Vyhledání tak skončí binárním půlením uvnitř jednoho prefixu (~N / 65536 záznamů).
+
+MAGIC = b"PMBRCH01"
+PREFIX_BITS = 16
+PREFIX_BYTES = PREFIX_BITS // 8
+_HEADER = struct.Struct("<8sIIQ")
+_SUFFIX_SIZE = 20 - PREFIX_BYTES
+_RECORD = struct.Struct(f"<{_SUFFIX_SIZE}sI")
+_BUCKET_RECORD = struct.Struct("<20sI")
+_MAX_COUNT = 0xFFFFFFFF
+_LINE = re.compile(rb"^([0-9A-Fa-f]{40})(?::(\d+))?\s*$")
+
+
+def sha1_digest(password: str) -> bytes:
+    """SHA-1 hesla (UTF-8), stejně jako v korpusu HIBP."""
+    return hashlib.sha1(password.encode("utf-8")).digest()
+
+
+def _parse(line: bytes, plaintext: bool):
+    if plaintext:
+        line = line.rstrip(b"\r\n")
+        return (hashlib.sha1(line).digest(), 1) if line else None
+    match = _LINE.match(line)
+    if not match:
+        return None
+    return bytes.fromhex(match.group(1).decode()), min(int(match.group(2) or 1), _MAX_COUNT)
+
+
+def build_corpus(sources, output: str, plaintext: bool = False) -> dict:
+    """
+    Převede textové výpisy `sources` (binární souborové objekty) do korpusu v
+    `output`. Řádky jsou "SHA1[:počet]" jako ve výpisu HIBP, s `plaintext` jedno
+    heslo na řádek. Vstup nemusí být seřazený: záznamy se nejdřív rozdělí podle
+    prvního bajtu hashe do 256 dočasných souborů a každý se seřadí v paměti, takže
+    stačí paměť na 1/256 korpusu. Duplicitní hashe se sloučí (větší počet).
+    Zápis je atomický. Vrací {"records", "duplicates", "invalid"}.
+    """
+    output = os.path.abspath(output)
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    workdir = tempfile.mkdtemp(prefix="breach-", dir=os.path.dirname(output))
+    stats = {"records": 0, "duplicates": 0, "invalid": 0}
+    try:
+        buckets = [open(os.path.join(workdir, f"{i:02x}"), "wb", buffering=1 << 16) for i in range(256)]
+        try:
+            for source in sources:
+                for line in source:
+                    parsed = _parse(line, plaintext)
+                    if parsed is None:
+                        if line.strip():
+                            stats["invalid"] += 1
+                        continue
+                    digest, count = parsed
+                    buckets[digest[0]].write(_BUCKET_RECORD.pack(digest, count))
+        finally:
+            for bucket in buckets:
+                bucket.close()
+
+        tmp = f"{output}.{os.getpid()}.tmp"
+        table_size = 8 * ((1 << PREFIX_BITS) + 1)
+        prefix_counts = [0] * (1 << PREFIX_BITS)
+        with open(tmp, "wb") as out:
+            out.seek(_HEADER.size + table_size)
+            for first in range(256):
+                path = os.path.join(workdir, f"{first:02x}")
+                with open(path, "rb") as f:
+                    data = f.read()
+                os.unlink(path)
+                size = _BUCKET_RECORD.size
+                records = sorted(data[i:i + size] for i in range(0, len(data), size))
+                del data
+                chunk = []
+                previous, best = None, 0
+                for record in records:
+                    digest = record[:20]
+                    count = int.from_bytes(record[20:], "little")
+                    if digest == previous:
+                        stats["duplicates"] += 1
+                        best = max(best, count)
+                        continue
+                    if previous is not None:
+                        chunk.append(_RECORD.pack(previous[PREFIX_BYTES:], best))
+                        prefix_counts[int.from_bytes(previous[:PREFIX_BYTES], "big")] += 1
+                    previous, best = digest, count
+                if previous is not None:
+                    chunk.append(_RECORD.pack(previous[PREFIX_BYTES:], best))
+                    prefix_counts[int.from_bytes(previous[:PREFIX_BYTES], "big")] += 1
+                out.write(b"".join(chunk))
+                stats["records"] += len(chunk)
+
+            offsets, total = [], 0
+            for count in prefix_counts:
+                offsets.append(total)
+                total += count
+            offsets.append(total)
+            out.seek(0)
+            out.write(_HEADER.pack(MAGIC, PREFIX_BITS, _RECORD.size, total))
+            out.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+        os.replace(tmp, output)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return stats
+
+
+class BreachCorpus:
+    """Korpus namapovaný z disku; jen čte, sdílí se mezi vlákny."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, prefix_bits, record_size, self.records = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or prefix_bits != PREFIX_BITS or record_size != _RECORD.size:
+            raise ValueError(f"{path} není korpus uniklých hesel.")
+        table_end = _HEADER.size + 8 * ((1 << PREFIX_BITS) + 1)
+        self._table = memoryview(self._mm)[_HEADER.size:table_end].cast("Q")
+        self._base = table_end
+        if len(self._mm) != self._base + self.records * _RECORD.size:
+            raise ValueError(f"{path} je poškozený (nesedí velikost).")
+
+    def count_digest(self, digest: bytes) -> int:
+        """Počet výskytů SHA-1 `digest` v únicích, 0 pokud v korpusu není."""
+        prefix = int.from_bytes(digest[:PREFIX_BYTES], "big")
+        lo, hi = self._table[prefix], self._table[prefix + 1]
+        suffix = digest[PREFIX_BYTES:]
+        mm, base, size = self._mm, self._base, _RECORD.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = base + mid * size
+            key = mm[offset:offset + _SUFFIX_SIZE]
+            if key < suffix:
+                lo = mid + 1
+            elif key > suffix:
+                hi = mid
+            else:
+                return int.from_bytes(mm[offset + _SUFFIX_SIZE:offset + size], "little")
+        return 0
+
+    def count(self, password: str) -> int:
+        """Počet výskytů hesla v únicích, 0 pokud v korpusu není."""
+        return self.count_digest(sha1_digest(password))
+
+    def count_many(self, passwords) -> list[int]:
+        """
+        Počty výskytů pro seznam hesel ve stejném pořadí. Opakovaná hesla se hledají
+        jednou a hashe se procházejí seřazené, takže sousední dotazy čtou blízké stránky.
+        """
+        digests = {p: sha1_digest(p) for p in dict.fromkeys(passwords)}
+        counts = {d: self.count_digest(d) for d in sorted(set(digests.values()))}
+        return [counts[digests[p]] for p in passwords]
+
+
+_corpora = {}
+_corpora_lock = threading.Lock()
+
+
+def get_corpus(path: str | None = None) -> BreachCorpus | None:
+    """
+    Vrátí namapovaný korpus (jeden na proces), nebo None, pokud soubor neexistuje -
+    kontrola úniků je pak vypnutá. Po přegenerování souboru (nový inode) se
+    namapuje znovu, restart workerů není potřeba.
+    """
+    path = path or DEFAULT_CORPUS_PATH
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    key = (stat.st_ino, stat.st_mtime_ns)
+    cached = _corpora.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    with _corpora_lock:
+        cached = _corpora.get(path)
+        if cached is None or cached[0] != key:
+            _corpora[path] = (key, BreachCorpus(path))
+        return _corpora[path][1]
@@ -0,0 +1,130 @@
+from datetime import datetime
+
+from sqlalchemy import case, delete, select, update
+
+from backend import db
+from backend.models import Password
+from backend.security import decrypt_many, encrypt_many, fingerprint_text
+from backend.sync import record_tombstones
+from backend.versioning import bump_vault_version
+
+# Sloupce, které lze hromadně měnit (pole v požadavku -> sloupec)
+UPDATABLE_FIELDS = {
+    "site": "site",
+    "username": "username",
+    "password": "password_encrypted",
+}
+
+
+class BulkRequestError(ValueError):
+    """Tělo hromadného požadavku je neplatné."""
+
+
+def _is_id(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def parse_ids(ids, max_ids: int) -> list[int]:
+    """Ověří seznam id a vrátí ho bez duplicit v původním pořadí."""
+    if not isinstance(ids, list) or not ids or not all(_is_id(i) for i in ids):
+        raise BulkRequestError("Pole `ids` musí být neprázdný seznam celých čísel")
+    ids = list(dict.fromkeys(ids))
+    if len(ids) > max_ids:
+        raise BulkRequestError(f"Najednou lze zpracovat nejvýše {max_ids} hesel")
+    return ids
+
+
+def parse_updates(updates, max_ids: int) -> dict:
+    """Ověří seznam změn [{id, site?, username?, password?}] a vrátí {id: změny}."""
+    if not isinstance(updates, list) or not updates:
+        raise BulkRequestError("Pole `updates` musí být neprázdný seznam změn")
+    if len(updates) > max_ids:
+        raise BulkRequestError(f"Najednou lze zpracovat nejvýše {max_ids} hesel")
+    parsed = {}
+    for item in updates:
+        if not isinstance(item, dict) or not _is_id(item.get("id")):
+            raise BulkRequestError("Každá změna musí být objekt s celočíselným `id`")
+        pid = item["id"]
+        if pid in parsed:
+            raise BulkRequestError(f"Heslo {pid} je v požadavku vícekrát")
+        changes = {field: item[field] for field in UPDATABLE_FIELDS if field in item}
+        if not changes:
+            raise BulkRequestError(f"U hesla {pid} chybí změna (site, username nebo password)")
+        if not all(isinstance(v, str) and v for v in changes.values()):
+            raise BulkRequestError(f"U hesla {pid} nesmí být web, uživatelské jméno ani heslo prázdné")
+        parsed[pid] = changes
+    return parsed
+
+
+def bulk_update(user_id: int, updates: dict, max_workers: int = 4) -> tuple[list[int], list[int]]:
+    """
+    Provede změny {id: {pole: hodnota}} jedním UPDATE ... WHERE user_id = ... AND
+    id IN (...) s CASE výrazem pro každý měněný sloupec. Nová hesla a hesla
+    přejmenovaných záznamů (šifrový text je svázaný s webem a uživatelským jménem)
+    se zašifrují dávkově předem; přejmenování hesla, které nejde dešifrovat, se
+    vynechá. Vrací (změněná id, id s chybou dešifrování); commit je na volajícím
+    (IntegrityError při kolizi webu a uživatelského jména se nezachytává).
+    """
+    table = Password.__table__
+    current = {r.id: r for r in db.session.execute(
+        select(table.c.id, table.c.site, table.c.username, table.c.password_encrypted)
+        .where(table.c.user_id == user_id, table.c.id.in_(list(updates)))
+    )}
+    targets = {pid: (changes.get("site", current[pid].site), changes.get("username", current[pid].username))
+               for pid, changes in updates.items() if pid in current}
+    with_password = [pid for pid in targets if "password" in updates[pid]]
+    renamed = [pid for pid in targets if "password" not in updates[pid]
+               and targets[pid] != (current[pid].site, current[pid].username)]
+    decrypted = dict(zip(renamed, decrypt_many([current[pid].password_encrypted for pid in renamed], user_id=user_id,
+                                               max_workers=max_workers,
+                                               records=[(current[pid].site, current[pid].username) for pid in renamed])))
+    failed = [pid for pid in renamed if isinstance(decrypted[pid], Exception)]
+    if failed:
+        updates = {pid: changes for pid, changes in updates.items() if pid not in failed}
+        if not updates:
+            return [], failed
+    renamed = [pid for pid in renamed if pid not in failed]
+    plaintexts = [decrypted[pid] for pid in renamed]
+    passwords = [updates[pid]["password"] for pid in with_password] + plaintexts
+    reencrypt = with_password + renamed
+    tokens = dict(zip(reencrypt, encrypt_many(passwords, user_id=user_id, max_workers=max_workers,
+                                              records=[targets[pid] for pid in reencrypt])))
+
+    values = {}
+    for field, column_name in UPDATABLE_FIELDS.items():
+        if field == "password":
+            mapping = tokens
+        else:
+            mapping = {pid: changes[field] for pid, changes in updates.items() if field in changes}
+        if mapping:
+            values[column_name] = case(mapping, value=table.c.id, else_=table.c[column_name])
+
+    if with_password:
+        values["fingerprint"] = case(
+            {pid: fingerprint_text(user_id, updates[pid]["password"]) for pid in with_password},
+            value=table.c.id, else_=table.c.fingerprint,
+        )
+
+    version = bump_vault_version(user_id)
+    values.update(change_version=version, updated_at=datetime.utcnow())
+    result = db.session.execute(
+        update(table)
+        .where(table.c.user_id == user_id, table.c.id.in_(list(updates)))
+        .values(**values)
+        .returning(table.c.id)
+    )
+    return list(result.scalars()), failed
+
+
+def bulk_delete(user_id: int, ids: list[int]) -> list[int]:
+    """
+    Smaže hesla uživatele jedním DELETE ... WHERE user_id = ... AND id IN (...) a
+    zapíše jejich tombstony. Vrací smazaná id; commit je na volajícím.
+    """
+    table = Password.__table__
+    version = bump_vault_version(user_id)
+    deleted = list(db.session.execute(
+        delete(table).where(table.c.user_id == user_id, table.c.id.in_(ids)).returning(table.c.id)
+    ).scalars())
+    record_tombstones(user_id, deleted, version)
+    return deleted
@@ -0,0 +1,170 @@
+from datetime import datetime, timedelta
+
+import click
+from flask import current_app
+
+from backend.models import User
+
+
+def _get_user_or_fail(email):
+    user = User.query.filter_by(email=email).first()
+    if not user:
+        raise click.ClickException(f"Uživatel s emailem {email} neexistuje.")
+    return user
+
+
+@click.command("import-passwords")
+@click.argument("file", type=click.File("rb"))
+@click.option("--user", "email", required=True, help="Email uživatele, do jehož trezoru se importuje.")
+@click.option("--format", "fmt", type=click.Choice(["csv", "json", "ndjson"]), help="Formát souboru (jinak podle přípony).")
+@click.option("--on-conflict", type=click.Choice(["skip", "update"]), default="skip", show_default=True,
+              help="Co dělat se záznamem, který už pro daný web a uživatelské jméno existuje.")
+def import_passwords_command(file, email, fmt, on_conflict):
+    """Naimportuje hesla ze souboru CSV/JSON/NDJSON do trezoru uživatele."""
+    from backend.importer import VaultImportError, detect_format, import_vault
+
+    user = _get_user_or_fail(email)
+    try:
+        stats = import_vault(
+            user.id,
+            file,
+            detect_format(file.name, fmt),
+            on_conflict=on_conflict,
+            batch_size=current_app.config["IMPORT_BATCH_SIZE"],
+            workers=current_app.config["IMPORT_WORKERS"],
+        )
+    except VaultImportError as exc:
+        raise click.ClickException(str(exc))
+    click.echo(
+        f"Zpracováno {stats['processed']}, importováno {stats['imported']}, "
+        f"přeskočeno {stats['skipped']}, neplatných {stats['invalid']}."
+    )
+    for error in stats["errors"]:
+        click.echo(f"  řádek {error['row']}: {error['message']}", err=True)
+
+
+@click.command("rotate-keys")
+@click.option("--batch-size", type=int, help="Počet řádků v jedné dávce (výchozí KEY_ROTATION_BATCH_SIZE).")
+@click.option("--workers", type=int, help="Počet vláken pro přešifrování (výchozí KEY_ROTATION_WORKERS).")
+@click.option("--rate", type=float, help="Max. počet řádků za sekundu, 0 = bez omezení (výchozí KEY_ROTATION_RATE).")
+@click.option("--checkpoint", type=click.Path(dir_okay=False), help="Soubor s postupem rotace (výchozí KEY_ROTATION_CHECKPOINT).")
+@click.option("--restart", is_flag=True, help="Ignorovat uložený checkpoint a začít od začátku.")
+def rotate_keys_command(batch_size, workers, rate, checkpoint, restart):
+    """Přešifruje datové klíče uživatelů a starší hesla primárním klíčem FERNET_KEY (starší klíče ve FERNET_OLD_KEYS)."""
+    from backend.rotation import rotate_keys
+
+    config = current_app.config
+
+    def report(state):
+        click.echo(f"  id <= {state['last_id']}: přešifrováno {state['rotated']}, "
+                   f"beze změny {state['unchanged']}, chyb {state['failed']}")
+
+    state = rotate_keys(
+        batch_size=batch_size or config["KEY_ROTATION_BATCH_SIZE"],
+        workers=workers or config["KEY_ROTATION_WORKERS"],
+        rate=config["KEY_ROTATION_RATE"] if rate is None else rate,
+        checkpoint=checkpoint or config["KEY_ROTATION_CHECKPOINT"],
+        restart=restart,
+        progress=report,
+    )
+    keys = state["keys"]
+    click.echo(f"Datové klíče: přebaleno {keys['rewrapped']}, beze změny {keys['unchanged']}, chyb {keys['failed']}.")
+    click.echo(f"Hotovo: zpracováno {state['scanned']}, přešifrováno {state['rotated']}, "
+               f"beze změny {state['unchanged']}, chyb {state['failed']}.")
+    if keys["failed"]:
+        raise click.ClickException(f"{keys['failed']} datových klíčů nejde dešifrovat žádným klíčem.")
+    if state["failed"]:
+        raise click.ClickException(
+            f"{state['failed']} záznamů nejde dešifrovat žádným klíčem (např. id {state['failed_ids'][:10]})."
+        )
+
+
+@click.command("envelope-migrate")
+@click.option("--batch-size", type=int, help="Počet řádků v jedné dávce (výchozí KEY_ROTATION_BATCH_SIZE).")
+@click.option("--workers", type=int, help="Počet vláken pro přešifrování (výchozí KEY_ROTATION_WORKERS).")
+def envelope_migrate_command(batch_size, workers):
+    """Vytvoří uživatelům datové klíče a přešifruje jimi hesla šifrovaná přímo hlavním klíčem."""
+    from backend.rotation import migrate_to_envelope
+
+    config = current_app.config
+
+    def report(state):
+        click.echo(f"  id <= {state['last_id']}: převedeno {state['migrated']}, chyb {state['failed']}")
+
+    state = migrate_to_envelope(
+        batch_size=batch_size or config["KEY_ROTATION_BATCH_SIZE"],
+        workers=workers or config["KEY_ROTATION_WORKERS"],
+        progress=report,
+    )
+    click.echo(f"Hotovo: nových datových klíčů {state['keys_created']}, zpracováno {state['scanned']}, "
+               f"převedeno {state['migrated']}, chyb {state['failed']}.")
+    if state["failed"]:
+        raise click.ClickException(
+            f"{state['failed']} záznamů nejde dešifrovat žádným klíčem (např. id {state['failed_ids'][:10]})."
+        )
+
+
+@click.command("purge-tombstones")
+@click.option("--days", type=int, help="Smazat záznamy o smazání starší než N dní (výchozí TOMBSTONE_RETENTION_DAYS).")
+def purge_tombstones_command(days):
+    """Vyčistí staré záznamy o smazaných heslech; starší kurzory synchronizace pak vrací 410."""
+    from backend.sync import purge_tombstones
+
+    days = current_app.config["TOMBSTONE_RETENTION_DAYS"] if days is None else days
+    purged = purge_tombstones(datetime.utcnow() - timedelta(days=days))
+    click.echo(f"Smazáno {purged} záznamů o smazání starších než {days} dní.")
+
+
+@click.command("backfill-fingerprints")
+@click.option("--batch-size", type=int, default=1000, show_default=True, help="Počet řádků v jedné dávce.")
+@click.option("--workers", type=int, help="Počet vláken pro dešifrování (výchozí CRYPTO_WORKERS).")
+@click.option("--all", "recompute", is_flag=True, help="Přepočítat všechny otisky (po změně FINGERPRINT_KEY).")
+def backfill_fingerprints_command(batch_size, workers, recompute):
+    """Doplní otisky hesel pro hledání opakovaně použitých hesel (GET /api/passwords/reuse)."""
+    from backend.fingerprints import backfill_fingerprints
+
+    def report(state):
+        click.echo(f"  id <= {state['last_id']}: doplněno {state['updated']}, chyb {state['failed']}")
+
+    state = backfill_fingerprints(batch_size=batch_size, workers=workers or current_app.config["CRYPTO_WORKERS"],
+                                  recompute=recompute, progress=report)
+    click.echo(f"Hotovo: zpracováno {state['scanned']}, doplněno {state['updated']}, chyb {state['failed']}.")
+    if state["failed"]:
+        raise click.ClickException(
+            f"{state['failed']} záznamů nejde dešifrovat (např. id {state['failed_ids'][:10]})."
+        )
+
+
+@click.command("build-strength-dict")
+def build_strength_dict_command():
+    """Zkompiluje slovníky pro odhad síly hesel (bez nich vrací odhad síly 503)."""
+    from backend.strength import build_dictionary
+
+    path = current_app.config["STRENGTH_DICT_PATH"]
+    words = build_dictionary(path)
+    click.echo(f"Zkompilováno {words} slov do {path}.")
+
+
+@click.command("build-breach-corpus")
+@click.argument("sources", nargs=-1, required=True, type=click.File("rb"))
+@click.option("--plaintext", is_flag=True, help="Soubory obsahují hesla (jedno na řádek), ne SHA-1 hashe.")
+@click.option("--output", type=click.Path(dir_okay=False), help="Cílový soubor (výchozí BREACH_CORPUS_PATH).")
+def build_breach_corpus_command(sources, plaintext, output):
+    """Převede výpis uniklých hesel (SHA1:počet jako HIBP) do korpusu pro offline kontrolu."""
+    from backend.breach import build_corpus
+
+    output = output or current_app.config["BREACH_CORPUS_PATH"]
+    stats = build_corpus(sources, output, plaintext=plaintext)
+    click.echo(f"Zapsáno {stats['records']} hashů do {output} "
+               f"(duplicit {stats['duplicates']}, neplatných řádků {stats['invalid']}).")
+
+
+def register_commands(app):
+    """Zaregistruje CLI příkazy (`flask <příkaz>`) aplikace."""
+    app.cli.add_command(import_passwords_command)
+    app.cli.add_command(rotate_keys_command)
+    app.cli.add_command(envelope_migrate_command)
+    app.cli.add_command(purge_tombstones_command)
+    app.cli.add_command(backfill_fingerprints_command)
+    app.cli.add_command(build_strength_dict_command)
+    app.cli.add_command(build_breach_corpus_command)
@@ -8,8 +8,40 @@ class Config:
 
     Sekce:
     - Flask: Základní nastavení Flask aplikace (DEBUG, TESTING, ENV, SECRET_KEY).
-    - DB: Nastavení databáze, zde SQLite (SQLALCHEMY_DATABASE_URI, SQLALCHEMY_TRACK_MODIFICATIONS).
+    - DB: Nastavení databáze, zde SQLite (SQLALCHEMY_DATABASE_URI, SQLALCHEMY_TRACK_MODIFICATIONS, SCHEMA_AUTO_MIGRATE)
+      a profil poolu spojení (DB_POOL_PROFILE, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE).
+      Pro SQLite PRAGMA nastavované na každém spojení a serializace zápisů (SQLITE_JOURNAL_MODE,
+      SQLITE_SYNCHRONOUS, SQLITE_BUSY_TIMEOUT_MS, SQLITE_CACHE_SIZE_KB, SQLITE_MMAP_SIZE, SQLITE_SERIALIZE_WRITES).
+      Volitelná read replika a připnutí na primár po zápisu (SQLALCHEMY_REPLICA_URI, REPLICA_PIN_SECONDS,
+      REPLICA_PIN_STORAGE_URL).
     - JWT: Nastavení pro práci s JSON Web Tokeny (JWT_SECRET_KEY, JWT_ACCESS_TOKEN_EXPIRES).
+    - Kontrola vstupu: Limity pro /api/login a /api/register - token buckety na IP a účet, souběh
+      a úložiště stavu (ADMISSION_ENABLED, AUTH_IP_RATE_PER_MINUTE, AUTH_ACCOUNT_RATE_PER_MINUTE,
+      AUTH_MAX_CONCURRENT, RATE_LIMIT_STORAGE_URL) a počet důvěryhodných proxy (PROXY_FIX_X_FOR).
+    - Generátor: Limity pro hromadné generování hesel (GENERATOR_MAX_COUNT, GENERATOR_MAX_LENGTH).
+    - Import: Velikost dávky, počet šifrovacích vláken a max. velikost souboru při importu
+      (IMPORT_BATCH_SIZE, IMPORT_WORKERS, IMPORT_MAX_BYTES).
+    - Export: Počet řádků načítaných serverovým kurzorem najednou (EXPORT_YIELD_PER).
+    - Metriky: Zapnutí /api/metrics a volitelný token pro přístup (METRICS_ENABLED, METRICS_TOKEN).
+    - Profilování: Profilování vybraných API požadavků na vyžádání (PROFILING_ENABLED, PROFILING_TOKEN,
+      PROFILING_SAMPLE_RATE, PROFILING_MODE, PROFILING_DIR, PROFILING_MAX_BYTES).
+    - Static: Adresář s buildem frontendu servírovaným backendem (STATIC_BUILD_DIR).
+    - Seznam hesel: Maximální velikost stránky u GET /api/passwords (PASSWORDS_MAX_LIMIT).
+    - Synchronizace změn: Velikost odpovědi /api/passwords/changes a retence záznamů o smazání
+      (SYNC_MAX_LIMIT, TOMBSTONE_RETENTION_DAYS).
+    - Vyhledávání: Limity výsledků a počet prefixových indexů pro našeptávání v paměti
+      (SEARCH_MAX_LIMIT, SUGGEST_MAX_LIMIT, SEARCH_INDEX_MAX_USERS).
+    - Hromadné zobrazení: Limit počtu id a velikost poolu pro dešifrování (REVEAL_MAX_IDS, CRYPTO_WORKERS).
+    - Datové klíče: Velikost a platnost cache rozbalených datových klíčů uživatelů
+      (DATA_KEY_CACHE_SIZE, DATA_KEY_CACHE_TTL).
+    - Hromadné úpravy: Max. počet hesel v jednom PATCH/DELETE /api/passwords (BULK_MAX_IDS).
+    - Rotace klíčů: Dávka, vlákna, omezení rychlosti a checkpoint pro `flask rotate-keys`
+      (KEY_ROTATION_BATCH_SIZE, KEY_ROTATION_WORKERS, KEY_ROTATION_RATE, KEY_ROTATION_CHECKPOINT).
+    - Síla hesel: Minimální skóre při registraci a cesta ke zkompilovanému slovníku
+      (PASSWORD_MIN_STRENGTH, STRENGTH_DICT_PATH).
+    - Uniklá hesla: Cesta k lokálnímu korpusu SHA-1 hashů uniklých hesel a odmítání takových hesel
+      při registraci (BREACH_CORPUS_PATH, BREACH_CHECK_REGISTRATION).
+    - Hashování hesel: Metoda a parametry KDF a velikost poolu procesů (PASSWORD_HASH_METHOD, PASSWORD_HASH_WORKERS).
     """
 
     # === Flask ===
@@ -35,8 +67,128 @@ class Config:
         SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.join(BASE_DIR, "instance", "app.db")
     
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Pool spojení: auto (podle URI) | direct (PostgreSQL) | pgbouncer (NullPool) | sqlite
+    DB_POOL_PROFILE = os.environ.get("DB_POOL_PROFILE", "auto")
+    DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", 10))
+    DB_POOL_TIMEOUT = int(os.environ.get("DB_POOL_TIMEOUT", 10))  # Max. čekání na volné spojení v sekundách
+    DB_POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", 1800))  # Obnova spojení starších než N sekund
+    DB_POOL_PRE_PING = os.environ.get("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+    # SQLite (profil sqlite): WAL pro souběžná čtení, fsync jen při checkpointu, čekání na zámek místo chyby
+    SQLITE_JOURNAL_MODE = os.environ.get("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS = os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", 5000))
+    SQLITE_CACHE_SIZE_KB = int(os.environ.get("SQLITE_CACHE_SIZE_KB", 16384))  # Cache stránek na spojení
+    SQLITE_MMAP_SIZE = int(os.environ.get("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))
+    # Zápisy v rámci procesu po jednom (zámek od prvního zápisu do konce transakce)
+    SQLITE_SERIALIZE_WRITES = os.environ.get("SQLITE_SERIALIZE_WRITES", "true").lower() in ("1", "true", "yes")
+    # Spustit `alembic upgrade head` při startu, pokud verze schématu neodpovídá migracím.
+    # Při vypnutí je nutné migrovat ručně (`flask db upgrade`) před nasazením.
+    SCHEMA_AUTO_MIGRATE = os.environ.get("SCHEMA_AUTO_MIGRATE", "true").lower() in ("1", "true", "yes")
+    # Volitelná read replika (stejné schéma, replikace z primáru): GET /api/me, GET /api/passwords
+    # a zobrazení hesla čtou z ní. Uživatel, který zapisoval, čte REPLICA_PIN_SECONDS z primáru.
+    SQLALCHEMY_REPLICA_URI = os.environ.get("DATABASE_REPLICA_URL") or None
+    if SQLALCHEMY_REPLICA_URI and SQLALCHEMY_REPLICA_URI.startswith(("postgres://", "postgresql://")):
+        SQLALCHEMY_REPLICA_URI = "postgresql+psycopg://" + SQLALCHEMY_REPLICA_URI.split("://", 1)[1]
+    REPLICA_PIN_SECONDS = float(os.environ.get("REPLICA_PIN_SECONDS", 5))
+    # Prázdné = paměť procesu, redis://host:6379/0 = připnutí sdílené mezi workery
+    REPLICA_PIN_STORAGE_URL = os.environ.get("REPLICA_PIN_STORAGE_URL")
 
     # === JWT ===
     JWT_SECRET_KEY = os.environ.get("JWT_SECRET_KEY", SECRET_KEY)
     JWT_ACCESS_TOKEN_EXPIRES = 3600  # Platnost access tokenu v sekundách (zde 1 hodina)
-    JWT_REFRESH_TOKEN_EXPIRES = 86400  # Platnost refresh tokenu v sekundách (zde 1 den)
\ No newline at end of file
+    JWT_REFRESH_TOKEN_EXPIRES = 86400  # Platnost refresh tokenu v sekundách (zde 1 den)
+
+    # === Kontrola vstupu ===
+    ADMISSION_ENABLED = os.environ.get("ADMISSION_ENABLED", "true").lower() in ("1", "true", "yes")
+    AUTH_IP_RATE_PER_MINUTE = float(os.environ.get("AUTH_IP_RATE_PER_MINUTE", 30))  # Doplňování bucketu na IP adresu
+    AUTH_IP_BURST = float(os.environ.get("AUTH_IP_BURST", 20))  # Max. počet pokusů z jedné IP naráz
+    AUTH_ACCOUNT_RATE_PER_MINUTE = float(os.environ.get("AUTH_ACCOUNT_RATE_PER_MINUTE", 10))  # Na jeden email
+    AUTH_ACCOUNT_BURST = float(os.environ.get("AUTH_ACCOUNT_BURST", 10))
+    # Max. počet současně zpracovávaných přihlášení/registrací v jednom procesu (KDF je drahá)
+    AUTH_MAX_CONCURRENT = int(os.environ.get("AUTH_MAX_CONCURRENT", 2 * (os.cpu_count() or 1)))
+    AUTH_QUEUE_TIMEOUT = float(os.environ.get("AUTH_QUEUE_TIMEOUT", 0))  # Čekání na volný slot v sekundách, 0 = hned 503
+    # Prázdné = paměť procesu (každý worker má vlastní limity), redis://host:6379/0 = sdílené
+    RATE_LIMIT_STORAGE_URL = os.environ.get("RATE_LIMIT_STORAGE_URL")
+    RATE_LIMIT_MAX_KEYS = int(os.environ.get("RATE_LIMIT_MAX_KEYS", 100000))  # Max. počet bucketů v paměti (LRU)
+    # Počet reverzních proxy před aplikací, jejichž X-Forwarded-For se věří (Railway: 1)
+    PROXY_FIX_X_FOR = int(os.environ.get("PROXY_FIX_X_FOR", 0))
+
+    # === Generátor ===
+    GENERATOR_MAX_COUNT = int(os.environ.get("GENERATOR_MAX_COUNT", 50000))  # Max. počet hesel v jednom požadavku
+    GENERATOR_MAX_LENGTH = int(os.environ.get("GENERATOR_MAX_LENGTH", 128))  # Max. délka jednoho hesla
+
+    # === Import ===
+    IMPORT_BATCH_SIZE = int(os.environ.get("IMPORT_BATCH_SIZE", 500))  # Počet řádků v jednom INSERTu/commitu
+    IMPORT_WORKERS = int(os.environ.get("IMPORT_WORKERS", min(os.cpu_count() or 1, 8)))  # Vlákna pro šifrování
+    IMPORT_MAX_BYTES = int(os.environ.get("IMPORT_MAX_BYTES", 10 * 1024 * 1024))  # Max. velikost nahraného souboru (větší = 413)
+
+    # === Export ===
+    EXPORT_YIELD_PER = int(os.environ.get("EXPORT_YIELD_PER", 500))  # Řádků na jedno načtení z kurzoru
+
+    # === Seznam hesel ===
+    PASSWORDS_MAX_LIMIT = int(os.environ.get("PASSWORDS_MAX_LIMIT", 500))  # Max. hodnota parametru `limit`
+
+    # === Synchronizace změn ===
+    SYNC_MAX_LIMIT = int(os.environ.get("SYNC_MAX_LIMIT", 1000))  # Max. počet změn v jedné odpovědi /passwords/changes
+    TOMBSTONE_RETENTION_DAYS = int(os.environ.get("TOMBSTONE_RETENTION_DAYS", 90))  # Po kolika dnech `flask purge-tombstones` maže záznamy o smazání
+
+    # === Vyhledávání ===
+    SEARCH_MAX_LIMIT = int(os.environ.get("SEARCH_MAX_LIMIT", 100))  # Max. počet výsledků /passwords/search
+    SUGGEST_MAX_LIMIT = int(os.environ.get("SUGGEST_MAX_LIMIT", 20))  # Max. počet návrhů /passwords/suggest
+    SEARCH_INDEX_MAX_USERS = int(os.environ.get("SEARCH_INDEX_MAX_USERS", 1000))  # Max. počet indexů v paměti (LRU)
+
+    # === Hromadné zobrazení ===
+    REVEAL_MAX_IDS = int(os.environ.get("REVEAL_MAX_IDS", 1000))  # Max. počet id v jednom požadavku
+    CRYPTO_WORKERS = int(os.environ.get("CRYPTO_WORKERS", min(os.cpu_count() or 1, 8)))  # Vlákna pro dešifrování
+
+    # === Datové klíče ===
+    DATA_KEY_CACHE_SIZE = int(os.environ.get("DATA_KEY_CACHE_SIZE", 10000))  # Max. počet rozbalených klíčů v paměti (LRU)
+    DATA_KEY_CACHE_TTL = float(os.environ.get("DATA_KEY_CACHE_TTL", 300))  # Po kolika sekundách se klíč znovu načte z DB
+
+    # === Hromadné úpravy ===
+    BULK_MAX_IDS = int(os.environ.get("BULK_MAX_IDS", 1000))  # Max. počet hesel v PATCH/DELETE /api/passwords
+
+    # === Rotace klíčů ===
+    KEY_ROTATION_BATCH_SIZE = int(os.environ.get("KEY_ROTATION_BATCH_SIZE", 1000))  # Řádků na jeden commit
+    KEY_ROTATION_WORKERS = int(os.environ.get("KEY_ROTATION_WORKERS", min(os.cpu_count() or 1, 8)))  # Vlákna pro šifrování
+    KEY_ROTATION_RATE = float(os.environ.get("KEY_ROTATION_RATE", 0))  # Max. řádků za sekundu, 0 = bez omezení
+    KEY_ROTATION_CHECKPOINT = os.environ.get("KEY_ROTATION_CHECKPOINT", os.path.join(BASE_DIR, "instance", "key_rotation.json"))
+
+    # === Síla hesel ===
+    # Min. skóre 0–4 odhadu síly hesla při registraci (0 = jen pravidla složitosti)
+    PASSWORD_MIN_STRENGTH = int(os.environ.get("PASSWORD_MIN_STRENGTH", 0))
+    STRENGTH_DICT_PATH = os.environ.get("STRENGTH_DICT_PATH", os.path.join(BASE_DIR, "instance", "strength.dict"))
+
+    # === Uniklá hesla ===
+    # Korpus z `flask build-breach-corpus`; pokud soubor neexistuje, kontrola se přeskakuje
+    BREACH_CORPUS_PATH = os.environ.get("BREACH_CORPUS_PATH") or os.path.join(BASE_DIR, "instance", "breached.bin")
+    BREACH_CHECK_REGISTRATION = os.environ.get("BREACH_CHECK_REGISTRATION", "true").lower() in ("1", "true", "yes")
+
+    # === Hashování hesel ===
+    # Formát werkzeugu, např. "scrypt:32768:8:1" nebo "pbkdf2:sha256:1000000".
+    # Při změně se starší hashe transparentně přehashují při přihlášení.
+    PASSWORD_HASH_METHOD = os.environ.get("PASSWORD_HASH_METHOD", "scrypt")
+    PASSWORD_HASH_SALT_LENGTH = int(os.environ.get("PASSWORD_HASH_SALT_LENGTH", 16))
+    # Procesy KDF na jeden gunicorn worker (0 = bez poolu); výchozí hodnota dělí jádra mezi WEB_CONCURRENCY workerů
+    PASSWORD_HASH_WORKERS = int(os.environ.get(
+        "PASSWORD_HASH_WORKERS", max(1, (os.cpu_count() or 1) // int(os.environ.get("WEB_CONCURRENCY", 1)))
+    ))
+    PASSWORD_HASH_TIMEOUT = int(os.environ.get("PASSWORD_HASH_TIMEOUT", 30))  # Max. čekání na výsledek KDF v sekundách
+
+    # === Static ===
+    STATIC_BUILD_DIR = os.environ.get("STATIC_BUILD_DIR", os.path.normpath(os.path.join(BASE_DIR, "..", "frontend", "build")))
+
+    # === Metriky ===
+    METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+    METRICS_TOKEN = os.environ.get("METRICS_TOKEN")  # Pokud je nastaven, /api/metrics vyžaduje Bearer token
+
+    # === Profilování ===
+    # Vypnuté profilování nepřidává do zpracování požadavku žádný hook
+    PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "false").lower() in ("1", "true", "yes")
+    PROFILING_TOKEN = os.environ.get("PROFILING_TOKEN")  # Hodnota hlavičky X-Profile-Token pro profil na vyžádání
+    PROFILING_SAMPLE_RATE = float(os.environ.get("PROFILING_SAMPLE_RATE", 0.0))  # Podíl náhodně profilovaných požadavků
+    PROFILING_MODE = os.environ.get("PROFILING_MODE", "cprofile")  # cprofile (.pstats) | sample (.collapsed pro flamegraph)
+    PROFILING_SAMPLE_INTERVAL_MS = float(os.environ.get("PROFILING_SAMPLE_INTERVAL_MS", 5))  # Perioda vzorkování
+    PROFILING_DIR = os.environ.get("PROFILING_DIR", os.path.join(BASE_DIR, "instance", "profiles"))
+    PROFILING_MAX_BYTES = int(os.environ.get("PROFILING_MAX_BYTES", 100 * 1024 * 1024))  # Nejstarší profily se mažou
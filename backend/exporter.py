@@ -0,0 +1,78 @@
+import csv
+import io
+import json
+
+from sqlalchemy import select
+
+from backend import db
+from backend.models import Password
+from backend.security import decrypt_text
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+EXPORT_FIELDS = ("site", "username", "password", "note", "created_at")
+
+# Velikost výstupního bloku, po jehož naplnění se data odešlou klientovi
+_FLUSH_BYTES = 64 * 1024
+
+
+def iter_export_rows(user_id: int, yield_per: int = 500):
+    """
+    Prochází hesla uživatele serverovým kurzorem (yield_per) a dešifruje je až
+    v okamžiku, kdy se řádek skutečně odesílá. V paměti je vždy jen jedna dávka.
+    """
+    stmt = (
+        select(Password.site, Password.username, Password.password_encrypted, Password.note, Password.created_at)
+        .where(Password.user_id == user_id)
+        .order_by(Password.id)
+        .execution_options(yield_per=yield_per)
+    )
+    for row in db.session.execute(stmt):
+        yield {
+            "site": row.site,
+            "username": row.username,
+            "password": decrypt_text(row.password_encrypted, user_id, row.site, row.username),
+            "note": row.note,
+            "created_at": row.created_at.isoformat() if row.created_at else None,
+        }
+
+
+def _iter_ndjson(rows):
+    buffer = []
+    size = 0
+    for row in rows:
+        line = json.dumps(row, ensure_ascii=False) + "\n"
+        buffer.append(line)
+        size += len(line)
+        if size >= _FLUSH_BYTES:
+            yield "".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def _iter_csv(rows):
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+        if out.tell() >= _FLUSH_BYTES:
+            yield out.getvalue()
+            out.seek(0)
+            out.truncate()
+    if out.tell():
+        yield out.getvalue()
+
+
+def iter_export(user_id: int, fmt: str, yield_per: int = 500):
+    """
+    Vrací generátor textových bloků exportu ve formátu NDJSON nebo CSV.
+    Výstup je kompatibilní se vstupem importu (backend.importer).
+    """
+    rows = iter_export_rows(user_id, yield_per=yield_per)
+    if fmt == "csv":
+        return _iter_csv(rows)
+    return _iter_ndjson(rows)
@@ -0,0 +1,84 @@
+from sqlalchemy import and_, bindparam, func, select, update
+
+from backend import db
+from backend.models import Password
+from backend.security import decrypt_many, fingerprint_text
+
+
+def find_reused(user_id: int) -> tuple[list, int]:
+    """
+    Vrátí (skupiny, nespočítané): skupiny záznamů se stejným heslem [[řádek, ...]]
+    a počet hesel uživatele, která ještě nemají otisk. Duplicity najde jeden
+    GROUP BY nad indexem (user_id, fingerprint), dešifrovat se nic nemusí.
+    """
+    table = Password.__table__
+    duplicates = (
+        select(table.c.fingerprint)
+        .where(table.c.user_id == user_id, table.c.fingerprint.is_not(None))
+        .group_by(table.c.fingerprint)
+        .having(func.count() > 1)
+    )
+    rows = db.session.execute(
+        select(table.c.id, table.c.site, table.c.username, table.c.fingerprint)
+        .where(table.c.user_id == user_id, table.c.fingerprint.in_(duplicates))
+        .order_by(table.c.fingerprint, table.c.site, table.c.id)
+    ).all()
+    groups = {}
+    for row in rows:
+        groups.setdefault(row.fingerprint, []).append(row)
+    pending = db.session.execute(
+        select(func.count()).where(table.c.user_id == user_id, table.c.fingerprint.is_(None))
+    ).scalar()
+    # Nejpoužívanější hesla napřed
+    return sorted(groups.values(), key=len, reverse=True), pending
+
+
+def backfill_fingerprints(batch_size: int = 1000, workers: int = 4, recompute: bool = False, progress=None) -> dict:
+    """
+    Doplní otisky hesel, která ho ještě nemají (s `recompute` přepočítá všechny,
+    např. po změně FINGERPRINT_KEY). Musí běžet v app contextu.
+
+    Tabulka se prochází po rozsazích id, dávka se dešifruje v poolu vláken a zapíše
+    s vlastním commitem. UPDATE kontroluje původní šifrovanou hodnotu, takže otisk
+    hesla, které uživatel mezitím změnil, se nepřepíše. Přerušený běh stačí spustit
+    znovu, pokračuje u záznamů bez otisku.
+
+    Vrací {"last_id", "scanned", "updated", "failed", "failed_ids"}.
+    """
+    state = {"last_id": 0, "scanned": 0, "updated": 0, "failed": 0, "failed_ids": []}
+    table = Password.__table__
+    statement = (
+        update(table)
+        .where(and_(table.c.id == bindparam("row_id"), table.c.password_encrypted == bindparam("old")))
+        .values(fingerprint=bindparam("new"))
+    )
+
+    while True:
+        query = select(table.c.id, table.c.user_id, table.c.site, table.c.username, table.c.password_encrypted).where(table.c.id > state["last_id"])
+        if not recompute:
+            query = query.where(table.c.fingerprint.is_(None))
+        rows = db.session.execute(query.order_by(table.c.id).limit(batch_size)).all()
+        if not rows:
+            break
+
+        changes = []
+        for row, plaintext in zip(rows, decrypt_many([r.password_encrypted for r in rows],
+                                                     user_id=[r.user_id for r in rows], max_workers=workers,
+                                                     records=[(r.site, r.username) for r in rows])):
+            if isinstance(plaintext, Exception):
+                state["failed"] += 1
+                if len(state["failed_ids"]) < 100:
+                    state["failed_ids"].append(row.id)
+            else:
+                changes.append({"row_id": row.id, "old": row.password_encrypted,
+                                "new": fingerprint_text(row.user_id, plaintext)})
+        if changes:
+            db.session.execute(statement, changes)
+        db.session.commit()
+
+        state["updated"] += len(changes)
+        state["scanned"] += len(rows)
+        state["last_id"] = rows[-1].id
+        if progress:
+            progress(state)
+    return state
@@ -0,0 +1,81 @@
+import os
+
+# Stejné sady znaků jako generátor ve frontendu (PasswordGenerator.jsx)
+UPPERCASE = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+LOWERCASE = "abcdefghijklmnopqrstuvwxyz"
+NUMBERS = "0123456789"
+SYMBOLS = "!@#$%^&*()_+-=[]{}|;:,.<>?"
+
+# Rezerva navíc při čtení náhodných bytů, aby většinou stačilo jediné volání os.urandom
+_OVERSAMPLE = 1.1
+
+
+def build_charset(uppercase: bool = True, lowercase: bool = True, numbers: bool = True, symbols: bool = True) -> str:
+    """
+    Sestaví sadu znaků podle zvolených přepínačů (stejné pořadí jako ve frontendu).
+    """
+    charset = ""
+    if uppercase:
+        charset += UPPERCASE
+    if lowercase:
+        charset += LOWERCASE
+    if numbers:
+        charset += NUMBERS
+    if symbols:
+        charset += SYMBOLS
+    return charset
+
+
+def _translation_tables(charset: str):
+    """
+    Připraví tabulku pro bytes.translate: přijaté byty (< limit) se mapují na znak
+    charset[b % n], ostatní byty se zahodí. Jde o rejection sampling bez zkreslení,
+    který celý běží v C uvnitř bytes.translate.
+    """
+    n = len(charset)
+    limit = 256 - (256 % n)
+    encoded = charset.encode("ascii")
+    table = bytes(encoded[b % n] if b < limit else 0 for b in range(256))
+    rejected = bytes(range(limit, 256))
+    return table, rejected, limit
+
+
+def generate_passwords(count: int, length: int, charset: str) -> list[str]:
+    """
+    Vygeneruje `count` hesel o délce `length` nad zadanou sadou znaků.
+
+    Náhodnost se čte po velkých blocích z os.urandom (CSPRNG) a převádí se na znaky
+    rejection samplingem přes bytes.translate, takže v Pythonu neproběhne žádné volání
+    na jednotlivý znak. Vyvolá ValueError při neplatných parametrech.
+    """
+    if count < 0 or length < 1:
+        raise ValueError("Počet hesel nesmí být záporný a délka musí být alespoň 1.")
+    if not charset:
+        raise ValueError("Sada znaků nesmí být prázdná.")
+    if len(set(charset)) != len(charset):
+        raise ValueError("Sada znaků nesmí obsahovat duplicitní znaky.")
+    if len(charset) > 256 or not charset.isascii():
+        raise ValueError("Sada znaků musí obsahovat nejvýše 256 ASCII znaků.")
+    if count == 0:
+        return []
+
+    table, rejected, limit = _translation_tables(charset)
+    needed = count * length
+    chunks = []
+    collected = 0
+    while collected < needed:
+        missing = needed - collected
+        raw = os.urandom(int(missing * 256 / limit * _OVERSAMPLE) + 16)
+        accepted = raw.translate(table, rejected)
+        chunks.append(accepted)
+        collected += len(accepted)
+
+    buffer = b"".join(chunks)[:needed].decode("ascii")
+    return [buffer[i:i + length] for i in range(0, needed, length)]
+
+
+def generate_password(length: int, charset: str) -> str:
+    """
+    Vygeneruje jedno heslo (zkratka pro generate_passwords s count=1).
+    """
+    return generate_passwords(1, length, charset)[0]
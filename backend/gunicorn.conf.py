@@ -0,0 +1,55 @@
+"""
+Konfigurace gunicornu (spouštět s `-c backend/gunicorn.conf.py`).
+
+Počet workerů a vláken se čte z prostředí (výchozí gthread worker se 4 vlákny);
+post_fork zahodí databázová spojení zděděná z master procesu, pokud je aplikace
+načtená předem (--preload).
+Metriky se vždy ukládají do souborů v PROMETHEUS_MULTIPROC_DIR, aby /api/metrics
+vracel součet za všechny procesy i při počtu workerů z příkazové řádky (-w).
+S read replikou a více workery odmítne start bez sdíleného REPLICA_PIN_STORAGE_URL.
+"""
+import glob
+import os
+import tempfile
+
+workers = int(os.environ.get("WEB_CONCURRENCY", 1))
+# gthread: zatímco vlákno čeká na KDF v poolu procesů, ostatní vlákna obsluhují
+# další požadavky (/api/health, seznam hesel)
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+preload_app = os.environ.get("GUNICORN_PRELOAD", "false").lower() in ("1", "true", "yes")
+
+# Musí být nastaveno dřív, než aplikace importuje prometheus_client (s --preload ještě
+# před on_starting), proto nezávisle na počtu workerů - `-w` přepíše `workers` až později
+if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = os.path.join(tempfile.gettempdir(), "pm-metrics")
+
+
+def on_starting(server):
+    # Read replika s více workery potřebuje sdílené připnutí na primár (počet workerů i z -w)
+    from backend.config import Config
+    from backend.replica import check_pin_storage
+    check_pin_storage(Config.SQLALCHEMY_REPLICA_URI, Config.REPLICA_PIN_SECONDS,
+                      Config.REPLICA_PIN_STORAGE_URL, server.cfg.workers)
+
+    metrics_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if metrics_dir:
+        # Soubory z minulého běhu by se přičetly k novým hodnotám
+        os.makedirs(metrics_dir, exist_ok=True)
+        for path in glob.glob(os.path.join(metrics_dir, "*.db")):
+            os.remove(path)
+
+
+def post_fork(server, worker):
+    app = getattr(server.app, "callable", None)
+    if app is None:
+        # Bez preloadu si worker aplikaci (a pool spojení) vytvoří až po forku
+        return
+    from backend.pool import dispose_after_fork
+    dispose_after_fork(app)
+
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,112 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+
+from backend.metrics import KDF_SECONDS, timed
+
+# Aktuální parametry hashování (nastaví init_hashing podle Config)
+_method = "scrypt:32768:8:1"
+_salt_length = 16
+_workers = 0
+_timeout = 30
+
+_hash_seconds = KDF_SECONDS.labels("hash")
+_verify_seconds = KDF_SECONDS.labels("verify")
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+class HashingTimeout(Exception):
+    """KDF nedoběhla do PASSWORD_HASH_TIMEOUT (pool procesů je přetížený)."""
+
+
+def canonical_method(method: str) -> str:
+    """
+    Doplní výchozí parametry k metodě werkzeugu ("scrypt" -> "scrypt:32768:8:1"),
+    aby šla porovnat s prefixem uloženého hashe.
+    """
+    name, *args = method.split(":")
+    if name == "scrypt":
+        n, r, p = args if args else (2 ** 15, 8, 1)
+        return f"scrypt:{int(n)}:{int(r)}:{int(p)}"
+    if name == "pbkdf2":
+        hash_name = args[0] if args else "sha256"
+        iterations = int(args[1]) if len(args) > 1 else DEFAULT_PBKDF2_ITERATIONS
+        return f"pbkdf2:{hash_name}:{iterations}"
+    raise ValueError(f"Nepodporovaná metoda hashování hesel: {method}")
+
+
+def init_hashing(app):
+    """
+    Načte parametry hashování z konfigurace aplikace. Pool procesů se vytváří až
+    při prvním použití, takže každý gunicorn worker má po forku vlastní.
+    """
+    global _method, _salt_length, _workers, _timeout
+    _method = canonical_method(app.config["PASSWORD_HASH_METHOD"])
+    _salt_length = app.config["PASSWORD_HASH_SALT_LENGTH"]
+    _workers = app.config["PASSWORD_HASH_WORKERS"]
+    _timeout = app.config["PASSWORD_HASH_TIMEOUT"]
+
+
+def _get_pool():
+    global _pool, _pool_pid
+    # Pool zděděný z rodičovského procesu (fork) nelze použít
+    if _pool is None or _pool_pid != os.getpid():
+        with _pool_lock:
+            if _pool is None or _pool_pid != os.getpid():
+                _pool = ProcessPoolExecutor(max_workers=_workers, mp_context=multiprocessing.get_context("spawn"))
+                _pool_pid = os.getpid()
+    return _pool
+
+
+def _run(func, *args):
+    """
+    Spustí KDF v poolu procesů; při workers=0 nebo rozbitém poolu přímo v tomto vlákně.
+    Pokud výsledek nepřijde do PASSWORD_HASH_TIMEOUT, vyhodí HashingTimeout.
+    """
+    global _pool
+    if _workers <= 0:
+        return func(*args)
+    try:
+        future = _get_pool().submit(func, *args)
+        try:
+            return future.result(timeout=_timeout)
+        except FutureTimeoutError:
+            # Úloha ještě čekající ve frontě poolu se zruší, ať nezabírá proces zbytečně
+            future.cancel()
+            raise HashingTimeout(f"Hashování hesla nedoběhlo do {_timeout} s.") from None
+    except BrokenProcessPool:
+        # Pool se obnoví při dalším volání, tento požadavek dokončíme lokálně
+        _pool = None
+        return func(*args)
+
+
+def hash_password(password: str) -> str:
+    """Zahashuje heslo aktuálně nastavenou metodou."""
+    with timed(_hash_seconds):
+        return _run(generate_password_hash, password, _method, _salt_length)
+
+
+def needs_rehash(password_hash: str) -> bool:
+    """Vrátí True, pokud byl hash vytvořen jinými parametry, než jsou aktuální."""
+    return password_hash.split("$", 1)[0] != _method
+
+
+def verify_password(password_hash: str, password: str) -> bool:
+    """Ověří heslo proti uloženému hashi."""
+    with timed(_verify_seconds):
+        return _run(check_password_hash, password_hash, password)
+
+
+def shutdown_pool():
+    """Ukončí pool procesů (např. v benchmarku nebo při změně konfigurace)."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=True)
+        _pool = None
@@ -0,0 +1,242 @@
+import codecs
+import csv
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+from backend import db
+from backend.models import Password
+from backend.security import encrypt_with_key, fingerprint_text, record_context, user_data_key
+from backend.versioning import bump_vault_version
+
+SUPPORTED_FORMATS = ("csv", "json", "ndjson")
+CONFLICT_MODES = ("skip", "update")
+
+# Kolik chybných řádků se vrací klientovi (zbytek se jen počítá)
+MAX_REPORTED_ERRORS = 20
+# Velikost bloku při čtení vstupního streamu
+_READ_CHUNK = 64 * 1024
+
+
+class VaultImportError(ValueError):
+    """
+    Chyba vstupního souboru, kterou lze vrátit klientovi (400). Pokud nastala až
+    během importu, `stats` obsahuje, co už bylo uloženo, a číslo chybného řádku.
+    """
+
+    stats = None
+
+
+def detect_format(filename: str | None, explicit: str | None = None) -> str:
+    """
+    Určí formát importu z explicitní hodnoty nebo z přípony souboru.
+    """
+    fmt = (explicit or "").lower()
+    if not fmt and filename and "." in filename:
+        fmt = filename.rsplit(".", 1)[1].lower()
+    if fmt == "jsonl":
+        fmt = "ndjson"
+    if fmt not in SUPPORTED_FORMATS:
+        raise VaultImportError(f"Nepodporovaný formát importu, povolené jsou: {', '.join(SUPPORTED_FORMATS)}.")
+    return fmt
+
+
+def _iter_csv(stream):
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        yield from csv.DictReader(text)
+    finally:
+        # TextIOWrapper by při úklidu zavřel i podkladový stream
+        text.detach()
+
+
+def _iter_ndjson(stream):
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig")
+    try:
+        for line_no, line in enumerate(text, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise VaultImportError(f"Neplatný JSON na řádku {line_no}.") from exc
+    finally:
+        text.detach()
+
+
+def _iter_json_array(stream):
+    """
+    Inkrementálně prochází JSON pole objektů po blocích, takže se celý soubor
+    nikdy nenačte do paměti najednou.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    pos = 0
+    started = False
+    eof = False
+
+    while True:
+        # Přeskočit oddělovače mezi prvky pole
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+            pos += 1
+        if not started and pos < len(buffer):
+            if buffer[pos] != "[":
+                raise VaultImportError("JSON import musí obsahovat pole objektů.")
+            started = True
+            pos += 1
+            continue
+        if started and pos < len(buffer) and buffer[pos] == "]":
+            return
+        if pos < len(buffer):
+            try:
+                obj, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise VaultImportError("Neplatný nebo neúplný JSON.")
+            else:
+                yield obj
+                pos = end
+                continue
+        if eof:
+            raise VaultImportError("Neplatný nebo neúplný JSON.")
+        chunk = stream.read(_READ_CHUNK)
+        eof = not chunk
+        buffer = buffer[pos:] + utf8.decode(chunk or b"", final=eof)
+        pos = 0
+
+
+def iter_records(stream, fmt: str):
+    """
+    Vrací generátor slovníků ze vstupního binárního streamu v daném formátu.
+    """
+    if fmt == "csv":
+        return _iter_csv(stream)
+    if fmt == "ndjson":
+        return _iter_ndjson(stream)
+    return _iter_json_array(stream)
+
+
+def _normalize(record):
+    """
+    Vytáhne z importovaného záznamu site/username/password/note, nebo vrátí chybovou hlášku.
+    """
+    if not isinstance(record, dict):
+        return None, "Záznam musí být objekt"
+    site = str(record.get("site") or "").strip()
+    username = str(record.get("username") or "").strip()
+    password = record.get("password") or ""
+    note = record.get("note") or None
+    if not site or not username or not password:
+        return None, "Chybí web, uživatelské jméno nebo heslo"
+    if note is not None and not isinstance(note, str):
+        return None, "Poznámka musí být text"
+    if len(site) > 255 or len(username) > 150:
+        return None, "Web nebo uživatelské jméno je příliš dlouhé"
+    return {"site": site, "username": username, "password": str(password), "note": note}, None
+
+
+def _insert_statement(rows, on_conflict, version):
+    """
+    Sestaví jeden víceřádkový INSERT ... ON CONFLICT (user_id, site, username)
+    nad omezením uq_user_site_username pro PostgreSQL i SQLite.
+    """
+    dialect = db.session.get_bind().dialect.name
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    stmt = insert(Password.__table__).values(rows)
+    conflict_cols = ["user_id", "site", "username"]
+    if on_conflict == "update":
+        return stmt.on_conflict_do_update(
+            index_elements=conflict_cols,
+            set_={
+                "password_encrypted": stmt.excluded.password_encrypted,
+                "note": stmt.excluded.note,
+                "fingerprint": stmt.excluded.fingerprint,
+                "updated_at": stmt.excluded.updated_at,
+                "change_version": version,
+            },
+        )
+    return stmt.on_conflict_do_nothing(index_elements=conflict_cols)
+
+
+def _flush_batch(user_id, batch, executor, on_conflict, chunksize):
+    # Duplicitní klíče v jedné dávce by PostgreSQL u ON CONFLICT DO UPDATE odmítl, poslední vyhrává
+    unique = {(r["site"], r["username"]): r for r in batch}
+    records = list(unique.values())
+    # Datový klíč se rozbalí ve vlákně importu, vlákna poolu už jen šifrují
+    encrypt = partial(encrypt_with_key, user_data_key(user_id))
+    encrypted = list(executor.map(encrypt, (r["password"] for r in records),
+                                  (record_context(user_id, r["site"], r["username"]) for r in records),
+                                  chunksize=chunksize))
+    # Celá dávka dostane jednu verzi trezoru (kurzor synchronizace změn); verze se
+    # bere až po šifrování, aby zámek řádku uživatele netrval déle, než je nutné
+    version = bump_vault_version(user_id)
+    now = datetime.utcnow()
+    rows = [
+        {
+            "user_id": user_id,
+            "site": r["site"],
+            "username": r["username"],
+            "note": r["note"],
+            "password_encrypted": token,
+            "fingerprint": fingerprint_text(user_id, r["password"]),
+            "updated_at": now,
+            "change_version": version,
+        }
+        for r, token in zip(records, encrypted)
+    ]
+    result = db.session.execute(_insert_statement(rows, on_conflict, version))
+    db.session.commit()
+    written = result.rowcount if result.rowcount is not None and result.rowcount >= 0 else len(rows)
+    return written, len(batch) - written
+
+
+def import_vault(user_id: int, stream, fmt: str, on_conflict: str = "skip", batch_size: int = 500, workers: int = 4) -> dict:
+    """
+    Naimportuje hesla ze streamu po dávkách: každá dávka se zašifruje paralelně
+    v poolu vláken a zapíše jedním víceřádkovým INSERTem s vlastním commitem.
+
+    Vrací statistiku {"processed", "imported", "skipped", "invalid", "errors"}. Chyba
+    souboru uprostřed importu vyhodí VaultImportError s dosavadní statistikou (`stats`).
+    """
+    if on_conflict not in CONFLICT_MODES:
+        raise VaultImportError(f"Neplatný režim konfliktu, povolené jsou: {', '.join(CONFLICT_MODES)}.")
+
+    stats = {"processed": 0, "imported": 0, "skipped": 0, "invalid": 0, "errors": []}
+    chunksize = max(batch_size // (workers * 4), 1)
+    batch = []
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for row_no, record in enumerate(iter_records(stream, fmt), start=1):
+                stats["processed"] += 1
+                normalized, error = _normalize(record)
+                if error:
+                    stats["invalid"] += 1
+                    if len(stats["errors"]) < MAX_REPORTED_ERRORS:
+                        stats["errors"].append({"row": row_no, "message": error})
+                    continue
+                batch.append(normalized)
+                if len(batch) >= batch_size:
+                    written, skipped = _flush_batch(user_id, batch, executor, on_conflict, chunksize)
+                    stats["imported"] += written
+                    stats["skipped"] += skipped
+                    batch = []
+            if batch:
+                written, skipped = _flush_batch(user_id, batch, executor, on_conflict, chunksize)
+                stats["imported"] += written
+                stats["skipped"] += skipped
+    except (VaultImportError, UnicodeDecodeError) as exc:
+        # Předchozí dávky jsou už commitnuté, klient se musí dozvědět, co v trezoru zůstalo
+        error = exc if isinstance(exc, VaultImportError) else VaultImportError(str(exc))
+        error.stats = {**stats, "row": stats["processed"] + 1}
+        if error is exc:
+            raise
+        raise error from exc
+
+    return stats
@@ -0,0 +1,112 @@
+import os
+import time
+from contextlib import contextmanager
+
+from flask import Response, current_app, g, jsonify, request
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, REGISTRY, generate_latest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Jemnější buckety pro krátké operace (SQL dotazy, šifrování)
+FAST_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "Doba zpracování HTTP požadavku", ["method", "endpoint"]
+)
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "Počet HTTP požadavků podle stavového kódu", ["method", "endpoint", "status"]
+)
+DB_QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds", "Doba SQL dotazu", ["operation"], buckets=FAST_BUCKETS
+)
+CRYPTO_SECONDS = Histogram(
+    "crypto_operation_duration_seconds", "Doba šifrování/dešifrování hesla", ["operation"], buckets=FAST_BUCKETS
+)
+KDF_SECONDS = Histogram(
+    "password_kdf_duration_seconds", "Doba hashování/ověření uživatelského hesla (včetně čekání na pool)", ["operation"]
+)
+DB_READ_ROUTING = Counter(
+    "db_read_routing_total", "Čtecí požadavky podle cíle: replica, pinned (primár po zápisu), fallback (replika selhala)",
+    ["endpoint", "target"]
+)
+ADMISSION_REJECTED = Counter(
+    "admission_rejected_total", "Požadavky odmítnuté kontrolou vstupu (rate limit, souběh)", ["endpoint", "reason"]
+)
+
+_SQL_OPERATIONS = ("SELECT", "INSERT", "UPDATE", "DELETE")
+_sql_listeners_installed = False
+
+
+@contextmanager
+def timed(histogram_child):
+    """Změří dobu bloku do předem připraveného (olabelovaného) histogramu."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram_child.observe(time.perf_counter() - start)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("metrics_query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    verb = statement.lstrip()[:6].upper()
+    DB_QUERY_SECONDS.labels(verb if verb in _SQL_OPERATIONS else "OTHER").observe(elapsed)
+
+
+def _install_sql_listeners():
+    # Posluchače na třídě Engine platí pro všechny enginy (i pro repliku)
+    global _sql_listeners_installed
+    if not _sql_listeners_installed:
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        _sql_listeners_installed = True
+
+
+def _registry():
+    """
+    V multiprocess režimu (PROMETHEUS_MULTIPROC_DIR, nastavuje gunicorn.conf.py)
+    se hodnoty sčítají ze souborů všech workerů, jinak se čte globální registr.
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def init_metrics(app):
+    """
+    Zapne měření požadavků a SQL dotazů a zaregistruje /api/metrics
+    v Prometheus textovém formátu.
+    """
+    if not app.config["METRICS_ENABLED"]:
+        return
+    _install_sql_listeners()
+
+    @app.before_request
+    def _start_timer():
+        g.metrics_start = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        start = g.pop("metrics_start", None)
+        if start is not None:
+            endpoint = request.endpoint or "unmatched"
+            HTTP_REQUEST_SECONDS.labels(request.method, endpoint).observe(time.perf_counter() - start)
+            HTTP_REQUESTS.labels(request.method, endpoint, str(response.status_code)).inc()
+        return response
+
+    @app.route("/api/metrics", methods=["GET"])
+    def metrics():
+        token = current_app.config["METRICS_TOKEN"]
+        if token and request.headers.get("Authorization") != f"Bearer {token}":
+            return jsonify({"success": False, "error": "Neautorizováno", "message": "Neplatný token pro metriky", "status_code": 401}), 401
+        return Response(generate_latest(_registry()), mimetype=CONTENT_TYPE_LATEST)
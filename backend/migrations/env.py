@@ -11,7 +11,7 @@ config = context.config
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
-fileConfig(config.config_file_name)
+fileConfig(config.config_file_name, disable_existing_loggers=False)
 logger = logging.getLogger('alembic.env')
 
 
@@ -92,9 +92,18 @@ def run_migrations_online():
                 directives[:] = []
                 logger.info('No changes in schema detected.')
 
+    # Vyhledávací struktury (SQLite FTS5 tabulka password_fts*, GIN indexy *_trgm)
+    # nejsou v metadatech modelů, autogenerate je nemá navrhovat ke smazání
+    def include_object(object, name, type_, reflected, compare_to):
+        if reflected and compare_to is None and name and (name.startswith("password_fts") or name.endswith("_trgm")):
+            return False
+        return True
+
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    if conf_args.get("include_object") is None:
+        conf_args["include_object"] = include_object
 
     connectable = get_engine()
 
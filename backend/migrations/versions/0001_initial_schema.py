@@ -0,0 +1,55 @@
+"""initial schema
+
+Revision ID: 0001_initial_schema
+Revises: 
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001_initial_schema'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'user',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('username', sa.String(length=150), nullable=False),
+        sa.Column('email', sa.String(length=150), nullable=False),
+        sa.Column('password_hash', sa.String(length=255), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('email'),
+        sa.UniqueConstraint('username'),
+    )
+    op.create_index('ix_user_created_at', 'user', ['created_at'], unique=False)
+
+    op.create_table(
+        'password',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('site', sa.String(length=255), nullable=False),
+        sa.Column('username', sa.String(length=150), nullable=False),
+        sa.Column('password_encrypted', sa.Text(), nullable=False),
+        sa.Column('note', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'site', 'username', name='uq_user_site_username'),
+    )
+    op.create_index('ix_password_created_at', 'password', ['created_at'], unique=False)
+    op.create_index('ix_password_user_id', 'password', ['user_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_password_user_id', table_name='password')
+    op.drop_index('ix_password_created_at', table_name='password')
+    op.drop_table('password')
+    op.drop_index('ix_user_created_at', table_name='user')
+    op.drop_table('user')
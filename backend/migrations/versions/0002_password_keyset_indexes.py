@@ -0,0 +1,28 @@
+"""composite indexes for keyset pagination of passwords
+
+Revision ID: 0002_password_keyset_indexes
+Revises: 0001_initial_schema
+Create Date: 2026-10-18 09:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_password_keyset_indexes'
+down_revision = '0001_initial_schema'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_password_user_site_id', 'password', ['user_id', 'site', 'id'], unique=False, if_not_exists=True)
+    op.create_index('ix_password_user_created_id', 'password', ['user_id', 'created_at', 'id'], unique=False, if_not_exists=True)
+    op.create_index('ix_password_user_username', 'password', ['user_id', 'username'], unique=False, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_password_user_username', table_name='password')
+    op.drop_index('ix_password_user_created_id', table_name='password')
+    op.drop_index('ix_password_user_site_id', table_name='password')
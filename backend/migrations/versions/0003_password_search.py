@@ -0,0 +1,64 @@
+"""search indexes for password site and username (pg_trgm / SQLite FTS5)
+
+Revision ID: 0003_password_search
+Revises: 0002_password_keyset_indexes
+Create Date: 2026-10-18 10:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_password_search'
+down_revision = '0002_password_keyset_indexes'
+branch_labels = None
+depends_on = None
+
+
+def _sqlite_has_fts5_trigram(bind):
+    # Tokenizer trigram je od SQLite 3.34 a FTS5 nemusí být zkompilované vůbec; bez
+    # tabulky password_fts hledání v backend.search přejde na LIKE
+    version = tuple(int(part) for part in bind.exec_driver_sql("SELECT sqlite_version()").scalar().split("."))
+    options = {row[0] for row in bind.exec_driver_sql("PRAGMA compile_options")}
+    return version >= (3, 34) and "ENABLE_FTS5" in options
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute("CREATE INDEX IF NOT EXISTS ix_password_site_trgm ON password USING gin (site gin_trgm_ops)")
+        op.execute("CREATE INDEX IF NOT EXISTS ix_password_username_trgm ON password USING gin (username gin_trgm_ops)")
+    elif dialect == 'sqlite' and _sqlite_has_fts5_trigram(op.get_bind()):
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS password_fts USING fts5("
+            "site, username, content='password', content_rowid='id', tokenize='trigram')"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS password_fts_ai AFTER INSERT ON password BEGIN "
+            "INSERT INTO password_fts(rowid, site, username) VALUES (new.id, new.site, new.username); END"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS password_fts_ad AFTER DELETE ON password BEGIN "
+            "INSERT INTO password_fts(password_fts, rowid, site, username) VALUES ('delete', old.id, old.site, old.username); END"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS password_fts_au AFTER UPDATE OF site, username ON password BEGIN "
+            "INSERT INTO password_fts(password_fts, rowid, site, username) VALUES ('delete', old.id, old.site, old.username); "
+            "INSERT INTO password_fts(rowid, site, username) VALUES (new.id, new.site, new.username); END"
+        )
+        # Naplnění indexu z existujících záznamů
+        op.execute("INSERT INTO password_fts(password_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_password_username_trgm")
+        op.execute("DROP INDEX IF EXISTS ix_password_site_trgm")
+    elif dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS password_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS password_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS password_fts_ai")
+        op.execute("DROP TABLE IF EXISTS password_fts")
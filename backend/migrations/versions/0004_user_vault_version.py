@@ -0,0 +1,28 @@
+"""per-user vault version counter
+
+Revision ID: 0004_user_vault_version
+Revises: 0003_password_search
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_user_vault_version'
+down_revision = '0003_password_search'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Schéma vytvořené přes create_all už sloupec může mít
+    columns = {c['name'] for c in sa.inspect(op.get_bind()).get_columns('user')}
+    if 'vault_version' not in columns:
+        op.add_column('user', sa.Column('vault_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('user') as batch_op:
+        batch_op.drop_column('vault_version')
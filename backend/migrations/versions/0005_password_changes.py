@@ -0,0 +1,58 @@
+"""updated_at, change version and tombstones for delta sync
+
+Revision ID: 0005_password_changes
+Revises: 0004_user_vault_version
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005_password_changes'
+down_revision = '0004_user_vault_version'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Schéma vytvořené přes create_all už sloupce i tabulku může mít
+    inspector = sa.inspect(op.get_bind())
+    user_columns = {c['name'] for c in inspector.get_columns('user')}
+    if 'tombstone_horizon' not in user_columns:
+        op.add_column('user', sa.Column('tombstone_horizon', sa.Integer(), nullable=False, server_default='0'))
+
+    password_columns = {c['name'] for c in inspector.get_columns('password')}
+    if 'updated_at' not in password_columns:
+        op.add_column('password', sa.Column('updated_at', sa.DateTime(), nullable=True))
+        op.execute("UPDATE password SET updated_at = created_at")
+    if 'change_version' not in password_columns:
+        op.add_column('password', sa.Column('change_version', sa.Integer(), nullable=False, server_default='0'))
+    op.create_index('ix_password_user_change_id', 'password', ['user_id', 'change_version', 'id'], unique=False, if_not_exists=True)
+
+    if not inspector.has_table('password_tombstone'):
+        op.create_table(
+            'password_tombstone',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('password_id', sa.Integer(), nullable=False),
+            sa.Column('change_version', sa.Integer(), nullable=False),
+            sa.Column('deleted_at', sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+            sa.PrimaryKeyConstraint('id'),
+        )
+    op.create_index('ix_password_tombstone_user_change_id', 'password_tombstone', ['user_id', 'change_version', 'password_id'], unique=False, if_not_exists=True)
+    op.create_index('ix_password_tombstone_deleted_at', 'password_tombstone', ['deleted_at'], unique=False, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_password_tombstone_deleted_at', table_name='password_tombstone')
+    op.drop_index('ix_password_tombstone_user_change_id', table_name='password_tombstone')
+    op.drop_table('password_tombstone')
+    op.drop_index('ix_password_user_change_id', table_name='password')
+    with op.batch_alter_table('password') as batch_op:
+        batch_op.drop_column('change_version')
+        batch_op.drop_column('updated_at')
+    with op.batch_alter_table('user') as batch_op:
+        batch_op.drop_column('tombstone_horizon')
@@ -0,0 +1,30 @@
+"""keyed password fingerprint for reuse detection
+
+Revision ID: 0006_password_fingerprint
+Revises: 0005_password_changes
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006_password_fingerprint'
+down_revision = '0005_password_changes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Schéma vytvořené přes create_all už sloupec může mít; hodnoty doplní `flask backfill-fingerprints`
+    columns = {c['name'] for c in sa.inspect(op.get_bind()).get_columns('password')}
+    if 'fingerprint' not in columns:
+        op.add_column('password', sa.Column('fingerprint', sa.String(length=32), nullable=True))
+    op.create_index('ix_password_user_fingerprint', 'password', ['user_id', 'fingerprint'], unique=False, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_password_user_fingerprint', table_name='password')
+    with op.batch_alter_table('password') as batch_op:
+        batch_op.drop_column('fingerprint')
@@ -0,0 +1,28 @@
+"""per-user data key for envelope encryption
+
+Revision ID: 0007_user_data_key
+Revises: 0006_password_fingerprint
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007_user_data_key'
+down_revision = '0006_password_fingerprint'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Stávající uživatelé klíč nemají; vytvoří jim ho a hesla převede `flask envelope-migrate`
+    columns = {c['name'] for c in sa.inspect(op.get_bind()).get_columns('user')}
+    if 'data_key' not in columns:
+        op.add_column('user', sa.Column('data_key', sa.Text(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('user') as batch_op:
+        batch_op.drop_column('data_key')
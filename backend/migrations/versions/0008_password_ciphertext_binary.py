@@ -0,0 +1,49 @@
+"""store encrypted passwords as binary (bytea/BLOB)
+
+Revision ID: 0008_password_ciphertext_binary
+Revises: 0007_user_data_key
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008_password_ciphertext_binary'
+down_revision = '0007_user_data_key'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        column = next(c for c in sa.inspect(op.get_bind()).get_columns('password') if c['name'] == 'password_encrypted')
+        if not isinstance(column['type'], sa.LargeBinary):
+            op.execute(
+                "ALTER TABLE password ALTER COLUMN password_encrypted TYPE bytea "
+                "USING convert_to(password_encrypted, 'UTF8')"
+            )
+    elif dialect == 'sqlite':
+        # SQLite typ sloupce nevynucuje; stačí převést uložené hodnoty, tabulka (a triggery
+        # fulltextu) zůstanou beze změny
+        op.execute("UPDATE password SET password_encrypted = CAST(password_encrypted AS BLOB) "
+                   "WHERE typeof(password_encrypted) = 'text'")
+
+
+def downgrade():
+    # Binární AES-GCM hesla nejde uložit jako text; nejdřív je nutné je převést zpět
+    bind = op.get_bind()
+    binary = bind.execute(sa.text("SELECT COUNT(*) FROM password WHERE substr(password_encrypted, 1, 1) = :v"),
+                          {"v": b"\x01"}).scalar()
+    if binary:
+        raise RuntimeError(f"{binary} hesel je v binárním formátu AES-GCM, nelze je vrátit na text.")
+    if bind.dialect.name == 'postgresql':
+        op.execute(
+            "ALTER TABLE password ALTER COLUMN password_encrypted TYPE text "
+            "USING convert_from(password_encrypted, 'UTF8')"
+        )
+    elif bind.dialect.name == 'sqlite':
+        op.execute("UPDATE password SET password_encrypted = CAST(password_encrypted AS TEXT) "
+                   "WHERE typeof(password_encrypted) = 'blob'")
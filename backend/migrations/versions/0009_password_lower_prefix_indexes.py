@@ -0,0 +1,31 @@
+"""lower() indexes for case-insensitive prefix filter
+
+Revision ID: 0009_password_lower_prefix_indexes
+Revises: 0008_password_ciphertext_binary
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0009_password_lower_prefix_indexes'
+down_revision = '0008_password_ciphertext_binary'
+branch_labels = None
+depends_on = None
+
+COLUMNS = ('site', 'username')
+
+
+def upgrade():
+    # LIKE 'prefix%' nad lower(sloupec); PostgreSQL potřebuje text_pattern_ops, jinak
+    # index pro LIKE použije jen s kolací "C"
+    ops = ' text_pattern_ops' if op.get_bind().dialect.name == 'postgresql' else ''
+    for column in COLUMNS:
+        op.execute(f'CREATE INDEX IF NOT EXISTS ix_password_user_{column}_lower '
+                   f'ON password (user_id, lower({column}){ops})')
+
+
+def downgrade():
+    for column in COLUMNS:
+        op.execute(f'DROP INDEX IF EXISTS ix_password_user_{column}_lower')
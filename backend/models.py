@@ -1,12 +1,31 @@
 from backend import db
 from datetime import datetime
 
+
+class Ciphertext(db.TypeDecorator):
+    """
+    Zašifrované heslo jako bajty (bytea/BLOB). Starší Fernet tokeny jsou ASCII
+    řetězce, při zápisu se proto text převede na bajty; čte se vždy `bytes`.
+    """
+    impl = db.LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return value.encode("ascii") if isinstance(value, str) else value
+
+
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(150), unique=True, nullable=False)
     email = db.Column(db.String(150), unique=True, nullable=False)
     password_hash = db.Column(db.String(255), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    # Zvyšuje se při každé změně trezoru (ETag seznamu hesel, platnost cache)
+    vault_version = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    # Nejvyšší verze, do které už byly smazané tombstony vyčištěny (starší kurzor synchronizace neplatí)
+    tombstone_horizon = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    # Datový klíč pro šifrování hesel, zašifrovaný hlavním klíčem (NULL = hesla šifrovaná přímo hlavním klíčem)
+    data_key = db.Column(db.Text)
 
     # Vztah k heslům
     passwords = db.relationship("Password", backref="user", lazy=True, cascade="all, delete-orphan")
@@ -17,17 +36,53 @@ class User(db.Model):
 
 # Password model
 class Password(db.Model):
-    __table_args__ = (db.UniqueConstraint("user_id", "site", "username", name="uq_user_site_username"),)
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "site", "username", name="uq_user_site_username"),
+        # indexy pro keyset stránkování seznamu hesel a prefixové hledání
+        db.Index("ix_password_user_site_id", "user_id", "site", "id"),
+        db.Index("ix_password_user_created_id", "user_id", "created_at", "id"),
+        db.Index("ix_password_user_username", "user_id", "username"),
+        # index pro synchronizaci změn od kurzoru (verze trezoru, id)
+        db.Index("ix_password_user_change_id", "user_id", "change_version", "id"),
+        # index pro hledání opakovaně použitých hesel (GROUP BY jen nad indexem)
+        db.Index("ix_password_user_fingerprint", "user_id", "fingerprint"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     site = db.Column(db.String(255), nullable=False)   # název služby/webu
     username = db.Column(db.String(150), nullable=False)   # uživatelské jméno pro danou službu
-    password_encrypted = db.Column(db.Text, nullable=False)  # uložené heslo (zašifrované/zahešované)
+    password_encrypted = db.Column(Ciphertext, nullable=False)  # uložené heslo (zašifrované, viz security.encrypt_with_key)
     note = db.Column(db.Text)  # volitelná poznámka
+    fingerprint = db.Column(db.String(32))  # HMAC otisk hesla (viz security.fingerprint_text), NULL = zatím nespočítán
     created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    change_version = db.Column(db.Integer, nullable=False, default=0, server_default="0")  # verze trezoru poslední změny
 
     # vazba na uživatele
     user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False, index=True)
 
     def __repr__(self):
-        return f"<Password {self.site} for {self.username}>"
\ No newline at end of file
+        return f"<Password {self.site} for {self.username}>"
+
+
+# Prefixový filtr seznamu bez ohledu na velikost písmen (LIKE nad lower(), v PostgreSQL s text_pattern_ops)
+db.Index("ix_password_user_site_lower", Password.user_id, db.func.lower(Password.site).label("site_lower"),
+         postgresql_ops={"site_lower": "text_pattern_ops"})
+db.Index("ix_password_user_username_lower", Password.user_id, db.func.lower(Password.username).label("username_lower"),
+         postgresql_ops={"username_lower": "text_pattern_ops"})
+
+
+# Záznam o smazaném hesle pro synchronizaci klientů (čistí se po uplynutí retence)
+class PasswordTombstone(db.Model):
+    __table_args__ = (
+        db.Index("ix_password_tombstone_user_change_id", "user_id", "change_version", "password_id"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    password_id = db.Column(db.Integer, nullable=False)  # id smazaného hesla
+    change_version = db.Column(db.Integer, nullable=False)  # verze trezoru, ve které bylo smazáno
+    deleted_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<PasswordTombstone {self.password_id} v{self.change_version}>"
@@ -0,0 +1,99 @@
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import and_, func, or_, select
+
+from backend import db
+from backend.models import Password
+
+# Povolená řazení: název -> (sloupec klíče, sestupně?)
+SORTS = {
+    "site": ("site", False),
+    "created": ("created_at", True),
+}
+
+
+class InvalidCursor(ValueError):
+    """Kurzor od klienta nelze dekódovat."""
+
+
+def encode_cursor(sort: str, value, row_id: int) -> str:
+    """
+    Zakóduje pozici posledního vráceného řádku do neprůhledného kurzoru.
+    """
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([sort, value, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str):
+    """
+    Dekóduje kurzor zpět na (hodnota, id). Kurzor musí patřit ke stejnému řazení.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, value, row_id = json.loads(raw)
+        if cursor_sort != sort or not isinstance(row_id, int):
+            raise ValueError
+        if sort == "created":
+            value = datetime.fromisoformat(value)
+        elif sort == "changes":
+            if not isinstance(value, int):
+                raise ValueError
+        elif not isinstance(value, str):
+            raise ValueError
+    except (ValueError, TypeError):
+        raise InvalidCursor("Neplatný kurzor stránkování.")
+    return value, row_id
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def list_passwords(user_id: int, limit: int | None = None, cursor: str | None = None, sort: str = "site", q: str | None = None):
+    """
+    Vrátí (řádky, další_kurzor) se seznamem hesel uživatele bez šifrovaných hodnot.
+
+    Dotaz je čistý Core SELECT jen nad sloupci id/site/username (bez ORM identity
+    mapy) a stránkuje se keysetem nad (site, id) nebo (created_at, id), který
+    pokrývají indexy ix_password_user_site_id a ix_password_user_created_id.
+    """
+    if sort not in SORTS:
+        raise ValueError(f"Neplatné řazení, povolené jsou: {', '.join(SORTS)}.")
+    column_name, descending = SORTS[sort]
+    table = Password.__table__
+    key = table.c[column_name]
+
+    stmt = select(table.c.id, table.c.site, table.c.username, key.label("sort_key")).where(table.c.user_id == user_id)
+    if q:
+        # LIKE je v SQLite bez ohledu na velikost písmen, v PostgreSQL ne - obě strany se proto
+        # převedou přes lower() v databázi (indexy ix_password_user_site_lower a _username_lower)
+        pattern = func.lower(_escape_like(q) + "%")
+        stmt = stmt.where(or_(
+            func.lower(table.c.site).like(pattern, escape="\\"),
+            func.lower(table.c.username).like(pattern, escape="\\"),
+        ))
+    if cursor:
+        value, row_id = decode_cursor(cursor, sort)
+        if descending:
+            stmt = stmt.where(or_(key < value, and_(key == value, table.c.id < row_id)))
+        else:
+            stmt = stmt.where(or_(key > value, and_(key == value, table.c.id > row_id)))
+    if descending:
+        stmt = stmt.order_by(key.desc(), table.c.id.desc())
+    else:
+        stmt = stmt.order_by(key, table.c.id)
+    if limit is not None:
+        # O řádek navíc, abychom poznali, jestli existuje další stránka
+        stmt = stmt.limit(limit + 1)
+
+    rows = db.session.execute(stmt).all()
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(sort, last.sort_key, last.id)
+    return rows, next_cursor
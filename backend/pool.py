@@ -0,0 +1,311 @@
+import sqlite3
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import NullPool, QueuePool
+
+POOL_PROFILES = ("direct", "pgbouncer", "sqlite")
+SQLITE_JOURNAL_MODES = ("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF")
+SQLITE_SYNCHRONOUS = ("OFF", "NORMAL", "FULL", "EXTRA")
+# Příkazy, před kterými si transakce bere zámek zapisovatele
+_SQLITE_WRITES = ("INSERT", "UPDATE", "DELETE", "REPLACE", "CREATE", "DROP", "ALTER")
+_WRITER_KEY = "sqlite_writer"
+
+
+class PoolMetrics:
+    """
+    Čítače jednoho poolu spojení: výpůjčky, čekání na spojení, timeouty,
+    nová a zneplatněná spojení. Aktuální stav (vypůjčená spojení, overflow)
+    se čte přímo z poolu při snapshot().
+    """
+
+    def __init__(self, label):
+        self.label = label
+        self.pool = None
+        self._lock = threading.Lock()
+        self.checked_out = 0
+        self.checkouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.writer = None
+
+    def record_wait(self, seconds, timed_out=False):
+        with self._lock:
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def _incr(self, name, value=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + value)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            data = {
+                "checked_out": self.checked_out,
+                "checkouts": self.checkouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+            }
+        if self.writer is not None:
+            data.update(self.writer.snapshot())
+        pool = self.pool
+        data["pool_class"] = type(pool).__name__ if pool is not None else None
+        if isinstance(pool, QueuePool):
+            data["size"] = pool.size()
+            data["overflow"] = max(pool.overflow(), 0)
+        return data
+
+
+class _TimedCheckoutMixin:
+    """Měří, jak dlouho vlákno čeká na spojení z poolu (včetně pre-pingu)."""
+
+    metrics = None
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            if self.metrics:
+                self.metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        if self.metrics:
+            self.metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() vytváří nový pool, čítače musí zůstat
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        if self.metrics:
+            self.metrics.pool = pool
+        return pool
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class InstrumentedNullPool(_TimedCheckoutMixin, NullPool):
+    pass
+
+
+_metrics = {}
+
+
+def resolve_profile(config) -> str:
+    """
+    Vybere profil poolu: explicitně přes DB_POOL_PROFILE, jinak podle URI.
+    """
+    profile = (config.get("DB_POOL_PROFILE") or "auto").lower()
+    if profile == "auto":
+        return "sqlite" if config["SQLALCHEMY_DATABASE_URI"].startswith("sqlite") else "direct"
+    if profile not in POOL_PROFILES:
+        raise ValueError(f"Neznámý DB_POOL_PROFILE '{profile}', povolené jsou: auto, {', '.join(POOL_PROFILES)}.")
+    return profile
+
+
+def engine_options(config) -> dict:
+    """
+    Sestaví SQLALCHEMY_ENGINE_OPTIONS pro zvolený profil:
+
+    - direct: přímé spojení na PostgreSQL, QueuePool s pre-pingem a recyklací spojení,
+    - pgbouncer: PgBouncer v transaction módu, NullPool (poolování dělá PgBouncer)
+      a vypnuté server-side prepared statements psycopgu,
+    - sqlite: lokální soubor, malý pool bez pre-pingu (in-memory databáze beze změny);
+      PRAGMA a serializaci zápisů přidá configure_sqlite().
+    """
+    profile = resolve_profile(config)
+    if profile == "pgbouncer":
+        return {
+            "poolclass": InstrumentedNullPool,
+            "connect_args": {"prepare_threshold": None},
+        }
+    if profile == "sqlite":
+        uri = config["SQLALCHEMY_DATABASE_URI"]
+        if uri in ("sqlite://", "sqlite:///:memory:"):
+            return {}
+        return {
+            "poolclass": InstrumentedQueuePool,
+            "pool_size": config["DB_POOL_SIZE"],
+            "max_overflow": config["DB_MAX_OVERFLOW"],
+            "pool_timeout": config["DB_POOL_TIMEOUT"],
+        }
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": config["DB_POOL_SIZE"],
+        "max_overflow": config["DB_MAX_OVERFLOW"],
+        "pool_timeout": config["DB_POOL_TIMEOUT"],
+        "pool_recycle": config["DB_POOL_RECYCLE"],
+        "pool_pre_ping": config["DB_POOL_PRE_PING"],
+    }
+
+
+def sqlite_pragmas(config) -> dict:
+    """
+    PRAGMA nastavované na každém novém spojení profilu sqlite. WAL pouští čtení
+    souběžně se zápisem, synchronous=NORMAL v režimu WAL nevolá fsync při každém
+    commitu (commit přežije pád procesu, ne výpadek napájení). cache_size je v KiB
+    na spojení, mmap_size v bajtech (0 = vypnuto).
+    """
+    journal_mode = config["SQLITE_JOURNAL_MODE"].upper()
+    synchronous = config["SQLITE_SYNCHRONOUS"].upper()
+    if journal_mode not in SQLITE_JOURNAL_MODES:
+        raise ValueError(f"Neznámý SQLITE_JOURNAL_MODE '{journal_mode}', povolené jsou: {', '.join(SQLITE_JOURNAL_MODES)}.")
+    if synchronous not in SQLITE_SYNCHRONOUS:
+        raise ValueError(f"Neznámý SQLITE_SYNCHRONOUS '{synchronous}', povolené jsou: {', '.join(SQLITE_SYNCHRONOUS)}.")
+    return {
+        "journal_mode": journal_mode,
+        "synchronous": synchronous,
+        "busy_timeout": int(config["SQLITE_BUSY_TIMEOUT_MS"]),
+        "cache_size": -int(config["SQLITE_CACHE_SIZE_KB"]),
+        "mmap_size": int(config["SQLITE_MMAP_SIZE"]),
+    }
+
+
+class SQLiteWriter:
+    """
+    Zámek zapisovatele jedné SQLite databáze v procesu. Transakce si ho vezme před
+    prvním zápisem a drží ho do commitu nebo rollbacku, takže vlákna na zápis čekají
+    na zámku v Pythonu místo opakovaných pokusů v busy handleru SQLite a čtení
+    běží dál souběžně. Mezi procesy (více workerů gunicornu) chrání busy_timeout.
+    """
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.writes = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def acquire(self):
+        start = time.perf_counter()
+        acquired = self._lock.acquire(timeout=self.timeout)
+        waited = time.perf_counter() - start
+        with self._stats_lock:
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+            if acquired:
+                self.writes += 1
+            else:
+                self.timeouts += 1
+        if not acquired:
+            # Stejná chyba jako z busy handleru SQLite, SQLAlchemy ji zabalí do OperationalError
+            raise sqlite3.OperationalError(f"database is locked (zápis čekal {waited:.1f} s na zámek zapisovatele)")
+
+    def release(self):
+        self._lock.release()
+
+    def snapshot(self) -> dict:
+        with self._stats_lock:
+            return {
+                "writer_transactions": self.writes,
+                "writer_timeouts": self.timeouts,
+                "writer_wait_seconds_total": round(self.wait_seconds_total, 6),
+                "writer_wait_seconds_max": round(self.wait_seconds_max, 6),
+            }
+
+
+def configure_sqlite(engine, config, metrics: PoolMetrics | None = None) -> SQLiteWriter | None:
+    """
+    Nastaví souborové SQLite databázi PRAGMA ze sqlite_pragmas() na každém novém
+    spojení a při SQLITE_SERIALIZE_WRITES zapne zámek zapisovatele (SQLiteWriter).
+    In-memory databáze a jiné dialekty nechá beze změny. Vrací zámek zapisovatele,
+    nebo None.
+    """
+    if engine.dialect.name != "sqlite" or engine.url.database in (None, "", ":memory:"):
+        return None
+    pragmas = sqlite_pragmas(config)
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    if not config["SQLITE_SERIALIZE_WRITES"]:
+        return None
+    writer = SQLiteWriter(pragmas["busy_timeout"] / 1000)
+    if metrics is not None:
+        metrics.writer = writer
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_write(conn, cursor, statement, parameters, context, executemany):
+        info = conn.info
+        if not info.get(_WRITER_KEY) and statement.lstrip()[:7].upper().startswith(_SQLITE_WRITES):
+            writer.acquire()
+            info[_WRITER_KEY] = True
+
+    def _release(info):
+        if info.pop(_WRITER_KEY, False):
+            writer.release()
+
+    # Zámek se uvolní s koncem transakce (událost commit přichází těsně před commitem
+    # v SQLite, krátký překryv s dalším zapisovatelem pokryje busy_timeout); checkin
+    # a invalidate jsou pojistka pro spojení vrácená do poolu bez commitu
+    event.listen(engine, "commit", lambda conn: _release(conn.info))
+    event.listen(engine, "rollback", lambda conn: _release(conn.info))
+    event.listen(engine, "checkin", lambda dbapi_connection, record: _release(record.info))
+    event.listen(engine, "invalidate", lambda dbapi_connection, record, exception: _release(record.info))
+    return writer
+
+
+def instrument_engine(engine, label: str = "primary") -> PoolMetrics:
+    """
+    Připojí k enginu čítače poolu. Události se přenášejí i na pool vytvořený
+    po engine.dispose().
+    """
+    metrics = PoolMetrics(label)
+    metrics.pool = engine.pool
+    engine.pool.metrics = metrics
+    _metrics[label] = metrics
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics._incr("connects")
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics._incr("checkouts")
+        metrics._incr("checked_out")
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        metrics._incr("checked_out", -1)
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        metrics._incr("invalidations")
+
+    return metrics
+
+
+def pool_stats() -> dict:
+    """Vrátí snapshot čítačů všech instrumentovaných poolů podle názvu."""
+    return {label: metrics.snapshot() for label, metrics in _metrics.items()}
+
+
+def dispose_after_fork(app):
+    """
+    Zahodí spojení zděděná z master procesu gunicornu (při --preload), aby je
+    workery nesdílely. close=False: spojení patří rodiči, nezavíráme mu je.
+    """
+    with app.app_context():
+        from backend import db
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+    for metrics in _metrics.values():
+        with metrics._lock:
+            metrics.checked_out = 0
@@ -0,0 +1,151 @@
+import cProfile
+import hmac
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+from flask import g, request
+
+PROFILE_HEADER = "X-Profile-Token"
+PROFILE_ID_HEADER = "X-Profile-Id"
+MODES = ("cprofile", "sample")
+
+_prune_lock = threading.Lock()
+
+
+class StackSampler(threading.Thread):
+    """
+    Vzorkovací profiler jednoho vlákna: každých `interval` sekund přečte jeho
+    aktuální zásobník a počítá výskyty. Výstup je ve formátu "collapsed stacks"
+    (a;b;c počet), který přímo čte flamegraph.pl nebo speedscope.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[collapse_stack(frame)] += 1
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+
+    def dump(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def collapse_stack(frame) -> str:
+    """Převede zásobník (od nejvnitřnějšího rámce) na řetězec kořen;...;list."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def prune_directory(directory: str, max_bytes: int):
+    """Maže nejstarší soubory profilů, dokud jejich celková velikost nepřekračuje `max_bytes`."""
+    with _prune_lock:
+        entries = [e for e in os.scandir(directory) if e.is_file()]
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        total = sum(e.stat().st_size for e in entries)
+        for entry in entries:
+            if total <= max_bytes:
+                break
+            total -= entry.stat().st_size
+            os.remove(entry.path)
+
+
+def _selected(token, sample_rate) -> bool:
+    provided = request.headers.get(PROFILE_HEADER)
+    if token and provided and hmac.compare_digest(provided, token):
+        return True
+    return sample_rate > 0 and random.random() < sample_rate
+
+
+def init_profiling(app):
+    """
+    Zapne profilování vybraných požadavků na routy blueprintu api_bp. Požadavek se
+    profiluje, pokud nese hlavičku X-Profile-Token s hodnotou PROFILING_TOKEN, nebo
+    podle náhodného vzorkování (PROFILING_SAMPLE_RATE). Výsledek se zapíše do
+    PROFILING_DIR (.pstats pro cProfile, .collapsed pro vzorkování) a jeho název
+    vrátí hlavička X-Profile-Id.
+
+    Při PROFILING_ENABLED=false se nezaregistruje žádný hook.
+    """
+    if not app.config["PROFILING_ENABLED"]:
+        return
+    mode = app.config["PROFILING_MODE"]
+    if mode not in MODES:
+        raise ValueError(f"Neznámý režim profilování: {mode}")
+    token = app.config["PROFILING_TOKEN"]
+    sample_rate = app.config["PROFILING_SAMPLE_RATE"]
+    interval = app.config["PROFILING_SAMPLE_INTERVAL_MS"] / 1000
+    directory = app.config["PROFILING_DIR"]
+    max_bytes = app.config["PROFILING_MAX_BYTES"]
+
+    @app.before_request
+    def _start_profile():
+        if request.blueprint != "api_bp" or not _selected(token, sample_rate):
+            return
+        if mode == "cprofile":
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Od Pythonu 3.12 smí běžet jen jeden cProfile v procesu
+                return
+        else:
+            profiler = StackSampler(threading.get_ident(), interval)
+            profiler.start()
+        g.profile = (profiler, time.perf_counter())
+
+    def _stop(profiler):
+        if mode == "cprofile":
+            profiler.disable()
+        else:
+            profiler.stop()
+
+    @app.after_request
+    def _stop_profile(response):
+        started = g.pop("profile", None)
+        if started is None:
+            return response
+        profiler, start = started
+        _stop(profiler)
+        elapsed_ms = int((time.perf_counter() - start) * 1000)
+
+        os.makedirs(directory, exist_ok=True)
+        name = "{}-{}-{}-{}ms-{}.{}".format(
+            time.strftime("%Y%m%dT%H%M%S"), request.method, request.endpoint.split(".")[-1],
+            elapsed_ms, uuid.uuid4().hex[:8], "pstats" if mode == "cprofile" else "collapsed",
+        )
+        path = os.path.join(directory, name)
+        if mode == "cprofile":
+            profiler.dump_stats(path)
+        else:
+            profiler.dump(path)
+        prune_directory(directory, max_bytes)
+        response.headers[PROFILE_ID_HEADER] = name
+        return response
+
+    @app.teardown_request
+    def _discard_profile(exc):
+        # Neošetřená výjimka přeskočí after_request, profiler ale musí skončit
+        started = g.pop("profile", None)
+        if started is not None:
+            _stop(started[0])
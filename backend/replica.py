@@ -0,0 +1,224 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, request
+from flask_jwt_extended import get_jwt_identity
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, exc
+
+from backend.metrics import DB_READ_ROUTING
+
+try:
+    import redis  # volitelná závislost, jen pro sdílené připnutí na primár
+except ImportError:  # pragma: no cover - záleží na prostředí
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+REPLICA_BIND = "replica"
+_USE_REPLICA = "use_replica"
+_WRITERS = "replica_writers"
+_WROTE = "replica_wrote"
+
+
+class RoutingSession(Session):
+    """
+    Session, která při zapnutém čtení z repliky (`read_replica`) posílá dotazy na
+    engine repliky. Flush, INSERT/UPDATE/DELETE a explicitní bind jdou vždy na
+    primár; bez nakonfigurované repliky se chová jako běžná session.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self.info.get(_USE_REPLICA) and not self._flushing:
+            if clause is None or not getattr(clause, "is_dml", False):
+                engine = self._db.engines.get(REPLICA_BIND)
+                if engine is not None:
+                    return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _collect_writers(session, flush_context):
+    # Uživatelé, jejichž data se mění (po flushi už mají nové objekty id)
+    writers = session.info.setdefault(_WRITERS, set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        user_id = obj.id if obj.__table__.name == "user" else getattr(obj, "user_id", None)
+        if user_id is not None:
+            writers.add(user_id)
+    session.info[_WROTE] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _mark_bulk_write(orm_execute_state):
+    # UPDATE/DELETE mimo flush (verze trezoru, hromadné úpravy) - uživatel je z JWT
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[_WROTE] = True
+
+
+class MemoryPins:
+    """Připnutí v paměti procesu, omezený počet uživatelů (nejstarší se vyřadí)."""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._until = OrderedDict()
+        self._lock = threading.Lock()
+
+    def pin(self, user_id: int, seconds: float):
+        with self._lock:
+            self._until.pop(user_id, None)
+            self._until[user_id] = time.monotonic() + seconds
+            if len(self._until) > self.max_keys:
+                self._until.popitem(last=False)
+
+    def is_pinned(self, user_id: int) -> bool:
+        until = self._until.get(user_id)
+        return until is not None and until > time.monotonic()
+
+
+class RedisPins:
+    """
+    Připnutí sdílené všemi workery a instancemi (klíč s expirací). Při výpadku
+    Redisu se čte z primáru - zpoždění repliky nesmí vrátit stará data.
+    """
+
+    def __init__(self, url: str, prefix: str = "pm:replica-pin:"):
+        if redis is None:
+            raise RuntimeError("Pro REPLICA_PIN_STORAGE_URL=redis://... je potřeba balíček redis (pip install redis).")
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url, socket_timeout=0.1)
+
+    def pin(self, user_id: int, seconds: float):
+        try:
+            self._client.set(f"{self.prefix}{user_id}", 1, px=max(int(seconds * 1000), 1))
+        except redis.RedisError as exc:
+            logger.warning("Připnutí na primár nelze uložit do Redisu: %s", exc)
+
+    def is_pinned(self, user_id: int) -> bool:
+        try:
+            return bool(self._client.exists(f"{self.prefix}{user_id}"))
+        except redis.RedisError as exc:
+            logger.warning("Připnutí na primár nelze ověřit v Redisu: %s", exc)
+            return True
+
+
+def make_pins(url: str | None):
+    """Vytvoří úložiště připnutí podle REPLICA_PIN_STORAGE_URL (prázdné nebo memory:// = paměť procesu)."""
+    if not url or url.startswith("memory://"):
+        return MemoryPins()
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisPins(url)
+    raise ValueError(f"Nepodporované úložiště připnutí: {url}")
+
+
+def check_pin_storage(replica_uri: str | None, pin_seconds: float, pin_storage_url: str | None, workers: int):
+    """
+    Odmítne start, pokud by připnutí na primár platilo jen v procesu, který zápis
+    zpracoval: s replikou a více workery musí být REPLICA_PIN_STORAGE_URL sdílené
+    úložiště, jinak by další GET v jiném workeru četl zpožděná data (a starý ETag).
+    """
+    if not replica_uri or pin_seconds <= 0 or workers <= 1:
+        return
+    if not pin_storage_url or pin_storage_url.startswith("memory://"):
+        raise RuntimeError(
+            f"Read replika s {workers} workery vyžaduje sdílené úložiště připnutí "
+            "(REPLICA_PIN_STORAGE_URL=redis://...), nebo jeden worker."
+        )
+
+
+class ReplicaRouter:
+    """Rozhoduje, zda čtení uživatele smí jít na repliku, a eviduje jeho zápisy."""
+
+    def __init__(self, config):
+        self.pin_seconds = config["REPLICA_PIN_SECONDS"]
+        self.pins = make_pins(config["REPLICA_PIN_STORAGE_URL"])
+
+    def pin(self, user_ids):
+        if self.pin_seconds > 0:
+            for user_id in user_ids:
+                self.pins.pin(int(user_id), self.pin_seconds)
+
+    def is_pinned(self, user_id) -> bool:
+        return self.pin_seconds > 0 and self.pins.is_pinned(int(user_id))
+
+
+def replica_bind(config) -> dict | None:
+    """
+    Položka SQLALCHEMY_BINDS pro repliku (URL a volby poolu podle jejího profilu),
+    nebo None, pokud SQLALCHEMY_REPLICA_URI není nastavené.
+    """
+    uri = config.get("SQLALCHEMY_REPLICA_URI")
+    if not uri:
+        return None
+    from backend.pool import engine_options
+    return {"url": uri, **engine_options({**config, "SQLALCHEMY_DATABASE_URI": uri, "DB_POOL_PROFILE": "auto"})}
+
+
+def _current_identity():
+    try:
+        return get_jwt_identity()
+    except RuntimeError:
+        # Požadavek bez ověřeného JWT (registrace, přihlášení)
+        return None
+
+
+def init_replica(app):
+    """
+    Zapne směrování čtení na repliku, pokud je nakonfigurovaná. Po požadavku, který
+    něco zapsal, připne jeho uživatele (z JWT i ze zapsaných řádků) na primár.
+    """
+    if REPLICA_BIND not in app.config["SQLALCHEMY_BINDS"]:
+        return
+    # Počet workerů z -w ověřuje ještě gunicorn.conf.py (on_starting)
+    check_pin_storage(app.config["SQLALCHEMY_REPLICA_URI"], app.config["REPLICA_PIN_SECONDS"],
+                      app.config["REPLICA_PIN_STORAGE_URL"], int(os.environ.get("WEB_CONCURRENCY", 1)))
+    router = app.extensions["replica"] = ReplicaRouter(app.config)
+    from backend import db
+
+    @app.after_request
+    def _pin_writers(response):
+        info = db.session.info
+        writers = info.pop(_WRITERS, set())
+        if info.pop(_WROTE, False):
+            identity = _current_identity()
+            if identity is not None:
+                writers.add(identity)
+            router.pin(writers)
+        return response
+
+
+def read_replica(view):
+    """
+    Dekorátor čtecího endpointu (pod @jwt_required): GET a HEAD čtou z repliky,
+    pokud uživatel nemá čerstvý zápis. Při chybě spojení na repliku se požadavek
+    zopakuje na primáru.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        router = current_app.extensions.get("replica")
+        if router is None or request.method not in ("GET", "HEAD"):
+            return view(*args, **kwargs)
+        endpoint = request.endpoint or "unknown"
+        if router.is_pinned(get_jwt_identity()):
+            DB_READ_ROUTING.labels(endpoint, "pinned").inc()
+            return view(*args, **kwargs)
+
+        from backend import db
+        session = db.session()
+        session.info[_USE_REPLICA] = True
+        try:
+            response = view(*args, **kwargs)
+            DB_READ_ROUTING.labels(endpoint, "replica").inc()
+            return response
+        except exc.OperationalError as error:
+            logger.warning("Replika nedostupná, čtení jde na primár: %s", error)
+            session.rollback()
+            session.info.pop(_USE_REPLICA, None)
+            DB_READ_ROUTING.labels(endpoint, "fallback").inc()
+            return view(*args, **kwargs)
+        finally:
+            session.info.pop(_USE_REPLICA, None)
+    return wrapper
@@ -0,0 +1,242 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from cryptography.fernet import InvalidToken
+from sqlalchemy import and_, bindparam, func, select, update
+
+from backend import db
+from backend.models import Password, User
+from backend import security
+
+
+def load_checkpoint(path: str) -> dict | None:
+    """Načte uložený stav rotace, nebo None, pokud žádný není."""
+    if not path or not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_checkpoint(path: str, state: dict):
+    """Zapíše stav rotace atomicky (přes dočasný soubor), aby pád nenechal rozepsaný JSON."""
+    if not path:
+        return
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+
+def _rotate_or_error(ciphertext):
+    try:
+        return security.rotate_text(ciphertext)
+    except InvalidToken as exc:
+        return exc
+
+
+def rewrap_data_keys(batch_size: int = 1000) -> dict:
+    """
+    Přešifruje zabalené datové klíče uživatelů primárním klíčem. Hesla šifrovaná
+    datovým klíčem se tím nemění. UPDATE kontroluje původní hodnotu jako u hesel.
+    Vrací {"rewrapped", "unchanged", "failed"}.
+    """
+    table = User.__table__
+    statement = (
+        update(table)
+        .where(and_(table.c.id == bindparam("row_id"), table.c.data_key == bindparam("old")))
+        .values(data_key=bindparam("new"))
+    )
+    state = {"rewrapped": 0, "unchanged": 0, "failed": 0}
+    last_id = 0
+    while True:
+        rows = db.session.execute(
+            select(table.c.id, table.c.data_key)
+            .where(table.c.id > last_id, table.c.data_key.is_not(None))
+            .order_by(table.c.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        changes = []
+        for row in rows:
+            result = _rotate_or_error(row.data_key)
+            if isinstance(result, Exception):
+                state["failed"] += 1
+            elif result is None:
+                state["unchanged"] += 1
+            else:
+                changes.append({"row_id": row.id, "old": row.data_key, "new": result})
+        if changes:
+            db.session.execute(statement, changes)
+        db.session.commit()
+        state["rewrapped"] += len(changes)
+        last_id = rows[-1].id
+    return state
+
+
+def rotate_keys(batch_size: int = 1000, workers: int = 4, rate: float = 0, checkpoint: str | None = None,
+                restart: bool = False, progress=None) -> dict:
+    """
+    Přešifruje primárním klíčem (FERNET_KEY) datové klíče uživatelů a hesla, která
+    ještě datovým klíčem šifrovaná nejsou. Musí běžet v app contextu.
+
+    Tabulka hesel se prochází po rozsazích id (WHERE id > poslední ORDER BY id LIMIT batch),
+    v paměti je tedy vždy jen jedna dávka. Dávka se přešifruje v poolu vláken a zapíše
+    s vlastním commitem; UPDATE kontroluje původní hodnotu, takže souběžná úprava
+    záznamu uživatelem se nepřepíše. Po každé dávce se uloží checkpoint, další běh
+    pokračuje za posledním zpracovaným id (pokud se mezitím nezměnil primární klíč).
+    `rate` omezuje počet řádků za sekundu (0 = bez omezení).
+
+    Vrací {"last_id", "scanned", "rotated", "unchanged", "failed", "failed_ids", "keys"},
+    kde "keys" je výsledek rewrap_data_keys.
+    """
+    state = None if restart else load_checkpoint(checkpoint)
+    if state is None or state.get("key_id") != security.PRIMARY_KEY_ID:
+        state = {"key_id": security.PRIMARY_KEY_ID, "last_id": 0, "scanned": 0,
+                 "rotated": 0, "unchanged": 0, "failed": 0, "failed_ids": []}
+    # Datových klíčů je jen jeden na uživatele, přebalují se vždy celé
+    state["keys"] = rewrap_data_keys(batch_size)
+
+    table = Password.__table__
+    statement = (
+        update(table)
+        .where(and_(table.c.id == bindparam("row_id"), table.c.password_encrypted == bindparam("old")))
+        .values(password_encrypted=bindparam("new"))
+    )
+    chunksize = max(batch_size // (workers * 4), 1)
+    started = time.monotonic()
+    processed = 0
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rotate") as executor:
+        while True:
+            rows = db.session.execute(
+                select(table.c.id, table.c.password_encrypted)
+                # Hesla šifrovaná datovým klíčem na hlavním klíči nezávisí
+                .where(table.c.id > state["last_id"], _master_token(table.c.password_encrypted))
+                .order_by(table.c.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+
+            results = executor.map(_rotate_or_error, (r.password_encrypted for r in rows), chunksize=chunksize)
+            changes = []
+            for row, result in zip(rows, results):
+                if isinstance(result, Exception):
+                    state["failed"] += 1
+                    # Seznam necháváme krátký, checkpoint nesmí růst s tabulkou
+                    if len(state["failed_ids"]) < 100:
+                        state["failed_ids"].append(row.id)
+                elif result is None:
+                    state["unchanged"] += 1
+                else:
+                    changes.append({"row_id": row.id, "old": row.password_encrypted, "new": result})
+
+            if changes:
+                db.session.execute(statement, changes)
+            db.session.commit()
+
+            state["rotated"] += len(changes)
+            state["scanned"] += len(rows)
+            state["last_id"] = rows[-1].id
+            save_checkpoint(checkpoint, state)
+            if progress:
+                progress(state)
+
+            processed += len(rows)
+            if rate > 0:
+                # Throttling: nepředbíhat cílovou rychlost, ať rotace nezahltí databázi
+                ahead = processed / rate - (time.monotonic() - started)
+                if ahead > 0:
+                    time.sleep(ahead)
+    return state
+
+
+def _master_token(column):
+    # Fernet token hlavního klíče začíná vždy stejně (verze 0x80 v base64)
+    prefix = security.MASTER_TOKEN_PREFIX
+    return func.substr(column, 1, len(prefix)) == prefix
+
+
+def _envelope_or_error(key, ciphertext, context):
+    try:
+        return security.encrypt_with_key(key, security.decrypt_with_key(key, ciphertext, context), context)
+    except InvalidToken as exc:
+        return exc
+
+
+def migrate_to_envelope(batch_size: int = 1000, workers: int = 4, progress=None) -> dict:
+    """
+    Převede trezory na obálkové šifrování v aktuálním formátu: uživatelům bez
+    datového klíče ho vytvoří a hesla šifrovaná přímo hlavním klíčem přešifruje do
+    binárního AES-GCM datovým klíčem vlastníka.
+    Prochází po dávkách podle id s vlastním commitem a UPDATE kontroluje původní
+    hodnotu; opakované spuštění pokračuje tam, kde zbývají starší tokeny. Musí
+    běžet v app contextu.
+
+    Vrací {"keys_created", "last_id", "scanned", "migrated", "failed", "failed_ids"}.
+    """
+    users = User.__table__
+    state = {"keys_created": 0, "last_id": 0, "scanned": 0, "migrated": 0, "failed": 0, "failed_ids": []}
+    while True:
+        # Klíč se zapisuje jen tam, kde pořád chybí - souběžný běh ho nepřepíše
+        missing = db.session.execute(
+            select(users.c.id).where(users.c.data_key.is_(None)).order_by(users.c.id).limit(batch_size)
+        ).scalars().all()
+        if not missing:
+            break
+        result = db.session.execute(
+            update(users)
+            .where(and_(users.c.id == bindparam("row_id"), users.c.data_key.is_(None)))
+            .values(data_key=bindparam("key")),
+            [{"row_id": uid, "key": security.new_data_key()} for uid in missing],
+        )
+        db.session.commit()
+        state["keys_created"] += result.rowcount if result.rowcount is not None and result.rowcount >= 0 else len(missing)
+
+    table = Password.__table__
+    statement = (
+        update(table)
+        .where(and_(table.c.id == bindparam("row_id"), table.c.password_encrypted == bindparam("old")))
+        .values(password_encrypted=bindparam("new"))
+    )
+    chunksize = max(batch_size // (workers * 4), 1)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="envelope") as executor:
+        while True:
+            rows = db.session.execute(
+                select(table.c.id, table.c.user_id, table.c.site, table.c.username, table.c.password_encrypted)
+                .where(table.c.id > state["last_id"],
+                       func.substr(table.c.password_encrypted, 1, 1) != security.AEAD_V1)
+                .order_by(table.c.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+
+            # Klíče se rozbalí tady, vlákna poolu do databáze nesahají
+            keys = {uid: security.user_data_key(uid) for uid in {r.user_id for r in rows}}
+            results = executor.map(_envelope_or_error, [keys[r.user_id] for r in rows],
+                                   [r.password_encrypted for r in rows],
+                                   [security.record_context(r.user_id, r.site, r.username) for r in rows],
+                                   chunksize=chunksize)
+            changes = []
+            for row, result in zip(rows, results):
+                if isinstance(result, Exception):
+                    state["failed"] += 1
+                    if len(state["failed_ids"]) < 100:
+                        state["failed_ids"].append(row.id)
+                else:
+                    changes.append({"row_id": row.id, "old": row.password_encrypted, "new": result})
+            if changes:
+                db.session.execute(statement, changes)
+            db.session.commit()
+
+            state["migrated"] += len(changes)
+            state["scanned"] += len(rows)
+            state["last_id"] = rows[-1].id
+            if progress:
+                progress(state)
+    return state
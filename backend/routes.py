@@ -1,12 +1,27 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app, Response, stream_with_context
 from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity
+from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
-from werkzeug.security import generate_password_hash, check_password_hash
 
 from backend import db
 from backend.models import User, Password
-from backend.security import encrypt_text, decrypt_text
+from backend.security import encrypt_text, decrypt_text, decrypt_many, fingerprint_text, new_data_key
+from backend.fingerprints import find_reused
+from backend.strength import estimate_strength, get_dictionary, score_many
+from backend.breach import get_corpus
+from backend.bulk import BulkRequestError, bulk_delete, bulk_update, parse_ids, parse_updates
+from backend.hashing import HashingTimeout, hash_password, needs_rehash, verify_password
 from backend.validator import validate_email, validate_password  # Import validátorů
+from backend.generator import build_charset, generate_passwords
+from backend.importer import VaultImportError, detect_format, import_vault
+from backend.exporter import EXPORT_FORMATS, iter_export
+from backend.search import get_prefix_index, search_passwords
+from backend.pool import pool_stats
+from backend.admission import admission_control
+from backend.replica import read_replica
+from backend.versioning import bump_vault_version, get_vault_version, list_etag
+from backend.pagination import InvalidCursor, list_passwords
+from backend.sync import CursorExpired, list_changes, record_tombstones
 
 api_bp = Blueprint("api_bp", __name__, url_prefix="/api")
 
@@ -24,9 +39,20 @@ def not_found_error(e):
 def bad_request_error(e):
     return jsonify({"success": False, "error": "Chybný požadavek", "message": str(e), "status_code": 400}), 400
 
+@api_bp.app_errorhandler(413)
+def request_too_large_error(e):
+    return jsonify({"success": False, "error": "Příliš velký požadavek", "message": str(e), "status_code": 413}), 413
+
 @api_bp.app_errorhandler(500)
 def internal_server_error(e):
     return jsonify({"success": False, "error": "Vnitřní chyba serveru", "message": str(e), "status_code": 500}), 500
+
+@api_bp.app_errorhandler(HashingTimeout)
+def hashing_timeout_error(e):
+    response = jsonify({"success": False, "error": "Služba je přetížená", "message": "Server zpracovává příliš mnoho přihlášení, zkuste to za chvíli", "status_code": 503})
+    response.status_code = 503
+    response.headers["Retry-After"] = "1"
+    return response
 # --- KONEC ERROR HANDLERŮ ---
 
 @api_bp.route("/", methods=["GET"])
@@ -37,10 +63,28 @@ def health_check():
 def health():
     return jsonify({"status": "zdravý", "service": "password-manager-api"})
 
+@api_bp.route("/health/pool", methods=["GET"])
+def health_pool():
+    return jsonify({"status": "ok", "pools": pool_stats()})
+
+
+def _breach_count(password):
+    # Počet výskytů v lokálním korpusu uniklých hesel, None když korpus není nahraný
+    corpus = get_corpus(current_app.config["BREACH_CORPUS_PATH"])
+    return corpus.count(password) if corpus is not None else None
+
+
+def _strength_unavailable():
+    # Slovník se kompiluje při sestavení (flask build-strength-dict), ne v požadavku
+    return jsonify({"success": False, "error": "Služba nedostupná", "message": "Slovník pro odhad síly hesel není zkompilovaný", "status_code": 503}), 503
+
 
 @api_bp.route("/register", methods=["POST"])
+@admission_control()
 def register():
     data = request.get_json()
+    if not isinstance(data, dict):
+        return jsonify({"success": False, "error": "Neplatný vstup", "message": "Tělo požadavku musí být JSON objekt", "status_code": 400}), 400
     username = data.get("username")
     email = data.get("email")
     password = data.get("password")
@@ -50,18 +94,32 @@ def register():
         return jsonify({"success": False, "error": "Neplatný formát emailu", "message": "Email neodpovídá požadovanému formátu", "status_code": 400}), 400
     if not validate_password(password):
         return jsonify({"success": False, "error": "Složitost hesla", "message": "Heslo nesplňuje požadavky na složitost", "status_code": 400}), 400
+    min_strength = current_app.config["PASSWORD_MIN_STRENGTH"]
+    if min_strength > 0:
+        dictionary = get_dictionary(current_app.config["STRENGTH_DICT_PATH"])
+        if dictionary is None:
+            return _strength_unavailable()
+        strength = estimate_strength(password, user_inputs=[username, email, email.split("@")[0]], dictionary=dictionary)
+        if strength["score"] < min_strength:
+            message = strength["warning"] or "Heslo je příliš snadno uhodnutelné"
+            return jsonify({"success": False, "error": "Slabé heslo", "message": message, "status_code": 400}), 400
+    if current_app.config["BREACH_CHECK_REGISTRATION"] and _breach_count(password):
+        return jsonify({"success": False, "error": "Uniklé heslo", "message": "Heslo se objevilo v uniklých databázích, zvolte jiné", "status_code": 400}), 400
     if User.query.filter((User.username == username) | (User.email == email)).first():
         return jsonify({"success": False, "error": "Uživatel již existuje", "message": "Uživatel s tímto jménem nebo emailem již existuje", "status_code": 409}), 409
-    hashed_password = generate_password_hash(password)
-    user = User(username=username, email=email, password_hash=hashed_password)
+    hashed_password = hash_password(password)
+    user = User(username=username, email=email, password_hash=hashed_password, data_key=new_data_key())
     db.session.add(user)
     db.session.commit()
     return jsonify({"success": True, "message": "Uživatel byl úspěšně zaregistrován"})
 
 
 @api_bp.route("/login", methods=["POST"])   
+@admission_control("email")
 def login():
     data = request.get_json()
+    if not isinstance(data, dict):
+        return jsonify({"success": False, "error": "Neplatný vstup", "message": "Tělo požadavku musí být JSON objekt", "status_code": 400}), 400
     email = data.get("email")
     password = data.get("password")
     
@@ -70,8 +128,13 @@ def login():
     
     user = User.query.filter_by(email=email).first()
     
-    if not user or not check_password_hash(user.password_hash, password):
+    if not user or not verify_password(user.password_hash, password):
         return jsonify({"success": False, "error": "Neplatné přihlašovací údaje", "message": "Email nebo heslo je nesprávné", "status_code": 401}), 401
+
+    # Hash se staršími parametry přehashujeme, dokud známe heslo v čitelné podobě
+    if needs_rehash(user.password_hash):
+        user.password_hash = hash_password(password)
+        db.session.commit()
     
     access_token = create_access_token(identity=str(user.id))
     refresh_token = create_refresh_token(identity=str(user.id))
@@ -85,6 +148,7 @@ def login():
 
 @api_bp.route("/me", methods=["GET"])
 @jwt_required()
+@read_replica
 def me():
     user_id = int(get_jwt_identity())
     user = User.query.get(user_id)
@@ -101,18 +165,38 @@ def me():
 
 @api_bp.route("/passwords", methods=["GET", "POST"])
 @jwt_required()
+@read_replica
 def passwords():
     user_id = int(get_jwt_identity())
     if request.method == "GET":
-        passwords = Password.query.filter_by(user_id=user_id).all()
-        result = []
-        for p in passwords:
-            result.append({
-                "id": p.id,
-                "site": p.site,
-                "username": p.username,
-            })
-        return jsonify(result)
+        # Stránkování je volitelné: bez `limit` se vrací celý seznam jako dřív
+        limit = request.args.get("limit", type=int)
+        max_limit = current_app.config["PASSWORDS_MAX_LIMIT"]
+        if limit is not None and not 1 <= limit <= max_limit:
+            return jsonify({"success": False, "error": "Neplatný vstup", "message": f"Limit musí být 1–{max_limit}", "status_code": 400}), 400
+        # Podmíněný GET: nezměněný trezor se pozná podle verze bez dotazu na seznam
+        etag = list_etag(get_vault_version(user_id) or 0, request.query_string)
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+            response.set_etag(etag)
+            response.headers["Cache-Control"] = "private, no-cache"
+            return response
+        try:
+            rows, next_cursor = list_passwords(
+                user_id,
+                limit=limit,
+                cursor=request.args.get("cursor"),
+                sort=request.args.get("sort", "site"),
+                q=request.args.get("q"),
+            )
+        except ValueError as exc:
+            return jsonify({"success": False, "error": "Neplatný vstup", "message": str(exc), "status_code": 400}), 400
+        response = jsonify([{"id": r.id, "site": r.site, "username": r.username} for r in rows])
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "private, no-cache"
+        return response
     elif request.method == "POST":
         data = request.get_json()
         site = data.get("site")
@@ -124,7 +208,9 @@ def passwords():
             user_id=user_id,
             site=site,
             username=username,
-            password_encrypted=encrypt_text(password),
+            password_encrypted=encrypt_text(password, user_id, site, username),
+            fingerprint=fingerprint_text(user_id, password),
+            change_version=bump_vault_version(user_id),
         )
         db.session.add(new_password)
         try:
@@ -138,16 +224,277 @@ def passwords():
                 "status_code": 409
             }), 409
 
-        return jsonify({"id": new_password.id, "success": True, "message": "Heslo bylo uloženo"})
+        # Heslo se uloží i tak (web ho může vyžadovat), klient jen zobrazí varování
+        return jsonify({"id": new_password.id, "success": True, "message": "Heslo bylo uloženo",
+                        "breach_count": _breach_count(password)})
+
+# Hromadná úprava hesel v jedné transakci
+@api_bp.route("/passwords", methods=["PATCH"])
+@jwt_required()
+def bulk_update_passwords():
+    user_id = int(get_jwt_identity())
+    data = request.get_json(silent=True) or {}
+    try:
+        updates = parse_updates(data.get("updates"), current_app.config["BULK_MAX_IDS"])
+    except BulkRequestError as exc:
+        return jsonify({"success": False, "error": "Neplatný vstup", "message": str(exc), "status_code": 400}), 400
+    try:
+        updated, failed = bulk_update(user_id, updates, max_workers=current_app.config["CRYPTO_WORKERS"])
+        updated, failed = set(updated), set(failed)
+        if updated:
+            db.session.commit()
+        else:
+            db.session.rollback()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({
+            "success": False,
+            "error": "Záznam již existuje",
+            "message": "Změna by vytvořila duplicitní web a uživatelské jméno, nic nebylo uloženo.",
+            "status_code": 409
+        }), 409
+    results = [
+        {"id": pid, "success": True} if pid in updated else
+        {"id": pid, "success": False, "error": "Chyba dešifrování", "message": "Heslo nelze dešifrovat, záznam nebyl změněn", "status_code": 500}
+        if pid in failed else
+        {"id": pid, "success": False, "error": "Heslo nenalezeno", "message": "Heslo neexistuje", "status_code": 404}
+        for pid in updates
+    ]
+    return jsonify({"success": True, "updated": len(updated), "results": results}), 200
+
+
+# Hromadné smazání hesel v jedné transakci
+@api_bp.route("/passwords", methods=["DELETE"])
+@jwt_required()
+def bulk_delete_passwords():
+    user_id = int(get_jwt_identity())
+    data = request.get_json(silent=True) or {}
+    try:
+        ids = parse_ids(data.get("ids"), current_app.config["BULK_MAX_IDS"])
+    except BulkRequestError as exc:
+        return jsonify({"success": False, "error": "Neplatný vstup", "message": str(exc), "status_code": 400}), 400
+    deleted = set(bulk_delete(user_id, ids))
+    if deleted:
+        db.session.commit()
+    else:
+        db.session.rollback()
+    results = [
+        {"id": pid, "success": True} if pid in deleted else
+        {"id": pid, "success": False, "error": "Heslo nenalezeno", "message": "Heslo neexistuje", "status_code": 404}
+        for pid in ids
+    ]
+    return jsonify({"success": True, "deleted": len(deleted), "results": results}), 200
+
+
+# Odhad síly jednoho hesla (měřič v registraci a generátoru); bez přihlášení, proto
+# s limitem na IP a souběh jako registrace - odhad je výpočetně drahý
+@api_bp.route("/strength", methods=["POST"])
+@admission_control()
+def password_strength():
+    data = request.get_json(silent=True) or {}
+    password = data.get("password")
+    if not isinstance(password, str) or not password:
+        return jsonify({"success": False, "error": "Neplatný vstup", "message": "Pole `password` je povinné", "status_code": 400}), 400
+    dictionary = get_dictionary(current_app.config["STRENGTH_DICT_PATH"])
+    if dictionary is None:
+        return _strength_unavailable()
+    user_inputs = [v for v in (data.get("username"), data.get("email")) if isinstance(v, str)]
+    result = estimate_strength(password, user_inputs=user_inputs, dictionary=dictionary)
+    return jsonify({
+        "success": True,
+        "score": result["score"],
+        "guesses_log10": result["guesses_log10"],
+        "crack_seconds": result["crack_seconds"],
+        "warning": result["warning"],
+    }), 200
+
+
+# Síla všech hesel v trezoru, nejslabší napřed
+@api_bp.route("/passwords/strength", methods=["GET"])
+@jwt_required()
+def vault_strength():
+    user_id = int(get_jwt_identity())
+    dictionary = get_dictionary(current_app.config["STRENGTH_DICT_PATH"])
+    if dictionary is None:
+        return _strength_unavailable()
+    table = Password.__table__
+    rows = db.session.execute(
+        select(table.c.id, table.c.site, table.c.username, table.c.password_encrypted).where(table.c.user_id == user_id)
+    ).all()
+    plaintexts = decrypt_many([r.password_encrypted for r in rows], user_id=user_id,
+                              max_workers=current_app.config["CRYPTO_WORKERS"],
+                              records=[(r.site, r.username) for r in rows])
+    readable = [(r, p) for r, p in zip(rows, plaintexts) if not isinstance(p, Exception)]
+    scores = score_many([p for _, p in readable], dictionary=dictionary)
+    entries = sorted(
+        ({"id": r.id, "site": r.site, "username": r.username, "score": s["score"],
+          "guesses_log10": s["guesses_log10"], "warning": s["warning"]} for (r, _), s in zip(readable, scores)),
+        key=lambda e: (e["guesses_log10"], e["id"]),
+    )
+    summary = {str(score): 0 for score in range(5)}
+    for entry in entries:
+        summary[str(entry["score"])] += 1
+    return jsonify({"success": True, "entries": entries, "summary": summary,
+                    "unreadable": len(rows) - len(readable)}), 200
+
+
+# Hesla z trezoru, která se objevila v únicích (lokální korpus, bez síťových dotazů)
+@api_bp.route("/passwords/breached", methods=["GET"])
+@jwt_required()
+def vault_breaches():
+    user_id = int(get_jwt_identity())
+    corpus = get_corpus(current_app.config["BREACH_CORPUS_PATH"])
+    if corpus is None:
+        return jsonify({"success": False, "error": "Služba nedostupná", "message": "Databáze uniklých hesel není nahraná", "status_code": 503}), 503
+    table = Password.__table__
+    rows = db.session.execute(
+        select(table.c.id, table.c.site, table.c.username, table.c.password_encrypted).where(table.c.user_id == user_id)
+    ).all()
+    plaintexts = decrypt_many([r.password_encrypted for r in rows], user_id=user_id,
+                              max_workers=current_app.config["CRYPTO_WORKERS"],
+                              records=[(r.site, r.username) for r in rows])
+    readable = [(r, p) for r, p in zip(rows, plaintexts) if not isinstance(p, Exception)]
+    counts = corpus.count_many([p for _, p in readable])
+    entries = sorted(
+        ({"id": r.id, "site": r.site, "username": r.username, "breach_count": count}
+         for (r, _), count in zip(readable, counts) if count),
+        key=lambda e: (-e["breach_count"], e["id"]),
+    )
+    return jsonify({"success": True, "entries": entries, "checked": len(readable),
+                    "unreadable": len(rows) - len(readable)}), 200
+
+
+# Opakovaně použitá hesla (podle otisků, bez dešifrování)
+@api_bp.route("/passwords/reuse", methods=["GET"])
+@jwt_required()
+def password_reuse():
+    user_id = int(get_jwt_identity())
+    groups, pending = find_reused(user_id)
+    return jsonify({
+        "success": True,
+        "groups": [
+            {"count": len(rows), "entries": [{"id": r.id, "site": r.site, "username": r.username} for r in rows]}
+            for rows in groups
+        ],
+        "pending": pending,
+    }), 200
+
+
+# Synchronizace změn od kurzoru (vložená, upravená i smazaná hesla)
+@api_bp.route("/passwords/changes", methods=["GET"])
+@jwt_required()
+def password_changes():
+    user_id = int(get_jwt_identity())
+    max_limit = current_app.config["SYNC_MAX_LIMIT"]
+    limit = request.args.get("limit", max_limit, type=int)
+    if not 1 <= limit <= max_limit:
+        return jsonify({"success": False, "error": "Neplatný vstup", "message": f"Limit musí být 1–{max_limit}", "status_code": 400}), 400
+    try:
+        changes, cursor, has_more = list_changes(user_id, request.args.get("since"), limit)
+    except CursorExpired as exc:
+        return jsonify({"success": False, "error": "Kurzor vypršel", "message": str(exc), "status_code": 410}), 410
+    except InvalidCursor as exc:
+        return jsonify({"success": False, "error": "Neplatný vstup", "message": str(exc), "status_code": 400}), 400
+    return jsonify({"success": True, "changes": changes, "cursor": cursor, "has_more": has_more}), 200
+
+
+# Vyhledávání podle webu a uživatelského jména (podřetězec i překlepy)
+@api_bp.route("/passwords/search", methods=["GET"])
+@jwt_required()
+def search():
+    user_id = int(get_jwt_identity())
+    q = request.args.get("q", "").strip()
+    limit = request.args.get("limit", 20, type=int)
+    max_limit = current_app.config["SEARCH_MAX_LIMIT"]
+    if not q or len(q) > 255:
+        return jsonify({"success": False, "error": "Neplatný vstup", "message": "Parametr `q` musí mít 1–255 znaků", "status_code": 400}), 400
+    if not 1 <= limit <= max_limit:
+        return jsonify({"success": False, "error": "Neplatný vstup", "message": f"Limit musí být 1–{max_limit}", "status_code": 400}), 400
+    results = search_passwords(user_id, q, limit)
+    return jsonify({
+        "success": True,
+        "results": [{"id": r.id, "site": r.site, "username": r.username, "score": round(s, 3)} for s, r in results],
+    }), 200
+
+
+# Našeptávání při psaní (prefix webu, slova webu nebo uživatelského jména)
+@api_bp.route("/passwords/suggest", methods=["GET"])
+@jwt_required()
+def suggest():
+    user_id = int(get_jwt_identity())
+    q = request.args.get("q", "").strip()
+    limit = request.args.get("limit", 10, type=int)
+    max_limit = current_app.config["SUGGEST_MAX_LIMIT"]
+    if not q:
+        return jsonify({"success": False, "error": "Neplatný vstup", "message": "Parametr `q` je povinný", "status_code": 400}), 400
+    if not 1 <= limit <= max_limit:
+        return jsonify({"success": False, "error": "Neplatný vstup", "message": f"Limit musí být 1–{max_limit}", "status_code": 400}), 400
+    index = get_prefix_index(user_id, max_users=current_app.config["SEARCH_INDEX_MAX_USERS"])
+    return jsonify({
+        "success": True,
+        "results": [{"id": pid, "site": site, "username": username} for pid, site, username in index.lookup(q, limit)],
+    }), 200
+
+
+# Hromadný import hesel (CSV / JSON / NDJSON)
+@api_bp.route("/passwords/import", methods=["POST"])
+@jwt_required()
+def import_passwords():
+    user_id = int(get_jwt_identity())
+    # Limit platí jen pro import; větší tělo (i bez Content-Length) skončí 413 dřív, než se uloží na disk
+    request.max_content_length = current_app.config["IMPORT_MAX_BYTES"]
+    upload = request.files.get("file")
+    if upload:
+        stream, filename = upload.stream, upload.filename
+    else:
+        # Soubor lze poslat i přímo jako tělo požadavku (např. curl --data-binary)
+        stream, filename = request.stream, None
+    try:
+        fmt = detect_format(filename, request.args.get("format"))
+        stats = import_vault(
+            user_id,
+            stream,
+            fmt,
+            on_conflict=request.args.get("on_conflict", "skip"),
+            batch_size=current_app.config["IMPORT_BATCH_SIZE"],
+            workers=current_app.config["IMPORT_WORKERS"],
+        )
+    except (VaultImportError, UnicodeDecodeError) as exc:
+        db.session.rollback()
+        body = {"success": False, "error": "Neplatný soubor", "message": str(exc), "status_code": 400}
+        partial = getattr(exc, "stats", None)
+        if partial:
+            # Dávky před chybným řádkem zůstaly uložené
+            body.update(partial)
+            body["message"] = f"{exc} Před chybou na řádku {partial['row']} bylo uloženo {partial['imported']} hesel."
+        return jsonify(body), 400
+    return jsonify({"success": True, "message": "Import byl dokončen", **stats}), 200
+
+
+# Streamovaný export hesel (NDJSON / CSV)
+@api_bp.route("/passwords/export", methods=["GET"])
+@jwt_required()
+def export_passwords():
+    user_id = int(get_jwt_identity())
+    fmt = request.args.get("format", "ndjson").lower()
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({"success": False, "error": "Neplatný vstup", "message": f"Podporované formáty exportu: {', '.join(EXPORT_FORMATS)}", "status_code": 400}), 400
+    chunks = iter_export(user_id, fmt, yield_per=current_app.config["EXPORT_YIELD_PER"])
+    response = Response(stream_with_context(chunks), mimetype=EXPORT_FORMATS[fmt])
+    response.headers["Content-Disposition"] = f'attachment; filename="passwords.{fmt}"'
+    response.headers["Cache-Control"] = "no-store"
+    return response
+
 
 @api_bp.route("/passwords/<int:pid>/reveal", methods=["GET"])
 @jwt_required()
+@read_replica
 def reveal_password(pid):
     user_id = int(get_jwt_identity())
     item = Password.query.filter_by(id=pid, user_id=user_id).first()
     if not item:
         return jsonify({"success": False, "error": "Heslo nenalezeno", "message": "Heslo neexistuje", "status_code": 404}), 404
-    decrypted = decrypt_text(item.password_encrypted)
+    decrypted = decrypt_text(item.password_encrypted, user_id, item.site, item.username)
     return jsonify({
         "success": True,
         "id": item.id,
@@ -156,6 +503,44 @@ def reveal_password(pid):
         "password": decrypted,
     }), 200
 
+# Hromadné zobrazení hesel
+@api_bp.route("/passwords/reveal", methods=["POST"])
+@jwt_required()
+def reveal_passwords():
+    user_id = int(get_jwt_identity())
+    data = request.get_json(silent=True) or {}
+    ids = data.get("ids")
+    max_ids = current_app.config["REVEAL_MAX_IDS"]
+    if not isinstance(ids, list) or not ids or not all(isinstance(i, int) and not isinstance(i, bool) for i in ids):
+        return jsonify({"success": False, "error": "Neplatný vstup", "message": "Pole `ids` musí být neprázdný seznam celých čísel", "status_code": 400}), 400
+    ids = list(dict.fromkeys(ids))
+    if len(ids) > max_ids:
+        return jsonify({"success": False, "error": "Neplatný vstup", "message": f"Najednou lze zobrazit nejvýše {max_ids} hesel", "status_code": 400}), 400
+
+    # Jeden IN dotaz omezený na uživatele, jen potřebné sloupce
+    table = Password.__table__
+    rows = db.session.execute(
+        select(table.c.id, table.c.site, table.c.username, table.c.password_encrypted)
+        .where(table.c.user_id == user_id, table.c.id.in_(ids))
+    ).all()
+    found = {r.id: r for r in rows}
+    found_ids = [pid for pid in ids if pid in found]
+    decrypted = dict(zip(found_ids, decrypt_many([found[pid].password_encrypted for pid in found_ids],
+                                                 user_id=user_id, max_workers=current_app.config["CRYPTO_WORKERS"],
+                                                 records=[(found[pid].site, found[pid].username) for pid in found_ids])))
+
+    results = []
+    for pid in ids:
+        if pid not in found:
+            results.append({"id": pid, "success": False, "error": "Heslo nenalezeno", "message": "Heslo neexistuje", "status_code": 404})
+        elif isinstance(decrypted[pid], Exception):
+            results.append({"id": pid, "success": False, "error": "Chyba dešifrování", "message": "Heslo nelze dešifrovat", "status_code": 500})
+        else:
+            row = found[pid]
+            results.append({"id": pid, "success": True, "site": row.site, "username": row.username, "password": decrypted[pid]})
+    return jsonify({"success": True, "results": results}), 200
+
+
 # Update password
 @api_bp.route("/passwords/<int:pid>", methods=["PUT"])
 @jwt_required()
@@ -165,6 +550,7 @@ def update_password(pid):
     if not item:
         return jsonify({"success": False, "error": "Heslo nenalezeno", "message": "Heslo neexistuje", "status_code": 404}), 404
     data = request.get_json() or {}
+    old_site, old_username = item.site, item.username
     if "site" in data:
         if not data["site"]:
             return jsonify({"success": False, "error": "Neplatný vstup", "message": "Web nemůže být prázdný", "status_code": 400}), 400
@@ -176,7 +562,13 @@ def update_password(pid):
     if "password" in data:
         if not data["password"]:
             return jsonify({"success": False, "error": "Neplatný vstup", "message": "Heslo nemůže být prázdné", "status_code": 400}), 400
-        item.password_encrypted = encrypt_text(data["password"])
+        item.password_encrypted = encrypt_text(data["password"], user_id, item.site, item.username)
+        item.fingerprint = fingerprint_text(user_id, data["password"])
+    elif (item.site, item.username) != (old_site, old_username):
+        # Šifrový text je svázaný s webem a uživatelským jménem, přejmenování ho přešifruje
+        plaintext = decrypt_text(item.password_encrypted, user_id, old_site, old_username)
+        item.password_encrypted = encrypt_text(plaintext, user_id, item.site, item.username)
+    item.change_version = bump_vault_version(user_id)
     db.session.commit()
     return jsonify({"success": True, "message": "Heslo bylo aktualizováno"}), 200
 
@@ -190,10 +582,36 @@ def delete_password(pid):
     if not item:
         return jsonify({"success": False, "error": "Heslo nenalezeno", "message": "Heslo neexistuje", "status_code": 404}), 404
     db.session.delete(item)
+    record_tombstones(user_id, [item.id], bump_vault_version(user_id))
     db.session.commit()
     return jsonify({"success": True, "message": "Heslo bylo smazáno"}), 200
 
 
+# Hromadné generování hesel
+@api_bp.route("/generate", methods=["POST"])
+@jwt_required()
+def generate():
+    data = request.get_json(silent=True) or {}
+    try:
+        count = int(data.get("count", 1))
+        length = int(data.get("length", 16))
+    except (TypeError, ValueError):
+        return jsonify({"success": False, "error": "Neplatný vstup", "message": "Počet a délka musí být celá čísla", "status_code": 400}), 400
+    max_count = current_app.config["GENERATOR_MAX_COUNT"]
+    max_length = current_app.config["GENERATOR_MAX_LENGTH"]
+    if not 1 <= count <= max_count or not 4 <= length <= max_length:
+        return jsonify({"success": False, "error": "Neplatný vstup", "message": f"Počet musí být 1–{max_count} a délka 4–{max_length}", "status_code": 400}), 400
+    sets = {name: data.get(name, True) for name in ("uppercase", "lowercase", "numbers", "symbols")}
+    # Jen skutečné JSON booleany - bool("false") by sadu zapnul
+    if not all(isinstance(value, bool) for value in sets.values()):
+        return jsonify({"success": False, "error": "Neplatný vstup", "message": "Volby uppercase, lowercase, numbers a symbols musí být true nebo false", "status_code": 400}), 400
+    charset = build_charset(**sets)
+    if not charset:
+        return jsonify({"success": False, "error": "Neplatný vstup", "message": "Vyberte alespoň jednu sadu znaků", "status_code": 400}), 400
+    passwords = generate_passwords(count, length, charset)
+    return jsonify({"success": True, "count": len(passwords), "passwords": passwords}), 200
+
+
 # JWT refresh endpoint
 @api_bp.route("/refresh", methods=["POST"])
 @jwt_required(refresh=True)
@@ -0,0 +1,87 @@
+import logging
+import os
+
+from alembic.config import Config as AlembicConfig
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import DBAPIError
+
+from backend import db
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = os.path.join(os.path.abspath(os.path.dirname(__file__)), "migrations")
+# Revize odpovídající schématu, které dřív vytvářel create_app() přímo přes DDL
+LEGACY_REVISION = "0001_initial_schema"
+# Klíč pro pg_advisory_lock, aby migrace při startu spouštěl jen jeden worker
+_ADVISORY_LOCK_ID = 0x70736D67
+
+_head_revision = None
+
+
+def head_revision() -> str:
+    """
+    Vrátí poslední revizi z migrations/versions (načte se jednou za proces).
+    """
+    global _head_revision
+    if _head_revision is None:
+        config = AlembicConfig(os.path.join(MIGRATIONS_DIR, "alembic.ini"))
+        config.set_main_option("script_location", MIGRATIONS_DIR)
+        _head_revision = ScriptDirectory.from_config(config).get_current_head()
+    return _head_revision
+
+
+def current_revision(connection) -> str | None:
+    """
+    Přečte jediný řádek tabulky alembic_version, nebo None pokud tabulka chybí.
+    """
+    try:
+        return connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+    except DBAPIError:
+        connection.rollback()
+        return None
+
+
+def _upgrade(connection, revision):
+    from flask_migrate import stamp, upgrade
+
+    legacy = revision is None and inspect(connection).has_table("password")
+    # Migrace běží na vlastním spojení, tohle nesmí držet otevřenou transakci
+    connection.commit()
+    if legacy:
+        # Databáze vytvořená starším create_app() bez Alembicu
+        logger.info("Označuji existující schéma revizí %s", LEGACY_REVISION)
+        stamp(directory=MIGRATIONS_DIR, revision=LEGACY_REVISION)
+    upgrade(directory=MIGRATIONS_DIR)
+
+
+def ensure_schema(app) -> bool:
+    """
+    Při startu porovná verzi schématu v databázi s head revizí migrací.
+
+    Je-li schéma aktuální, neprovede se žádné DDL, jen jeden SELECT. Jinak se při
+    SCHEMA_AUTO_MIGRATE spustí `alembic upgrade head` (na PostgreSQL pod advisory
+    lockem, aby ho souběžně startující workery nespouštěly vícekrát). Vrací True,
+    pokud je schéma po návratu aktuální.
+    """
+    head = head_revision()
+    with db.engine.connect() as connection:
+        if current_revision(connection) == head:
+            return True
+        if not app.config["SCHEMA_AUTO_MIGRATE"]:
+            logger.warning("Schéma databáze není aktuální (head %s), spusťte `flask db upgrade`.", head)
+            return False
+
+        postgres = connection.dialect.name == "postgresql"
+        if postgres:
+            connection.execute(text("SELECT pg_advisory_lock(:id)"), {"id": _ADVISORY_LOCK_ID})
+        try:
+            # Mezitím mohl migraci dokončit jiný worker
+            revision = current_revision(connection)
+            if revision != head:
+                _upgrade(connection, revision)
+        finally:
+            if postgres:
+                connection.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": _ADVISORY_LOCK_ID})
+            connection.commit()
+    return True
@@ -0,0 +1,269 @@
+import re
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from functools import lru_cache
+
+from sqlalchemy import DDL, event, func, or_, select, text
+
+from backend import db
+from backend.models import Password
+from backend.pagination import _escape_like
+from backend.versioning import get_vault_version
+
+# Pod touto délkou dotazu trigramy nic nenajdou, hledá se přes LIKE
+MIN_TRIGRAM_QUERY = 3
+# Minimální trigramová podobnost pro fuzzy shodu (stejně jako výchozí pg_trgm)
+MIN_SIMILARITY = 0.3
+# Kolikanásobek limitu kandidátů se načte z databáze k přeřazení
+CANDIDATE_FACTOR = 5
+
+_WORD_SPLIT = re.compile(r"[^0-9a-z]+")
+
+# --- Indexy v databázi -----------------------------------------------------
+# Vytvářejí se migrací 0003_password_search; tytéž příkazy se navěšují na
+# create_all (testy, lokální vývoj bez migrací).
+
+POSTGRES_SEARCH_DDL = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_password_site_trgm ON password USING gin (site gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_password_username_trgm ON password USING gin (username gin_trgm_ops)",
+)
+
+SQLITE_SEARCH_DDL = (
+    # External-content FTS5 tabulka: obsah se nečte dvakrát, jen index trigramů
+    "CREATE VIRTUAL TABLE IF NOT EXISTS password_fts USING fts5("
+    "site, username, content='password', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS password_fts_ai AFTER INSERT ON password BEGIN "
+    "INSERT INTO password_fts(rowid, site, username) VALUES (new.id, new.site, new.username); END",
+    "CREATE TRIGGER IF NOT EXISTS password_fts_ad AFTER DELETE ON password BEGIN "
+    "INSERT INTO password_fts(password_fts, rowid, site, username) VALUES ('delete', old.id, old.site, old.username); END",
+    # Jen při změně hledaných sloupců (ne např. při přešifrování hesla)
+    "CREATE TRIGGER IF NOT EXISTS password_fts_au AFTER UPDATE OF site, username ON password BEGIN "
+    "INSERT INTO password_fts(password_fts, rowid, site, username) VALUES ('delete', old.id, old.site, old.username); "
+    "INSERT INTO password_fts(rowid, site, username) VALUES (new.id, new.site, new.username); END",
+)
+
+for _statement in POSTGRES_SEARCH_DDL:
+    event.listen(Password.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+
+
+def sqlite_has_fts5_trigram(connection) -> bool:
+    """
+    True, pokud SQLite umí FTS5 s tokenizerem trigram (od 3.34, FTS5 musí být
+    zkompilované). Jinak se tabulka password_fts nevytváří a hledá se přes LIKE.
+    """
+    version = tuple(int(part) for part in connection.exec_driver_sql("SELECT sqlite_version()").scalar().split("."))
+    options = {row[0] for row in connection.exec_driver_sql("PRAGMA compile_options")}
+    return version >= (3, 34) and "ENABLE_FTS5" in options
+
+
+def _sqlite_fts_supported(ddl, target, bind, **kw):
+    return sqlite_has_fts5_trigram(bind)
+
+
+for _statement in SQLITE_SEARCH_DDL:
+    event.listen(
+        Password.__table__, "after_create",
+        DDL(_statement).execute_if(dialect="sqlite", callable_=_sqlite_fts_supported),
+    )
+event.listen(Password.__table__, "before_drop", DDL("DROP TABLE IF EXISTS password_fts").execute_if(dialect="sqlite"))
+
+_fts_available = {}
+
+
+def _has_sqlite_fts(connection) -> bool:
+    url = str(connection.engine.url)
+    if url not in _fts_available:
+        _fts_available[url] = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'password_fts'")
+        ).first() is not None
+    return _fts_available[url]
+
+
+# --- Řazení výsledků -------------------------------------------------------
+
+@lru_cache(maxsize=65536)
+def _word_trigrams(word: str) -> frozenset:
+    # Slova (com, google, ...) se v trezoru opakují, trigramy se počítají jednou
+    padded = f"  {word} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def trigrams(value: str) -> frozenset:
+    """Trigramy slov řetězce se stejným doplněním mezerami jako v pg_trgm."""
+    words = [w for w in _WORD_SPLIT.split(value.lower()) if w]
+    if len(words) == 1:
+        return _word_trigrams(words[0])
+    return frozenset().union(*map(_word_trigrams, words))
+
+
+def _jaccard(ta: frozenset, tb: frozenset) -> float:
+    if not ta or not tb:
+        return 0.0
+    common = len(ta & tb)
+    return common / (len(ta) + len(tb) - common)
+
+
+def similarity(a: str, b: str) -> float:
+    """Podíl společných trigramů (Jaccardův index), 0–1."""
+    return _jaccard(trigrams(a), trigrams(b))
+
+
+def _field_score(query: str, query_grams: frozenset, value: str) -> float:
+    value = value.lower()
+    if value == query:
+        return 1.0
+    if value.startswith(query):
+        return 0.9
+    words = [w for w in _WORD_SPLIT.split(value) if w]
+    if any(word.startswith(query) for word in words):
+        return 0.8
+    if query in value:
+        return 0.7
+    # Překlep se porovnává i s jednotlivými slovy ("githb" vs. "github" v "github.com")
+    word_grams = [_word_trigrams(w) for w in words]
+    sim = max([_jaccard(query_grams, frozenset().union(*word_grams))] + [_jaccard(query_grams, g) for g in word_grams])
+    return 0.6 * sim if sim >= MIN_SIMILARITY else 0.0
+
+
+def score(query: str, site: str, username: str, query_grams: frozenset | None = None) -> float:
+    """Skóre shody: přesná > prefix > začátek slova > podřetězec > fuzzy. Web má přednost."""
+    if query_grams is None:
+        query_grams = trigrams(query)
+    return max(_field_score(query, query_grams, site), 0.95 * _field_score(query, query_grams, username))
+
+
+# --- Vyhledávání -----------------------------------------------------------
+
+def _fts_quote(value: str) -> str:
+    return '"{}"'.format(value.replace('"', '""'))
+
+
+def _candidates(user_id: int, query: str, limit: int):
+    table = Password.__table__
+    connection = db.session.connection()
+    dialect = connection.dialect.name
+    pattern = f"%{_escape_like(query)}%"
+    substring = or_(table.c.site.ilike(pattern, escape="\\"), table.c.username.ilike(pattern, escape="\\"))
+    base = select(table.c.id, table.c.site, table.c.username).where(table.c.user_id == user_id)
+
+    if len(query) >= MIN_TRIGRAM_QUERY and dialect == "postgresql":
+        # Operátory ILIKE i % (podobnost) obslouží GIN indexy gin_trgm_ops
+        rank = func.greatest(func.similarity(table.c.site, query), func.similarity(table.c.username, query))
+        stmt = (base.where(or_(substring, table.c.site.op("%")(query), table.c.username.op("%")(query)))
+                .order_by(rank.desc()).limit(limit))
+        return db.session.execute(stmt).all()
+
+    if len(query) >= MIN_TRIGRAM_QUERY and dialect == "sqlite" and _has_sqlite_fts(connection):
+        stmt = text(
+            "SELECT p.id, p.site, p.username FROM password_fts "
+            "JOIN password p ON p.id = password_fts.rowid "
+            "WHERE password_fts MATCH :match AND p.user_id = :user_id "
+            "ORDER BY password_fts.rank LIMIT :limit"
+        )
+        # Fráze z trigramů = přesný podřetězec; je selektivní a tyto shody mají
+        # vždy vyšší skóre než překlepy
+        rows = db.session.execute(stmt, {"match": _fts_quote(query), "user_id": user_id, "limit": limit}).all()
+        if len(rows) < limit:
+            # Doplnění překlepů: OR trigramů, víc společných trigramů = lepší bm25 rank
+            grams = sorted({query[i:i + 3] for i in range(len(query) - 2)})
+            fuzzy = db.session.execute(stmt, {"match": " OR ".join(map(_fts_quote, grams)),
+                                              "user_id": user_id, "limit": limit}).all()
+            seen = {row.id for row in rows}
+            rows += [row for row in fuzzy if row.id not in seen][:limit - len(rows)]
+        return rows
+
+    return db.session.execute(base.where(substring).limit(limit)).all()
+
+
+def search_passwords(user_id: int, query: str, limit: int = 20) -> list:
+    """
+    Vyhledá hesla uživatele podle podřetězce nebo podobnosti webu či uživatelského
+    jména. Databáze (pg_trgm / SQLite FTS5) vrátí omezený počet kandidátů, ty se
+    seřadí podle `score` a vrátí se nejlepších `limit` jako [(skóre, řádek)].
+    """
+    query = query.strip().lower()
+    if not query:
+        return []
+    query_grams = trigrams(query)
+    ranked = []
+    for row in _candidates(user_id, query, limit * CANDIDATE_FACTOR):
+        row_score = score(query, row.site, row.username, query_grams)
+        if row_score > 0:
+            ranked.append((row_score, row))
+    ranked.sort(key=lambda item: (-item[0], item[1].site.lower(), item[1].id))
+    return ranked[:limit]
+
+
+# --- Prefixový index pro našeptávání ---------------------------------------
+
+class PrefixIndex:
+    """
+    Seřazené klíče (web, uživatelské jméno a jednotlivá slova webu, malými písmeny)
+    jednoho trezoru. Hledání prefixu je bisect + průchod navazujícími klíči.
+    `version` je verze trezoru, ze které byl index sestaven.
+    """
+
+    __slots__ = ("keys", "ids", "rows", "version")
+
+    def __init__(self, rows, version: int | None = None):
+        keys, ids = [], []
+        self.rows = {}
+        for row_id, site, username in rows:
+            self.rows[row_id] = (site, username)
+            site, username = site.lower(), username.lower()
+            row_keys = set(_WORD_SPLIT.split(site))
+            row_keys.discard("")
+            row_keys.add(site)
+            row_keys.add(username)
+            keys.extend(row_keys)
+            ids.extend([row_id] * len(row_keys))
+        # Řadí se jen řetězce (rychlejší než n-tice), id se přeskládají podle pořadí
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self.keys = [keys[i] for i in order]
+        self.ids = [ids[i] for i in order]
+        self.version = version
+
+    def lookup(self, prefix: str, limit: int) -> list:
+        """Vrátí až `limit` záznamů [(id, web, uživatel)] s klíčem začínajícím na `prefix`."""
+        prefix = prefix.lower()
+        results, seen = [], set()
+        i = bisect_left(self.keys, prefix)
+        while i < len(self.keys) and self.keys[i].startswith(prefix) and len(results) < limit:
+            row_id = self.ids[i]
+            if row_id not in seen:
+                seen.add(row_id)
+                results.append((row_id, *self.rows[row_id]))
+            i += 1
+        return results
+
+
+_indexes = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def get_prefix_index(user_id: int, max_users: int = 1000) -> PrefixIndex:
+    """
+    Vrátí prefixový index trezoru z paměti procesu, případně ho sestaví jedním
+    dotazem. Platnost se ověřuje podle verze trezoru (dotaz na primární klíč),
+    takže zápisy z libovolného workeru se projeví hned.
+    """
+    version = get_vault_version(user_id)
+    with _indexes_lock:
+        index = _indexes.get(user_id)
+        if index is not None and index.version == version:
+            _indexes.move_to_end(user_id)
+            return index
+
+    table = Password.__table__
+    rows = db.session.execute(
+        select(table.c.id, table.c.site, table.c.username).where(table.c.user_id == user_id)
+    ).all()
+    index = PrefixIndex(rows, version)
+    with _indexes_lock:
+        _indexes[user_id] = index
+        _indexes.move_to_end(user_id)
+        while len(_indexes) > max_users:
+            _indexes.popitem(last=False)
+    return index
@@ -1,19 +1,47 @@
+import base64
+import hashlib
+import hmac
+import json
 import os
-from cryptography.fernet import Fernet
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from cryptography.exceptions import InvalidTag
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+from sqlalchemy import select
+
+from backend import db
+from backend.models import User
+from backend.metrics import CRYPTO_SECONDS, timed
 
 # upřednostňujeme klíč z prostředí, aby se v produkci neztrácela data
 _env_key = os.environ.get("FERNET_KEY")
+# Starší klíče (oddělené čárkou) slouží jen k dešifrování, dokud neproběhne `flask rotate-keys`
+_env_old_keys = os.environ.get("FERNET_OLD_KEYS", "")
 _flask_env = os.environ.get("FLASK_ENV", "development")
+# Klíče vygenerované do backend/instance (mimo git) jen pro lokální vývoj a testy;
+# jinde by se při novém nasazení tiše vytvořil nový klíč a stará data by nešla přečíst
+_key_files_allowed = _flask_env in ("development", "testing")
 
-if _env_key:
-    key_bytes = _env_key.strip().encode()
+
+def _load_key(key_bytes: bytes, name: str) -> Fernet:
     try:
-        fernet = Fernet(key_bytes)
+        return Fernet(key_bytes)
     except (ValueError, TypeError) as exc:
-        raise ValueError("Hodnota FERNET_KEY není platný Fernet klíč.") from exc
+        raise ValueError(f"Hodnota {name} není platný Fernet klíč.") from exc
+
+
+if _env_key:
+    key_bytes = _env_key.strip().encode()
 else:
-    if _flask_env == "production":
-        raise RuntimeError("V produkci musí být nastaveno prostředí FERNET_KEY.")
+    if not _key_files_allowed:
+        raise RuntimeError(f"Mimo vývoj (FLASK_ENV={_flask_env}) musí být nastaveno prostředí FERNET_KEY.")
     # fallback pro lokální vývoj - uložený klíč na disku
     BASE_DIR = os.path.abspath(os.path.dirname(__file__))
     KEY_FILE = os.path.join(BASE_DIR, "instance", "fernet.key")
@@ -27,10 +55,258 @@ else:
         with open(KEY_FILE, "rb") as f:
             key_bytes = f.read()
 
-    fernet = Fernet(key_bytes)
+primary_fernet = _load_key(key_bytes, "FERNET_KEY")
+# Otisk primárního klíče (např. pro checkpoint rotace), ne klíč samotný
+PRIMARY_KEY_ID = hashlib.sha256(key_bytes.strip()).hexdigest()[:16]
+
+# Šifruje se vždy primárním klíčem, dešifruje se kterýmkoli z klíčů
+old_fernets = [_load_key(k.strip().encode(), "FERNET_OLD_KEYS") for k in _env_old_keys.split(",") if k.strip()]
+fernet = MultiFernet([primary_fernet, *old_fernets])
+
+# Klíč pro otisky hesel (HMAC-SHA256) je oddělený od šifrovacího: otisk prozradí
+# jen shodu hesel, a to jen tomu, kdo má tento klíč
+_env_fingerprint_key = os.environ.get("FINGERPRINT_KEY")
+# Délka otisku v hex znacích (128 bitů stačí na rozlišení hesel a index je menší)
+FINGERPRINT_LENGTH = 32
+
+if _env_fingerprint_key:
+    fingerprint_key = _env_fingerprint_key.strip().encode()
+else:
+    if not _key_files_allowed:
+        raise RuntimeError(f"Mimo vývoj (FLASK_ENV={_flask_env}) musí být nastaveno prostředí FINGERPRINT_KEY.")
+    FINGERPRINT_KEY_FILE = os.path.join(os.path.abspath(os.path.dirname(__file__)), "instance", "fingerprint.key")
+    os.makedirs(os.path.dirname(FINGERPRINT_KEY_FILE), exist_ok=True)
+    if not os.path.exists(FINGERPRINT_KEY_FILE):
+        with open(FINGERPRINT_KEY_FILE, "w") as f:
+            f.write(secrets.token_hex(32))
+    with open(FINGERPRINT_KEY_FILE) as f:
+        fingerprint_key = f.read().strip().encode()
+if len(fingerprint_key) < 32:
+    raise ValueError("FINGERPRINT_KEY musí mít alespoň 32 znaků.")
+
+_encrypt_seconds = CRYPTO_SECONDS.labels("encrypt")
+_decrypt_seconds = CRYPTO_SECONDS.labels("decrypt")
+_rotate_seconds = CRYPTO_SECONDS.labels("rotate")
+
+# --- Obálkové šifrování ----------------------------------------------------
+# Každý uživatel má vlastní datový klíč uložený v User.data_key, zašifrovaný hlavním
+# klíčem. Změna hlavního klíče tak přešifruje jen jeden krátký řádek na uživatele.
+#
+# Formáty uloženého hesla (sloupec password_encrypted, bajty):
+#   AEAD_V1 | nonce (12 B) | AES-256-GCM šifrový text + tag (16 B) - datový klíč uživatele,
+#       associated data je AEAD_V1 + identita záznamu (user_id, web, uživatelské jméno)
+#   Fernet token (b"gAAAAA...") - přímo hlavní klíč, uživatel zatím nemá datový klíč
+# Binární formát ušetří base64, časové razítko a padding CBC a ověření i dešifrování
+# zvládne jeden průchod GCM. Identita záznamu v associated data zajistí, že šifrový
+# text přesunutý do jiného řádku (i téhož uživatele) se nedešifruje. Starší řádky
+# převede `flask envelope-migrate`.
+AEAD_V1 = b"\x01"
+MASTER_TOKEN_PREFIX = b"gAAAAA"
+_NONCE_SIZE = 12
+_AEAD_INFO = b"password-manager/aead-v1"
+
+# Rozbalené datové klíče v paměti procesu: user_id -> (DataKey, platnost do), LRU
+_data_keys = OrderedDict()
+_data_keys_lock = threading.Lock()
+_data_key_cache_size = 10000
+_data_key_cache_ttl = 300.0
+
+
+class DataKey:
+    """Rozbalený datový klíč uživatele: klíč AES-GCM odvozený z uloženého materiálu."""
+
+    __slots__ = ("aead",)
+
+    def __init__(self, raw: bytes):
+        # Uložený materiál má formát Fernet klíče, klíč GCM se z něj odvozuje přes HKDF
+        hkdf = HKDF(algorithm=hashes.SHA256(), length=32, salt=None, info=_AEAD_INFO)
+        self.aead = AESGCM(hkdf.derive(base64.urlsafe_b64decode(raw)))
+
+
+def init_security(app):
+    """Načte velikost a platnost cache rozbalených datových klíčů z konfigurace aplikace."""
+    global _data_key_cache_size, _data_key_cache_ttl
+    _data_key_cache_size = app.config["DATA_KEY_CACHE_SIZE"]
+    _data_key_cache_ttl = app.config["DATA_KEY_CACHE_TTL"]
+    clear_data_key_cache()
+
+
+def clear_data_key_cache():
+    """Zahodí rozbalené datové klíče (např. po smazání uživatele)."""
+    with _data_keys_lock:
+        _data_keys.clear()
+
+
+def new_data_key() -> str:
+    """Vygeneruje datový klíč pro nového uživatele a vrátí ho zabalený hlavním klíčem (User.data_key)."""
+    return fernet.encrypt(Fernet.generate_key()).decode()
+
+
+def user_data_key(user_id: int) -> DataKey | None:
+    """
+    Rozbalený datový klíč uživatele, nebo None, pokud ho uživatel ještě nemá (jeho
+    hesla se šifrují hlavním klíčem, viz `flask envelope-migrate`). Při chybějící
+    položce v cache čte User.data_key, takže musí běžet v app contextu.
+    """
+    now = time.monotonic()
+    with _data_keys_lock:
+        cached = _data_keys.get(user_id)
+        if cached is not None and cached[1] > now:
+            _data_keys.move_to_end(user_id)
+            return cached[0]
+
+    wrapped = db.session.execute(select(User.__table__.c.data_key).where(User.__table__.c.id == user_id)).scalar()
+    if wrapped is None:
+        return None
+    key = DataKey(fernet.decrypt(wrapped.encode()))
+    with _data_keys_lock:
+        _data_keys[user_id] = (key, now + _data_key_cache_ttl)
+        _data_keys.move_to_end(user_id)
+        while len(_data_keys) > _data_key_cache_size:
+            _data_keys.popitem(last=False)
+    return key
+
+
+def record_context(user_id: int | None, site: str | None, username: str | None) -> bytes:
+    """
+    Identita záznamu hesla pro associated data AES-GCM. Web a uživatelské jméno jsou
+    v trezoru uživatele unikátní, takže ji znají i víceřádkové INSERTy bez id.
+    """
+    return json.dumps([user_id, site, username], ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def encrypt_with_key(key: DataKey | None, plaintext: str, context: bytes) -> bytes:
+    """
+    Zašifruje heslo datovým klíčem (None = hlavním klíčem) a sváže ho s identitou
+    záznamu `context` (viz record_context); bez přístupu k databázi, lze volat z vláken.
+    """
+    with timed(_encrypt_seconds):
+        if key is None:
+            return fernet.encrypt(plaintext.encode())
+        nonce = os.urandom(_NONCE_SIZE)
+        return AEAD_V1 + nonce + key.aead.encrypt(nonce, plaintext.encode(), AEAD_V1 + context)
+
+
+def decrypt_with_key(key: DataKey | None, ciphertext: bytes | str, context: bytes) -> str:
+    """
+    Dešifruje heslo v kterémkoli uloženém formátu (podle prefixu); lze volat z vláken.
+    Chybný klíč, poškozená data nebo jiná identita záznamu vyhodí InvalidToken.
+    """
+    if isinstance(ciphertext, str):
+        ciphertext = ciphertext.encode()
+    with timed(_decrypt_seconds):
+        if ciphertext[:1] == AEAD_V1:
+            if key is None:
+                raise InvalidToken
+            nonce = ciphertext[1:1 + _NONCE_SIZE]
+            try:
+                return key.aead.decrypt(nonce, ciphertext[1 + _NONCE_SIZE:], AEAD_V1 + context).decode()
+            except InvalidTag as exc:
+                raise InvalidToken from exc
+        return fernet.decrypt(ciphertext).decode()
+
+
+def uses_data_key(ciphertext: bytes | str) -> bool:
+    """Zda je heslo šifrované datovým klíčem (v kterémkoli formátu), ne přímo hlavním klíčem."""
+    if isinstance(ciphertext, str):
+        ciphertext = ciphertext.encode()
+    return ciphertext[:1] == AEAD_V1
+
+
+def encrypt_text(plaintext: str, user_id: int | None = None, site: str | None = None, username: str | None = None) -> bytes:
+    """Zašifruje heslo záznamu (user_id, site, username) datovým klíčem uživatele (bez `user_id` nebo bez klíče hlavním klíčem)."""
+    key = user_data_key(user_id) if user_id is not None else None
+    return encrypt_with_key(key, plaintext, record_context(user_id, site, username))
+
+def fingerprint_text(user_id: int, plaintext: str) -> str:
+    """
+    Otisk hesla pro hledání opakovaně použitých hesel bez dešifrování. Id uživatele
+    je součástí vstupu, takže stejné heslo dvou uživatelů má různé otisky.
+    """
+    message = f"{user_id}:{plaintext}".encode()
+    return hmac.new(fingerprint_key, message, hashlib.sha256).hexdigest()[:FINGERPRINT_LENGTH]
+
+def decrypt_text(ciphertext: bytes | str, user_id: int | None = None, site: str | None = None, username: str | None = None) -> str:
+    """Dešifruje heslo záznamu (user_id, site, username) (hesla šifrovaná hlavním klíčem i bez něj)."""
+    key = user_data_key(user_id) if user_id is not None and uses_data_key(ciphertext) else None
+    return decrypt_with_key(key, ciphertext, record_context(user_id, site, username))
+
+def rotate_text(ciphertext: bytes | str) -> bytes | str | None:
+    """
+    Přešifruje token hlavního klíče (heslo bez datového klíče nebo zabalený datový
+    klíč) primárním klíčem a vrátí ho ve stejném typu (bytes/str). Vrací None, pokud
+    už primárním klíčem zašifrovaný je nebo jde o heslo šifrované datovým klíčem
+    (není co měnit). Nedešifrovatelný token vyhodí InvalidToken.
+    """
+    if uses_data_key(ciphertext):
+        return None
+    token = ciphertext.encode() if isinstance(ciphertext, str) else ciphertext
+    with timed(_rotate_seconds):
+        try:
+            primary_fernet.decrypt(token)
+            return None
+        except InvalidToken:
+            pass
+        rotated = fernet.rotate(token)
+    return rotated.decode() if isinstance(ciphertext, str) else rotated
+
+
+# Pod touto velikostí dávky se šifruje/dešifruje přímo ve vlákně požadavku (pool by jen zdržoval)
+PARALLEL_THRESHOLD = 16
+
+# Pooly podle velikosti: volající s jiným `max_workers` (CRYPTO_WORKERS, --workers
+# u CLI příkazů) dostane pool své velikosti, ne ten, který vznikl první
+_executors = {}
+_executor_lock = threading.Lock()
+
+
+def _get_executor(max_workers: int) -> ThreadPoolExecutor:
+    """
+    Sdílený omezený pool vláken dané velikosti pro hromadné šifrování a dešifrování.
+    AES a HMAC v knihovně cryptography uvolňují GIL, takže vlákna běží skutečně paralelně.
+    """
+    executor = _executors.get(max_workers)
+    if executor is None:
+        with _executor_lock:
+            executor = _executors.get(max_workers)
+            if executor is None:
+                executor = _executors[max_workers] = ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix=f"crypto{max_workers}")
+    return executor
+
+
+def _decrypt_or_error(key, ciphertext, context):
+    try:
+        return decrypt_with_key(key, ciphertext, context)
+    except Exception as exc:  # InvalidToken, poškozená data...
+        return exc
+
+
+def decrypt_many(ciphertexts: list[bytes], user_id=None, max_workers: int = 4, records=None) -> list:
+    """
+    Dešifruje seznam tokenů a vrátí výsledky ve stejném pořadí. `user_id` je id
+    vlastníka všech tokenů, nebo seznam id ke každému tokenu; `records` jsou dvojice
+    (web, uživatelské jméno) záznamů. Místo vyhození výjimky je u nedešifrovatelné
+    položky na jejím místě instance výjimky.
+    """
+    user_ids = list(user_id) if isinstance(user_id, (list, tuple)) else [user_id] * len(ciphertexts)
+    records = records if records is not None else [(None, None)] * len(ciphertexts)
+    # Datové klíče se rozbalí předem ve vlákně požadavku, vlákna poolu do databáze nesahají
+    keys = {uid: user_data_key(uid) if uid is not None else None for uid in set(user_ids)}
+    row_keys = [keys[uid] for uid in user_ids]
+    contexts = [record_context(uid, site, username) for uid, (site, username) in zip(user_ids, records)]
+    if len(ciphertexts) < PARALLEL_THRESHOLD or max_workers <= 1:
+        return [_decrypt_or_error(k, c, x) for k, c, x in zip(row_keys, ciphertexts, contexts)]
+    chunksize = max(len(ciphertexts) // (max_workers * 4), 1)
+    return list(_get_executor(max_workers).map(_decrypt_or_error, row_keys, ciphertexts, contexts, chunksize=chunksize))
 
-def encrypt_text(plaintext: str) -> str:
-    return fernet.encrypt(plaintext.encode()).decode()
 
-def decrypt_text(ciphertext: str) -> str:
-    return fernet.decrypt(ciphertext.encode()).decode()
+def encrypt_many(plaintexts: list[str], user_id: int | None = None, max_workers: int = 4, records=None) -> list[bytes]:
+    """Zašifruje seznam hesel uživatele pro záznamy `records` (dvojice web, uživatelské jméno) a vrátí tokeny ve stejném pořadí."""
+    encrypt = partial(encrypt_with_key, user_data_key(user_id) if user_id is not None else None)
+    records = records if records is not None else [(None, None)] * len(plaintexts)
+    contexts = [record_context(user_id, site, username) for site, username in records]
+    if len(plaintexts) < PARALLEL_THRESHOLD or max_workers <= 1:
+        return [encrypt(p, x) for p, x in zip(plaintexts, contexts)]
+    chunksize = max(len(plaintexts) // (max_workers * 4), 1)
+    return list(_get_executor(max_workers).map(encrypt, plaintexts, contexts, chunksize=chunksize))
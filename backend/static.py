@@ -0,0 +1,178 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+
+from flask import Response, request
+from werkzeug.wsgi import wrap_file
+
+try:
+    import brotli  # volitelná závislost, bez ní se servíruje jen gzip
+except ImportError:  # pragma: no cover - záleží na prostředí
+    brotli = None
+
+# Soubory s hashem obsahu v názvu (CRA: main.1a2b3c4d.js, Vite: index-B1c2D3e4.js)
+_HASHED_ASSET = re.compile(r"^(static|assets)/.+[.-][0-9A-Za-z_]{8,}\.[A-Za-z0-9]+$")
+# Přípony, které má smysl komprimovat
+COMPRESSIBLE = (".html", ".js", ".mjs", ".css", ".json", ".map", ".svg", ".txt", ".xml", ".ico", ".webmanifest")
+_VARIANT_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+CACHE_IMMUTABLE = "public, max-age=31536000, immutable"
+CACHE_REVALIDATE = "no-cache"
+
+
+class StaticFile:
+    """Záznam manifestu: cesta na disku, metadata a předkomprimované varianty."""
+
+    __slots__ = ("path", "size", "mimetype", "etag", "cache_control", "variants", "data")
+
+    def __init__(self, path, size, mimetype, etag, cache_control):
+        self.path = path
+        self.size = size
+        self.mimetype = mimetype
+        self.etag = etag
+        self.cache_control = cache_control
+        # kódování -> (cesta nebo None, velikost, data v paměti nebo None)
+        self.variants = {}
+        # celý obsah v paměti (jen index.html)
+        self.data = None
+
+
+def _file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:32]
+
+
+def build_manifest(directory: str) -> dict:
+    """
+    Jednou projde build adresář a vytvoří manifest {relativní cesta: StaticFile}
+    se silnými ETagy podle obsahu. Soubory .gz/.br vedle originálu se berou jako
+    jeho předkomprimované varianty.
+    """
+    manifest = {}
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.endswith((".gz", ".br")):
+                continue
+            full = os.path.join(root, name)
+            rel = os.path.relpath(full, directory).replace(os.sep, "/")
+            mimetype = mimetypes.guess_type(name)[0] or "application/octet-stream"
+            cache = CACHE_IMMUTABLE if _HASHED_ASSET.match(rel) else CACHE_REVALIDATE
+            entry = StaticFile(full, os.path.getsize(full), mimetype, _file_digest(full), cache)
+            for encoding, suffix in _VARIANT_SUFFIXES.items():
+                if os.path.exists(full + suffix):
+                    entry.variants[encoding] = (full + suffix, os.path.getsize(full + suffix), None)
+            manifest[rel] = entry
+
+    index = manifest.get("index.html")
+    if index is not None:
+        # index.html se posílá na každou SPA cestu, držíme ho celý v paměti i s variantami
+        with open(index.path, "rb") as f:
+            index.data = f.read()
+        compressed = {"gzip": gzip.compress(index.data, 9, mtime=0)}
+        if brotli is not None:
+            compressed["br"] = brotli.compress(index.data)
+        index.variants = {enc: (None, len(data), data) for enc, data in compressed.items()}
+    return manifest
+
+
+def precompress(directory: str, min_size: int = 1024) -> int:
+    """
+    Vytvoří vedle komprimovatelných souborů varianty .gz (a .br, je-li k dispozici
+    knihovna brotli). Vrací počet zapsaných souborů. Určeno pro build krok.
+    """
+    written = 0
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if not name.endswith(COMPRESSIBLE):
+                continue
+            full = os.path.join(root, name)
+            with open(full, "rb") as f:
+                data = f.read()
+            if len(data) < min_size:
+                continue
+            variants = {".gz": gzip.compress(data, 9, mtime=0)}
+            if brotli is not None:
+                variants[".br"] = brotli.compress(data)
+            for suffix, compressed in variants.items():
+                # Varianta, která nic neušetří, se nevyplatí
+                if len(compressed) < len(data):
+                    with open(full + suffix, "wb") as f:
+                        f.write(compressed)
+                    written += 1
+    return written
+
+
+def _negotiate(entry):
+    for encoding in ("br", "gzip"):
+        if encoding in entry.variants and request.accept_encodings[encoding]:
+            return encoding
+    return None
+
+
+def _not_modified(etag):
+    return etag in request.if_none_match
+
+
+def serve_static_file(entry: StaticFile) -> Response:
+    """
+    Odešle soubor z manifestu: vybere předkomprimovanou variantu podle
+    Accept-Encoding, odpoví 304 na shodný If-None-Match a nastaví Cache-Control.
+    """
+    encoding = _negotiate(entry)
+    etag = f"{entry.etag}-{encoding}" if encoding else entry.etag
+    headers = {"Cache-Control": entry.cache_control}
+    if entry.variants:
+        headers["Vary"] = "Accept-Encoding"
+
+    if _not_modified(etag):
+        response = Response(status=304, headers=headers)
+        response.set_etag(etag)
+        return response
+
+    if encoding:
+        path, size, data = entry.variants[encoding]
+        headers["Content-Encoding"] = encoding
+    else:
+        path, size, data = entry.path, entry.size, entry.data
+
+    if data is not None:
+        response = Response(data, mimetype=entry.mimetype, headers=headers)
+    else:
+        body = wrap_file(request.environ, open(path, "rb"))
+        response = Response(body, mimetype=entry.mimetype, headers=headers, direct_passthrough=True)
+        response.content_length = size
+    response.set_etag(etag)
+    return response
+
+
+def register_static(app, directory: str):
+    """
+    Zaregistruje servírování React buildu z manifestu sestaveného při startu.
+    Neznámé cesty mimo /api vrací index.html (SPA routing).
+    """
+    manifest = build_manifest(directory) if os.path.isdir(directory) else None
+    app.extensions["static_manifest"] = manifest
+
+    @app.route("/", defaults={"path": ""})
+    @app.route("/<path:path>")
+    def serve_react_app(path):
+        if path.startswith("api/"):
+            # API routes jsou handled jinak
+            return "API route not found", 404
+        if manifest is None or "index.html" not in manifest:
+            return "Static folder not found", 500
+        entry = manifest.get(path) if path else None
+        # Pro SPA - všechny ostatní routes přesměruj na index.html
+        return serve_static_file(entry or manifest["index.html"])
+
+
+if __name__ == "__main__":
+    # Build krok: python -m backend.static frontend/build
+    import sys
+    target = sys.argv[1] if len(sys.argv) > 1 else "frontend/build"
+    print(f"Předkomprimováno {precompress(target)} souborů v {target}")
@@ -0,0 +1,598 @@
+import hashlib
+import math
+import mmap
+import os
+import re
+import struct
+import threading
+import unicodedata
+from math import comb, factorial
+
+WORDLIST_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "wordlists")
+DEFAULT_DICT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "instance", "strength.dict")
+
+# --- Kompilovaný slovník ---------------------------------------------------
+# Seznamy slov z data/wordlists se kompilují do binárního trie, které se mapuje
+# přes mmap - všechny workery gunicornu tak sdílejí stejné stránky v cache OS.
+# Formát (little endian): hlavička (včetně SHA-256 zdrojových seznamů), názvy slovníků po 16 B a pole
+#   edge_start u32[N], edge_count u32[N], rank u32[N], dict u8[N],
+#   label u8[E], child u32[E]
+# (každé pole zarovnané na 4 B). Hrany uzlu leží za sebou seřazené podle bajtu.
+
+MAGIC = b"PMSTRDB2"
+_HEADER = struct.Struct("<8sIII32s")
+_NAME_SIZE = 16
+
+
+def _fold_char(char: str) -> str:
+    # Malá písmena bez diakritiky; délka se zachová, aby sedět pozice v hesle
+    lowered = char.lower()
+    folded = "".join(c for c in unicodedata.normalize("NFKD", lowered) if not unicodedata.combining(c))
+    if len(folded) == 1:
+        return folded
+    return lowered if len(lowered) == 1 else char
+
+
+def fold(text: str) -> str:
+    """Převede text na malá písmena bez diakritiky se zachováním délky."""
+    if text.isascii():
+        return text.lower()
+    return "".join(map(_fold_char, text))
+
+
+def _pad4(data: bytes) -> bytes:
+    return data + b"\0" * (-len(data) % 4)
+
+
+def sources_digest(wordlist_dir: str = WORDLIST_DIR) -> bytes:
+    """SHA-256 názvů a obsahu seznamů slov; podle něj se pozná zastaralý slovník."""
+    digest = hashlib.sha256()
+    for name in sorted(f for f in os.listdir(wordlist_dir) if f.endswith(".txt")):
+        with open(os.path.join(wordlist_dir, name), "rb") as f:
+            content = f.read()
+        digest.update(f"{name}\0{len(content)}\0".encode())
+        digest.update(content)
+    return digest.digest()
+
+
+def build_dictionary(output: str, wordlist_dir: str = WORDLIST_DIR) -> int:
+    """
+    Zkompiluje slovníky (*.txt, jedno slovo na řádek, seřazené od nejčastějšího)
+    do binárního trie v `output`. Zápis je atomický, souběžně běžící workery tak
+    nikdy nenamapují rozepsaný soubor. Vrací počet slov.
+    """
+    names = sorted(f[:-4] for f in os.listdir(wordlist_dir) if f.endswith(".txt"))
+    best = {}  # slovo -> (pořadí, index slovníku)
+    for dict_id, name in enumerate(names):
+        with open(os.path.join(wordlist_dir, f"{name}.txt"), encoding="utf-8") as f:
+            words = [fold(line.strip()) for line in f if line.strip()]
+        for rank, word in enumerate(dict.fromkeys(words), start=1):
+            if word not in best or rank < best[word][0]:
+                best[word] = (rank, dict_id)
+
+    root = {}
+    for word, value in best.items():
+        node = root
+        for byte in word.encode("utf-8"):
+            node = node.setdefault(byte, {})
+        node[None] = value
+
+    # Číslování do šířky: potomci uzlu dostanou souvislý úsek hran
+    edge_start, edge_count, ranks, dict_ids, labels, children = [], [], [], [], bytearray(), []
+    queue = [root]
+    for node in queue:
+        rank, dict_id = node.get(None, (0, 0))
+        keys = sorted(k for k in node if k is not None)
+        edge_start.append(len(labels))
+        edge_count.append(len(keys))
+        ranks.append(rank)
+        dict_ids.append(dict_id)
+        for key in keys:
+            labels.append(key)
+            children.append(len(queue))
+            queue.append(node[key])
+
+    count = len(queue)
+    blob = b"".join([
+        _HEADER.pack(MAGIC, count, len(labels), len(names), sources_digest(wordlist_dir)),
+        b"".join(n.encode()[:_NAME_SIZE].ljust(_NAME_SIZE, b"\0") for n in names),
+        struct.pack(f"<{count}I", *edge_start),
+        struct.pack(f"<{count}I", *edge_count),
+        struct.pack(f"<{count}I", *ranks),
+        _pad4(bytes(dict_ids)),
+        _pad4(bytes(labels)),
+        struct.pack(f"<{len(children)}I", *children),
+    ])
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    tmp = f"{output}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(blob)
+    os.replace(tmp, output)
+    return len(best)
+
+
+_BYTES = [bytes([i]) for i in range(256)]
+
+
+class StrengthDictionary:
+    """Trie slovníků namapované z disku; jen čte, sdílí se mezi vlákny."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, edges, dict_count, self.digest = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} není zkompilovaný slovník síly hesel.")
+        offset = _HEADER.size
+        self.names = [self._mm[offset + i * _NAME_SIZE:offset + (i + 1) * _NAME_SIZE].rstrip(b"\0").decode()
+                      for i in range(dict_count)]
+        offset += dict_count * _NAME_SIZE
+        view = memoryview(self._mm)
+        self._edge_start = view[offset:offset + 4 * count].cast("I")
+        offset += 4 * count
+        self._edge_count = view[offset:offset + 4 * count].cast("I")
+        offset += 4 * count
+        self._rank = view[offset:offset + 4 * count].cast("I")
+        offset += 4 * count
+        self._dict = view[offset:offset + count]
+        offset += count + (-count % 4)
+        self._labels_offset = offset
+        offset += edges + (-edges % 4)
+        self._child = view[offset:offset + 4 * edges].cast("I")
+
+    def _step(self, node: int, byte: int) -> int:
+        start = self._labels_offset + self._edge_start[node]
+        found = self._mm.find(_BYTES[byte], start, start + self._edge_count[node])
+        return -1 if found < 0 else self._child[found - self._labels_offset]
+
+    def prefixes(self, chars, start: int):
+        """Pro znaky (již složené, viz fold) od pozice `start` vrátí [(konec, pořadí, slovník)] slov ze slovníku."""
+        node, found = 0, []
+        for end in range(start, len(chars)):
+            for byte in chars[end]:
+                node = self._step(node, byte)
+                if node < 0:
+                    return found
+            rank = self._rank[node]
+            if rank:
+                found.append((end, rank, self.names[self._dict[node]]))
+        return found
+
+    def rank(self, word: str):
+        """Pořadí slova ve slovníku, nebo None."""
+        encoded = [c.encode() for c in fold(word)]
+        for end, rank, _ in self.prefixes(encoded, 0):
+            if end == len(encoded) - 1:
+                return rank
+        return None
+
+
+_dictionaries = {}
+_dictionaries_lock = threading.Lock()
+
+
+def is_stale(path: str, wordlist_dir: str = WORDLIST_DIR) -> bool:
+    """
+    Zda slovník chybí nebo byl zkompilovaný z jiných seznamů slov (podle otisku
+    obsahu v hlavičce, čas změny souborů po checkoutu nic neznamená).
+    """
+    try:
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+    except FileNotFoundError:
+        return True
+    if len(header) < _HEADER.size:
+        return True
+    magic, _, _, _, digest = _HEADER.unpack(header)
+    return magic != MAGIC or digest != sources_digest(wordlist_dir)
+
+
+def get_dictionary(path: str | None = None) -> StrengthDictionary | None:
+    """
+    Vrátí namapovaný slovník (jeden na proces), nebo None, pokud soubor chybí nebo
+    je zastaralý (zkompilovaný z jiných seznamů slov). Slovník se v požadavku nekompiluje,
+    to dělá `flask build-strength-dict` při sestavení image.
+    """
+    path = path or DEFAULT_DICT_PATH
+    dictionary = _dictionaries.get(path)
+    if dictionary is not None:
+        return dictionary
+    with _dictionaries_lock:
+        if path not in _dictionaries:
+            if is_stale(path):
+                return None
+            _dictionaries[path] = StrengthDictionary(path)
+    return _dictionaries[path]
+
+
+def _default_dictionary() -> StrengthDictionary:
+    dictionary = get_dictionary()
+    if dictionary is None:
+        raise FileNotFoundError(f"Slovník {DEFAULT_DICT_PATH} chybí nebo je zastaralý, spusťte `flask build-strength-dict`.")
+    return dictionary
+
+
+# --- Vzory -----------------------------------------------------------------
+
+def _keyboard_graph(rows, slanted=True):
+    """
+    Sousední klávesy; řádky jsou dvojice (bez shiftu, se shiftem). U šikmé
+    klávesnice leží klávesa mezi dvěma klávesami řádku nad sebou.
+    """
+    position, shifted = {}, set()
+    for y, (plain, shift) in enumerate(rows):
+        for x, (a, b) in enumerate(zip(plain, shift)):
+            if a == " ":
+                continue
+            position[a] = position[b] = (x, y)
+            if b != a:
+                shifted.add(b)
+    if slanted:
+        deltas = [(-1, 0), (1, 0), (0, -1), (1, -1), (-1, 1), (0, 1)]
+    else:
+        deltas = [(dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dx or dy]
+    keys = {}
+    for char, (x, y) in position.items():
+        keys.setdefault((x, y), set()).add(char)
+    graph = {}
+    for char, (x, y) in position.items():
+        graph[char] = [keys.get((x + dx, y + dy), set()) for dx, dy in deltas]
+    degree = sum(sum(1 for n in graph[c] if n) for c in graph) / len(graph)
+    return graph, shifted, len(graph), degree
+
+
+KEYBOARDS = {
+    "qwerty": _keyboard_graph([
+        ("`1234567890-=", "~!@#$%^&*()_+"),
+        (" qwertyuiop[]\\", " QWERTYUIOP{}|"),
+        (" asdfghjkl;'", ' ASDFGHJKL:"'),
+        (" zxcvbnm,./", " ZXCVBNM<>?"),
+    ]),
+    "qwertz": _keyboard_graph([
+        ("`1234567890-=", "~!@#$%^&*()_+"),
+        (" qwertzuiop[]\\", " QWERTZUIOP{}|"),
+        (" asdfghjkl;'", ' ASDFGHJKL:"'),
+        (" yxcvbnm,./", " YXCVBNM<>?"),
+    ]),
+    "keypad": _keyboard_graph([
+        (" /*-", " /*-"),
+        ("789+", "789+"),
+        ("456", "456"),
+        ("123", "123"),
+        (" 0.", " 0."),
+    ], slanted=False),
+}
+
+L33T_TABLE = {
+    "a": "4@", "b": "8", "c": "({[<", "e": "3", "g": "69", "i": "1!|",
+    "l": "1|7", "o": "0", "s": "$5", "t": "+7", "x": "%", "z": "2",
+}
+_L33T_CHARS = {}
+for _letter, _subs in L33T_TABLE.items():
+    for _sub in _subs:
+        _L33T_CHARS.setdefault(_sub, []).append(_letter)
+# Počet kombinací nejednoznačných záměn (1 -> i/l, 7 -> l/t), které se zkoušejí
+MAX_L33T_VARIANTS = 16
+
+MIN_GUESSES_BEFORE_GROWING_SEQUENCE = 10000
+MIN_SUBMATCH_GUESSES_SINGLE_CHAR = 10
+MIN_SUBMATCH_GUESSES_MULTI_CHAR = 50
+BRUTEFORCE_CARDINALITY = 10
+MAX_DELTA = 5
+
+_REPEAT_GREEDY = re.compile(r"(.+)\1+", re.S)
+_REPEAT_LAZY = re.compile(r"(.+?)\1+", re.S)
+_REPEAT_LAZY_ANCHORED = re.compile(r"^(.+?)\1+$", re.S)
+
+
+def _variations(upper: int, lower: int) -> int:
+    if upper == 0 or lower == 0:
+        return 2
+    return sum(comb(upper + lower, k) for k in range(1, min(upper, lower) + 1))
+
+
+def _uppercase_variations(token: str) -> int:
+    if token.islower() or not any(c.isalpha() for c in token) or token.lower() == token:
+        return 1
+    if token[0].isupper() and token[1:].lower() == token[1:]:
+        return 2
+    if token[-1].isupper() and token[:-1].lower() == token[:-1]:
+        return 2
+    if token.isupper():
+        return 2
+    upper = sum(c.isupper() for c in token)
+    lower = sum(c.islower() for c in token)
+    return _variations(upper, lower)
+
+
+def _match(pattern, i, j, token, guesses, **extra):
+    return {"pattern": pattern, "i": i, "j": j, "token": token, "guesses": max(float(guesses), 1.0), **extra}
+
+
+def _dictionary_matches(password, folded, dictionary, user_inputs, subs=None):
+    matches = []
+    chars = [c.encode() for c in folded]
+    for i in range(len(chars)):
+        for j, rank, name in dictionary.prefixes(chars, i):
+            matches.append((i, j, rank, name))
+    if user_inputs:
+        for i in range(len(folded)):
+            for j in range(i, len(folded)):
+                rank = user_inputs.get(folded[i:j + 1])
+                if rank:
+                    matches.append((i, j, rank, "user_inputs"))
+
+    result = []
+    for i, j, rank, name in matches:
+        token = password[i:j + 1]
+        guesses = rank * _uppercase_variations(token)
+        extra = {"dictionary": name, "rank": rank}
+        if subs is not None:
+            used = {s: l for s, l in subs.items() if s in token}
+            if not used:
+                continue
+            for sub, letter in used.items():
+                guesses *= _variations(token.count(sub), fold(token).count(letter))
+            extra["l33t"] = used
+        result.append(_match("dictionary", i, j, token, guesses, **extra))
+    return result
+
+
+def _reversed_matches(password, dictionary, user_inputs):
+    n = len(password)
+    reversed_password = password[::-1]
+    result = []
+    for m in _dictionary_matches(reversed_password, fold(reversed_password), dictionary, user_inputs):
+        if len(m["token"]) < 3:
+            continue
+        i, j = n - 1 - m["j"], n - 1 - m["i"]
+        result.append({**m, "i": i, "j": j, "token": password[i:j + 1], "guesses": m["guesses"] * 2, "reversed": True})
+    return result
+
+
+def _l33t_variants(password):
+    present = [c for c in dict.fromkeys(password) if c in _L33T_CHARS]
+    variants = [{}]
+    for sub in present:
+        variants = [{**v, sub: letter} for v in variants for letter in _L33T_CHARS[sub]][:MAX_L33T_VARIANTS]
+    return [v for v in variants if v]
+
+
+def _l33t_matches(password, dictionary, user_inputs):
+    result = []
+    for subs in _l33t_variants(password):
+        translated = "".join(subs.get(c, c) for c in password)
+        for m in _dictionary_matches(password, fold(translated), dictionary, user_inputs, subs):
+            if len(m["token"]) > 1:
+                result.append(m)
+    return result
+
+
+def _spatial_guesses(length, turns, shifted_count, starts, degree):
+    guesses = 0
+    for i in range(2, length + 1):
+        for j in range(1, min(turns, i - 1) + 1):
+            guesses += comb(i - 1, j - 1) * starts * degree ** j
+    if shifted_count:
+        guesses *= _variations(shifted_count, length - shifted_count)
+    return guesses
+
+
+def _spatial_matches(password):
+    result = []
+    for name, (graph, shifted_chars, starts, degree) in KEYBOARDS.items():
+        i = 0
+        while i < len(password) - 1:
+            j, turns, direction = i + 1, 0, None
+            shifted = 1 if password[i] in shifted_chars else 0
+            while j < len(password):
+                neighbours = graph.get(password[j - 1], ())
+                found = next((d for d, keys in enumerate(neighbours) if password[j] in keys), None)
+                if found is None:
+                    break
+                if found != direction:
+                    turns += 1
+                    direction = found
+                if password[j] in shifted_chars:
+                    shifted += 1
+                j += 1
+            if j - i > 2:
+                guesses = _spatial_guesses(j - i, turns, shifted, starts, degree)
+                result.append(_match("spatial", i, j - 1, password[i:j], guesses, graph=name, turns=turns))
+            i = j
+    return result
+
+
+def _sequence_matches(password):
+    result = []
+
+    def add(i, j, delta):
+        if j - i < 2 or not 0 < abs(delta) <= MAX_DELTA:
+            return
+        token = password[i:j + 1]
+        first = token[0]
+        if first in "aAzZ019":
+            base = 4
+        elif first.isdigit():
+            base = 10
+        else:
+            base = 26
+        guesses = base * len(token) * (1 if delta > 0 else 2)
+        result.append(_match("sequence", i, j, token, guesses, ascending=delta > 0))
+
+    i, last_delta = 0, None
+    for k in range(1, len(password)):
+        delta = ord(password[k]) - ord(password[k - 1])
+        if last_delta is None:
+            last_delta = delta
+        if delta == last_delta:
+            continue
+        add(i, k - 1, last_delta)
+        i, last_delta = k - 1, delta
+    if len(password) > 1:
+        add(i, len(password) - 1, last_delta)
+    return result
+
+
+def _repeat_matches(password, dictionary, user_inputs):
+    result, position = [], 0
+    while position < len(password):
+        greedy = _REPEAT_GREEDY.search(password, position)
+        if not greedy:
+            break
+        lazy = _REPEAT_LAZY.search(password, position)
+        if len(greedy.group(0)) > len(lazy.group(0)):
+            match = greedy
+            base = _REPEAT_LAZY_ANCHORED.match(match.group(0)).group(1)
+        else:
+            match, base = lazy, lazy.group(1)
+        base_guesses = _most_guessable(base, _all_matches(base, dictionary, user_inputs))["guesses"]
+        count = len(match.group(0)) // len(base)
+        result.append(_match("repeat", match.start(), match.end() - 1, match.group(0),
+                             base_guesses * count, base_token=base, repeat_count=count))
+        position = match.end()
+    return result
+
+
+def _all_matches(password, dictionary, user_inputs):
+    matches = _dictionary_matches(password, fold(password), dictionary, user_inputs)
+    matches += _reversed_matches(password, dictionary, user_inputs)
+    matches += _l33t_matches(password, dictionary, user_inputs)
+    matches += _spatial_matches(password)
+    matches += _sequence_matches(password)
+    return matches
+
+
+# --- Nejsnáze uhodnutelná posloupnost --------------------------------------
+
+def _bruteforce(password, i, j):
+    token = password[i:j + 1]
+    guesses = BRUTEFORCE_CARDINALITY ** len(token)
+    minimum = MIN_SUBMATCH_GUESSES_SINGLE_CHAR if len(token) == 1 else MIN_SUBMATCH_GUESSES_MULTI_CHAR
+    return _match("bruteforce", i, j, token, max(guesses, minimum + 1))
+
+
+def _most_guessable(password, matches):
+    """
+    Dynamické programování jako v zxcvbn: pro každou délku prefixu a počet vzorů
+    drží nejlepší součin pokusů; celek = l! * součin + D^(l-1).
+    """
+    n = len(password)
+    if n == 0:
+        return {"guesses": 1.0, "sequence": []}
+    by_end = [[] for _ in range(n)]
+    for m in matches:
+        if m["i"] != 0 or m["j"] != n - 1:
+            minimum = MIN_SUBMATCH_GUESSES_SINGLE_CHAR if len(m["token"]) == 1 else MIN_SUBMATCH_GUESSES_MULTI_CHAR
+            m["guesses"] = max(m["guesses"], minimum)
+        by_end[m["j"]].append(m)
+    best_match = [{} for _ in range(n)]
+    best_pi = [{} for _ in range(n)]
+    best_g = [{} for _ in range(n)]
+
+    def update(m, length):
+        k = m["j"]
+        pi = m["guesses"]
+        if length > 1:
+            pi *= best_pi[m["i"] - 1][length - 1]
+        g = factorial(length) * pi + MIN_GUESSES_BEFORE_GROWING_SEQUENCE ** (length - 1)
+        for other_length, other_g in best_g[k].items():
+            if other_length <= length and other_g <= g:
+                return
+        best_g[k][length] = g
+        best_match[k][length] = m
+        best_pi[k][length] = pi
+
+    for k in range(n):
+        for m in by_end[k]:
+            if m["i"] > 0:
+                for length in list(best_match[m["i"] - 1]):
+                    update(m, length + 1)
+            else:
+                update(m, 1)
+        update(_bruteforce(password, 0, k), 1)
+        for i in range(1, k + 1):
+            # Dva úseky hrubé síly za sebou jsou vždy horší než jeden delší
+            lengths = [length for length, last in best_match[i - 1].items() if last["pattern"] != "bruteforce"]
+            if lengths:
+                brute = _bruteforce(password, i, k)
+                for length in lengths:
+                    update(brute, length + 1)
+
+    length, guesses = min(best_g[n - 1].items(), key=lambda item: item[1])
+    sequence, k = [], n - 1
+    while k >= 0:
+        m = best_match[k][length]
+        sequence.append(m)
+        k, length = m["i"] - 1, length - 1
+    return {"guesses": float(guesses), "sequence": sequence[::-1]}
+
+
+# --- Veřejné API -----------------------------------------------------------
+
+SCORE_THRESHOLDS = (1e3, 1e6, 1e8, 1e10)
+# Delší hesla se rozebírají jen do této délky, zbytek se počítá jako hrubá síla
+MAX_ANALYZED_LENGTH = 100
+# Pokusů za sekundu u offline útoku na pomalý hash (scrypt, bcrypt)
+OFFLINE_SLOW_HASH_RATE = 1e4
+
+FEEDBACK = {
+    "dictionary": "Heslo obsahuje běžné slovo, jméno nebo často používané heslo.",
+    "spatial": "Řada sousedních kláves na klávesnici se snadno uhodne.",
+    "sequence": "Sekvence jako abc nebo 6543 se snadno uhodnou.",
+    "repeat": "Opakované znaky nebo skupiny znaků se snadno uhodnou.",
+}
+
+
+def estimate_strength(password: str, user_inputs=(), dictionary: StrengthDictionary | None = None) -> dict:
+    """
+    Odhadne sílu hesla. `user_inputs` jsou slova spojená s uživatelem (jméno,
+    email), která se v hesle hledají jako další slovník.
+
+    Vrací {"score" 0–4, "guesses", "guesses_log10", "crack_seconds", "sequence", "warning"}.
+    """
+    dictionary = dictionary or _default_dictionary()
+    inputs = {}
+    for rank, value in enumerate(user_inputs, start=1):
+        if value:
+            inputs.setdefault(fold(str(value)), rank)
+    rest = len(password) - MAX_ANALYZED_LENGTH
+    password = password[:MAX_ANALYZED_LENGTH]
+    matches = _all_matches(password, dictionary, inputs)
+    matches += _repeat_matches(password, dictionary, inputs)
+    result = _most_guessable(password, matches)
+    # Strop jen kvůli rozsahu floatu, skóre je dávno 4
+    guesses = result["guesses"] * float(BRUTEFORCE_CARDINALITY) ** min(max(rest, 0), 200)
+    score = sum(guesses >= threshold + 5 for threshold in SCORE_THRESHOLDS)
+    patterns = [m for m in result["sequence"] if m["pattern"] != "bruteforce"]
+    warning = None
+    if score < 3 and patterns:
+        warning = FEEDBACK[max(patterns, key=lambda m: len(m["token"]))["pattern"]]
+    return {
+        "score": score,
+        "guesses": guesses,
+        "guesses_log10": round(math.log10(guesses), 3),
+        "crack_seconds": guesses / OFFLINE_SLOW_HASH_RATE,
+        "sequence": [{k: m[k] for k in ("pattern", "i", "j", "token", "guesses")} for m in result["sequence"]],
+        "warning": warning,
+    }
+
+
+def score_many(passwords, dictionary: StrengthDictionary | None = None) -> list[dict]:
+    """Ohodnotí seznam hesel (např. celý trezor); stejná hesla se počítají jednou."""
+    dictionary = dictionary or _default_dictionary()
+    cache = {}
+    results = []
+    for password in passwords:
+        if password not in cache:
+            cache[password] = estimate_strength(password, dictionary=dictionary)
+        results.append(cache[password])
+    return results
+
+
+if __name__ == "__main__":
+    # Build krok: python -m backend.strength [cesta] (jako flask build-strength-dict, bez aplikace a databáze)
+    import sys
+    from backend.config import Config
+    target = sys.argv[1] if len(sys.argv) > 1 else Config.STRENGTH_DICT_PATH
+    print(f"Zkompilováno {build_dictionary(target)} slov do {target}")
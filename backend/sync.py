@@ -0,0 +1,100 @@
+from sqlalchemy import and_, delete, exists, func, insert, or_, select, update
+
+from backend import db
+from backend.models import Password, PasswordTombstone, User
+from backend.pagination import decode_cursor, encode_cursor
+
+# Kurzor synchronizace = (verze trezoru, id) poslední vrácené změny
+CURSOR_KIND = "changes"
+
+
+class CursorExpired(ValueError):
+    """Kurzor je starší než vyčištěné tombstony, klient musí stáhnout celý trezor."""
+
+
+def record_tombstones(user_id: int, password_ids, version: int):
+    """Zapíše tombstony smazaných hesel (ve stejné transakci jako smazání)."""
+    rows = [{"user_id": user_id, "password_id": pid, "change_version": version} for pid in password_ids]
+    if rows:
+        db.session.execute(insert(PasswordTombstone.__table__), rows)
+
+
+def _after(table, id_column, version, row_id):
+    # Keyset nad (change_version, id), pokrývá ho index (user_id, change_version, id)
+    return or_(table.c.change_version > version,
+               and_(table.c.change_version == version, id_column > row_id))
+
+
+def list_changes(user_id: int, cursor: str | None = None, limit: int = 500):
+    """
+    Vrátí (změny, další_kurzor, has_more): vložená a upravená hesla i tombstony
+    smazaných, seřazené podle verze trezoru, ve které změna vznikla. Bez kurzoru
+    vrací celý trezor (tombstony nejsou potřeba).
+
+    Verze se přiděluje pod zámkem řádku uživatele, takže změna s nižší verzí je
+    vždy commitnutá dřív než změna s vyšší a kurzor nic nepřeskočí.
+    """
+    version, row_id = decode_cursor(cursor, CURSOR_KIND) if cursor else (0, 0)
+    users = User.__table__
+    # Verze se čte před změnami: vše do ní je commitnuté a dotazy níže to uvidí
+    current, horizon = db.session.execute(
+        select(users.c.vault_version, users.c.tombstone_horizon).where(users.c.id == user_id)
+    ).first() or (0, 0)
+    # Tombstony s verzí <= horizont už neexistují; kurzor uprostřed verze na
+    # horizontu mohl přijít o zbytek jejích smazání
+    if cursor and horizon and version <= horizon:
+        raise CursorExpired("Kurzor synchronizace vypršel, je potřeba stáhnout celý trezor.")
+
+    table = Password.__table__
+    live = db.session.execute(
+        select(table.c.id, table.c.site, table.c.username, table.c.updated_at, table.c.change_version)
+        .where(table.c.user_id == user_id, _after(table, table.c.id, version, row_id))
+        .order_by(table.c.change_version, table.c.id)
+        .limit(limit + 1)
+    ).all()
+    changes = [
+        {"id": r.id, "site": r.site, "username": r.username, "deleted": False,
+         "updated_at": r.updated_at.isoformat() if r.updated_at else None, "version": r.change_version}
+        for r in live
+    ]
+    if cursor:
+        tombs = PasswordTombstone.__table__
+        deleted = db.session.execute(
+            select(tombs.c.password_id, tombs.c.deleted_at, tombs.c.change_version)
+            .where(tombs.c.user_id == user_id, _after(tombs, tombs.c.password_id, version, row_id))
+            .order_by(tombs.c.change_version, tombs.c.password_id)
+            .limit(limit + 1)
+        ).all()
+        changes += [
+            {"id": r.password_id, "deleted": True, "updated_at": r.deleted_at.isoformat(), "version": r.change_version}
+            for r in deleted
+        ]
+        changes.sort(key=lambda c: (c["version"], c["id"]))
+
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    if has_more:
+        cursor = encode_cursor(CURSOR_KIND, changes[-1]["version"], changes[-1]["id"])
+    else:
+        # Vše do verze `current` (a poslední vrácené) je hotové, další dotaz začne až za ní
+        last = changes[-1]["version"] if changes else 0
+        cursor = encode_cursor(CURSOR_KIND, max(current, last) + 1, 0)
+    return changes, cursor, has_more
+
+
+def purge_tombstones(older_than) -> int:
+    """
+    Smaže tombstony starší než `older_than` (datetime) a posune uživatelům
+    tombstone_horizon, aby se kurzory z doby před čištěním odmítly. Vrací počet
+    smazaných tombstonů.
+    """
+    tombs = PasswordTombstone.__table__
+    users = User.__table__
+    expired = and_(tombs.c.user_id == users.c.id, tombs.c.deleted_at < older_than)
+    db.session.execute(
+        update(users).where(exists().where(expired))
+        .values(tombstone_horizon=select(func.max(tombs.c.change_version)).where(expired).scalar_subquery())
+    )
+    result = db.session.execute(delete(tombs).where(tombs.c.deleted_at < older_than))
+    db.session.commit()
+    return result.rowcount
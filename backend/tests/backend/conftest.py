@@ -14,10 +14,12 @@ def app():
     # Vytvoříme dočasnou databázi
     db_fd, db_path = tempfile.mkstemp()
     
-    app = create_app()
-    app.config.update({
+    # Konfigurace se předává do create_app, aby se databáze inicializovala už s ní;
+    # schéma vytváří přímo db.create_all() podle modelů
+    app = create_app({
         "TESTING": True,
         "SQLALCHEMY_DATABASE_URI": f"sqlite:///{db_path}",
+        "SCHEMA_AUTO_MIGRATE": False,
         "JWT_SECRET_KEY": "test-secret-key",
         "SECRET_KEY": "test-secret-key"
     })
@@ -26,6 +28,9 @@ def app():
         db.create_all()
         yield app
         db.drop_all()
+        # Zavřením spojení SQLite checkpointuje WAL a smaže soubory -wal a -shm
+        db.session.remove()
+        db.engine.dispose()
     
     os.close(db_fd)
     os.unlink(db_path)
@@ -0,0 +1,148 @@
+"""
+Testy pro kontrolu vstupu auth endpointů (rate limit, souběh)
+"""
+import pytest
+from backend import create_app, db
+from backend.admission import MemoryBackend, make_backend
+
+
+@pytest.fixture
+def limited_client(tmp_path):
+    """Vrací továrnu na klienta s nízkými limity"""
+    db_path = tmp_path / "app.db"
+
+    def factory(**overrides):
+        config = {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{db_path}",
+            "SCHEMA_AUTO_MIGRATE": False,
+            "PASSWORD_HASH_WORKERS": 0,
+            "AUTH_IP_BURST": 100,
+            "AUTH_ACCOUNT_BURST": 100,
+        }
+        config.update(overrides)
+        app = create_app(config)
+        with app.app_context():
+            db.create_all()
+        return app, app.test_client()
+
+    return factory
+
+
+def _login(client, email="test@example.com", ip="10.0.0.1"):
+    return client.post('/api/login', json={'email': email, 'password': 'Wrong123!'},
+                       environ_base={'REMOTE_ADDR': ip})
+
+
+class TestMemoryBackend:
+    """Testy pro token bucket v paměti"""
+
+    def test_burst_and_retry_after(self):
+        """Test vyčerpání bucketu a doby do dalšího tokenu"""
+        backend = MemoryBackend()
+        assert all(backend.take("k", rate=1, burst=3)[0] for _ in range(3))
+        allowed, retry_after = backend.take("k", rate=1, burst=3)
+        assert not allowed
+        assert 0 < retry_after <= 1
+
+    def test_bounded_keys(self):
+        """Test omezení počtu klíčů v paměti"""
+        backend = MemoryBackend(max_keys=10)
+        for i in range(100):
+            backend.take(f"ip:{i}", rate=1, burst=1)
+        assert len(backend._buckets) == 10
+
+    def test_make_backend(self):
+        """Test výběru backendu podle URL"""
+        assert isinstance(make_backend(None), MemoryBackend)
+        assert isinstance(make_backend("memory://"), MemoryBackend)
+        with pytest.raises(ValueError):
+            make_backend("memcached://localhost")
+
+
+class TestAdmissionAPI:
+    """Testy pro odmítání požadavků nad limit"""
+
+    def test_ip_limit(self, limited_client):
+        """Test limitu na IP adresu s Retry-After"""
+        _, client = limited_client(AUTH_IP_BURST=2)
+        assert _login(client).status_code == 401
+        assert _login(client).status_code == 401
+
+        response = _login(client)
+        assert response.status_code == 429
+        assert int(response.headers['Retry-After']) >= 1
+        assert response.get_json()['status_code'] == 429
+
+        # Jiná IP adresa má vlastní bucket
+        assert _login(client, ip="10.0.0.2").status_code == 401
+
+    def test_account_limit(self, limited_client):
+        """Test limitu na účet napříč IP adresami"""
+        _, client = limited_client(AUTH_ACCOUNT_BURST=2)
+        assert _login(client, ip="10.0.0.1").status_code == 401
+        assert _login(client, email="TEST@example.com", ip="10.0.0.2").status_code == 401
+        assert _login(client, ip="10.0.0.3").status_code == 429
+        assert _login(client, email="other@example.com", ip="10.0.0.4").status_code == 401
+
+    def test_register_limited_by_ip(self, limited_client):
+        """Test limitu registrace"""
+        _, client = limited_client(AUTH_IP_BURST=1)
+        data = {'username': 'u1', 'email': 'u1@example.com', 'password': 'Test123!'}
+        assert client.post('/api/register', json=data).status_code == 200
+        assert client.post('/api/register', json=data).status_code == 429
+
+    def test_strength_limited_by_ip(self, limited_client, tmp_path):
+        """Test limitu odhadu síly hesla (bez přihlášení)"""
+        app, client = limited_client(AUTH_IP_BURST=1, STRENGTH_DICT_PATH=str(tmp_path / "chybi.dict"))
+        assert client.post('/api/strength', json={'password': 'x'}).status_code == 503
+        assert client.post('/api/strength', json={'password': 'x'}).status_code == 429
+
+    def test_concurrency_limit(self, limited_client):
+        """Test okamžitého 503, když jsou všechny sloty obsazené"""
+        app, client = limited_client(AUTH_MAX_CONCURRENT=1)
+        controller = app.extensions["admission"]
+        assert controller.acquire()
+        try:
+            response = _login(client)
+            assert response.status_code == 503
+            assert response.headers['Retry-After'] == '1'
+        finally:
+            controller.release()
+        assert _login(client).status_code == 401
+
+    def test_non_object_body(self, limited_client):
+        """Test, že tělo, které není JSON objekt, nezpůsobí chybu v kontrole vstupu"""
+        _, client = limited_client()
+        for body in ([], ["email"], "email", 1):
+            assert client.post('/api/login', json=body).status_code == 400
+            assert client.post('/api/register', json=body).status_code == 400
+
+    def test_slot_released_after_error(self, limited_client):
+        """Test uvolnění slotu i po chybě ve view"""
+        app, client = limited_client(AUTH_MAX_CONCURRENT=1)
+        client.post('/api/login', data='not json', content_type='application/json')
+        assert app.extensions["admission"].acquire()
+
+    def test_disabled(self, limited_client):
+        """Test vypnuté kontroly vstupu"""
+        app, client = limited_client(ADMISSION_ENABLED=False, AUTH_IP_BURST=1)
+        assert "admission" not in app.extensions
+        assert all(_login(client).status_code == 401 for _ in range(3))
+
+    def test_other_routes_unaffected(self, limited_client):
+        """Test, že levné routy limit nemají"""
+        _, client = limited_client(AUTH_IP_BURST=1)
+        _login(client)
+        assert _login(client).status_code == 429
+        assert all(client.get('/api/health', environ_base={'REMOTE_ADDR': '10.0.0.1'}).status_code == 200
+                   for _ in range(5))
+
+    def test_proxy_fix(self, limited_client):
+        """Test, že za důvěryhodnou proxy se limituje podle X-Forwarded-For"""
+        _, client = limited_client(AUTH_IP_BURST=1, PROXY_FIX_X_FOR=1)
+        headers = {'X-Forwarded-For': '203.0.113.5'}
+        assert client.post('/api/login', json={'email': 'a@b.cz', 'password': 'x'}, headers=headers).status_code == 401
+        assert client.post('/api/login', json={'email': 'a@b.cz', 'password': 'x'}, headers=headers).status_code == 429
+        other = {'X-Forwarded-For': '203.0.113.6'}
+        assert client.post('/api/login', json={'email': 'c@b.cz', 'password': 'x'}, headers=other).status_code == 401
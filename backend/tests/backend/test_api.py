@@ -320,6 +320,36 @@ class TestPasswordAPI:
         assert response.status_code == 404  # Neměl by najít heslo
 
 
+class TestBatchRevealAPI:
+    """Testy pro hromadné zobrazení hesel"""
+
+    def test_batch_reveal(self, client, auth_headers):
+        """Test zobrazení více hesel jedním požadavkem"""
+        ids = []
+        for i in range(3):
+            response = client.post('/api/passwords', headers=auth_headers, json={
+                'site': f'site{i}.cz',
+                'username': 'testuser',
+                'password': f'Secret{i}!'
+            })
+            ids.append(response.json['id'])
+
+        response = client.post('/api/passwords/reveal', headers=auth_headers, json={'ids': ids + [999]})
+
+        assert response.status_code == 200
+        results = response.json['results']
+        assert [r['id'] for r in results] == ids + [999]
+        assert [r['password'] for r in results[:3]] == ['Secret0!', 'Secret1!', 'Secret2!']
+        assert results[3]['success'] is False
+        assert results[3]['status_code'] == 404
+
+    def test_batch_reveal_invalid_input(self, client, auth_headers):
+        """Test neplatného seznamu id"""
+        for payload in ({}, {'ids': []}, {'ids': ['1']}, {'ids': 5}):
+            response = client.post('/api/passwords/reveal', headers=auth_headers, json=payload)
+            assert response.status_code == 400
+
+
 class TestCORS:
     """Testy pro CORS konfiguraci"""
     
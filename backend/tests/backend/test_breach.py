@@ -0,0 +1,110 @@
+"""
+Testy pro offline kontrolu uniklých hesel
+"""
+import hashlib
+import io
+import os
+import pytest
+from backend.breach import BreachCorpus, build_corpus, get_corpus
+
+LEAKED = ["123456", "password", "qwerty", "Shared123!", "heslo"]
+
+
+def _hibp_line(password, count):
+    return f"{hashlib.sha1(password.encode()).hexdigest().upper()}:{count}\n"
+
+
+@pytest.fixture
+def corpus_path(tmp_path):
+    """Korpus z výpisu ve formátu HIBP v dočasném adresáři"""
+    path = str(tmp_path / "breached.bin")
+    dump = "".join(_hibp_line(p, 1000 - i) for i, p in enumerate(LEAKED))
+    build_corpus([io.BytesIO(dump.encode())], path)
+    return path
+
+
+@pytest.fixture
+def breach_app(app, corpus_path):
+    """Aplikace s nahraným korpusem"""
+    app.config["BREACH_CORPUS_PATH"] = corpus_path
+    return app
+
+
+class TestCorpus:
+    """Testy pro sestavení korpusu a vyhledávání"""
+
+    def test_lookup(self, corpus_path):
+        """Test nalezení uniklých hesel s počtem výskytů"""
+        corpus = BreachCorpus(corpus_path)
+        assert corpus.records == len(LEAKED)
+        assert corpus.count("123456") == 1000
+        assert corpus.count("heslo") == 996
+        assert corpus.count("kLx9#vQ2!mZr") == 0
+        assert corpus.count_many(["password", "nic", "password"]) == [999, 0, 999]
+
+    def test_unsorted_input_and_duplicates(self, tmp_path):
+        """Test neseřazeného vstupu z více souborů, duplicit a neplatných řádků"""
+        passwords = [f"heslo{i}" for i in range(3000)]
+        first = "".join(_hibp_line(p, 1) for p in reversed(passwords)).lower()
+        second = _hibp_line("heslo7", 42) + "neplatny radek\n\n" + "ABC:1\n"
+        path = str(tmp_path / "breached.bin")
+        stats = build_corpus([io.BytesIO(first.encode()), io.BytesIO(second.encode())], path)
+        assert stats == {"records": 3000, "duplicates": 1, "invalid": 2}
+        corpus = BreachCorpus(path)
+        assert all(corpus.count(p) for p in passwords)
+        assert corpus.count("heslo7") == 42
+        assert corpus.count("heslo3000") == 0
+        assert not [f for f in os.listdir(tmp_path) if f != "breached.bin"]
+
+    def test_plaintext_input(self, tmp_path):
+        """Test sestavení ze seznamu hesel v čitelné podobě"""
+        path = str(tmp_path / "breached.bin")
+        build_corpus([io.BytesIO("qwerty\r\nPříliš\n".encode())], path, plaintext=True)
+        corpus = BreachCorpus(path)
+        assert corpus.count("qwerty") == 1 and corpus.count("Příliš") == 1
+
+    def test_missing_and_rebuilt(self, tmp_path):
+        """Test, že chybějící korpus kontrolu vypne a přegenerovaný se namapuje znovu"""
+        path = str(tmp_path / "breached.bin")
+        assert get_corpus(path) is None
+        build_corpus([io.BytesIO(_hibp_line("prvni", 1).encode())], path)
+        assert get_corpus(path).count("prvni") == 1
+        os.utime(path, ns=(1, 1))
+        build_corpus([io.BytesIO(_hibp_line("druhe", 1).encode())], path)
+        assert get_corpus(path).count("druhe") == 1
+        assert get_corpus(path).count("prvni") == 0
+
+
+class TestBreachAPI:
+    """Testy pro kontrolu úniků v API"""
+
+    def test_registration_rejects_leaked(self, breach_app, client):
+        """Test, že registrace uniklé heslo odmítne"""
+        response = client.post('/api/register', json={'username': 'u1', 'email': 'u1@example.com', 'password': 'Shared123!'})
+        assert response.status_code == 400
+        assert response.get_json()['error'] == 'Uniklé heslo'
+        breach_app.config['BREACH_CHECK_REGISTRATION'] = False
+        response = client.post('/api/register', json={'username': 'u1', 'email': 'u1@example.com', 'password': 'Shared123!'})
+        assert response.status_code == 200
+
+    def test_create_reports_count(self, breach_app, client, auth_headers):
+        """Test, že uložení hesla vrátí počet výskytů v únicích"""
+        leaked = client.post('/api/passwords', headers=auth_headers, json={'site': 'a.com', 'username': 'u', 'password': 'password'})
+        assert leaked.status_code == 200 and leaked.get_json()['breach_count'] == 999
+        fresh = client.post('/api/passwords', headers=auth_headers, json={'site': 'b.com', 'username': 'u', 'password': 'kLx9#vQ2!mZr'})
+        assert fresh.get_json()['breach_count'] == 0
+
+    def test_vault_audit(self, breach_app, client, auth_headers):
+        """Test GET /api/passwords/breached, nejčastěji uniklá hesla napřed"""
+        for site, password in (('a.com', 'heslo'), ('b.com', 'kLx9#vQ2!mZr'), ('c.com', '123456')):
+            client.post('/api/passwords', headers=auth_headers, json={'site': site, 'username': 'u', 'password': password})
+        data = client.get('/api/passwords/breached', headers=auth_headers).get_json()
+        assert [(e['site'], e['breach_count']) for e in data['entries']] == [('c.com', 1000), ('a.com', 996)]
+        assert data['checked'] == 3 and data['unreadable'] == 0
+
+    def test_without_corpus(self, app, client, auth_headers, tmp_path):
+        """Test, že bez korpusu se kontrola přeskočí a audit vrátí 503"""
+        app.config['BREACH_CORPUS_PATH'] = str(tmp_path / 'missing.bin')
+        created = client.post('/api/passwords', headers=auth_headers, json={'site': 'a.com', 'username': 'u', 'password': 'password'})
+        assert created.get_json()['breach_count'] is None
+        assert client.get('/api/passwords/breached', headers=auth_headers).status_code == 503
@@ -0,0 +1,143 @@
+"""
+Testy pro hromadnou úpravu a mazání hesel (PATCH/DELETE /api/passwords)
+"""
+from sqlalchemy import event
+from backend import db
+from backend.models import Password, PasswordTombstone, User
+
+
+def _create(client, headers, site, username='alice'):
+    return client.post('/api/passwords', headers=headers, json={
+        'site': site, 'username': username, 'password': 'Secret123!'
+    }).get_json()['id']
+
+
+def _reveal(client, headers, pid):
+    return client.get(f'/api/passwords/{pid}/reveal', headers=headers).get_json()['password']
+
+
+class TestBulkUpdate:
+    """Testy pro PATCH /api/passwords"""
+
+    def test_update_many(self, client, auth_headers):
+        """Test změny více hesel s výsledkem pro každé id"""
+        a = _create(client, auth_headers, 'a.com')
+        b = _create(client, auth_headers, 'b.com')
+        response = client.patch('/api/passwords', headers=auth_headers, json={'updates': [
+            {'id': a, 'site': 'a2.com'},
+            {'id': b, 'password': 'NewSecret1!', 'username': 'bob'},
+            {'id': 999, 'site': 'x.com'},
+        ]})
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['updated'] == 2
+        assert [r['success'] for r in data['results']] == [True, True, False]
+        assert data['results'][2]['status_code'] == 404
+
+        assert db.session.get(Password, a).site == 'a2.com'
+        assert db.session.get(Password, b).username == 'bob'
+        assert _reveal(client, auth_headers, a) == 'Secret123!'
+        assert _reveal(client, auth_headers, b) == 'NewSecret1!'
+
+    def test_single_statement_and_version(self, client, auth_headers):
+        """Test, že se hesla mění jedním UPDATE a verze trezoru se zvýší jednou"""
+        ids = [_create(client, auth_headers, f'site{i}.com') for i in range(20)]
+        version = User.query.first().vault_version
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            if statement.lstrip().upper().startswith("UPDATE PASSWORD"):
+                statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", record)
+        try:
+            client.patch('/api/passwords', headers=auth_headers, json={
+                'updates': [{'id': pid, 'password': f'New{pid}!'} for pid in ids]
+            })
+        finally:
+            event.remove(db.engine, "before_cursor_execute", record)
+        assert len(statements) == 1
+        db.session.expire_all()
+        assert User.query.first().vault_version == version + 1
+        assert _reveal(client, auth_headers, ids[7]) == f'New{ids[7]}!'
+
+    def test_conflict_rolls_back(self, client, auth_headers):
+        """Test, že kolize webu a uživatele vrátí 409 a nic se neuloží"""
+        a = _create(client, auth_headers, 'a.com')
+        b = _create(client, auth_headers, 'b.com')
+        response = client.patch('/api/passwords', headers=auth_headers, json={'updates': [
+            {'id': a, 'password': 'Changed1!'},
+            {'id': b, 'site': 'a.com'},
+        ]})
+        assert response.status_code == 409
+        assert _reveal(client, auth_headers, a) == 'Secret123!'
+        assert db.session.get(Password, b).site == 'b.com'
+
+    def test_other_users_rows_untouched(self, client, auth_headers):
+        """Test, že cizí hesla nelze změnit"""
+        a = _create(client, auth_headers, 'a.com')
+        client.post('/api/register', json={'username': 'other', 'email': 'other@example.com', 'password': 'Test123!'})
+        token = client.post('/api/login', json={'email': 'other@example.com', 'password': 'Test123!'}).get_json()['access_token']
+        response = client.patch('/api/passwords', headers={'Authorization': f'Bearer {token}'},
+                                json={'updates': [{'id': a, 'site': 'stolen.com'}]})
+        assert response.get_json()['updated'] == 0
+        assert db.session.get(Password, a).site == 'a.com'
+
+    def test_undecryptable_row_reported(self, client, auth_headers):
+        """Test, že přejmenování nedešifrovatelného hesla skončí chybou u jeho id, ostatní se uloží"""
+        a = _create(client, auth_headers, 'a.com')
+        b = _create(client, auth_headers, 'b.com')
+        db.session.get(Password, b).password_encrypted = b'\x01' + bytes(40)
+        db.session.commit()
+        response = client.patch('/api/passwords', headers=auth_headers, json={'updates': [
+            {'id': a, 'site': 'a2.com'},
+            {'id': b, 'site': 'b2.com'},
+        ]})
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['updated'] == 1
+        assert [r['status_code'] for r in data['results'][1:]] == [500]
+        db.session.expire_all()
+        assert db.session.get(Password, a).site == 'a2.com'
+        assert db.session.get(Password, b).site == 'b.com'
+
+        response = client.patch('/api/passwords', headers=auth_headers, json={'updates': [{'id': b, 'username': 'x'}]})
+        assert response.get_json()['updated'] == 0
+        assert response.get_json()['results'][0]['status_code'] == 500
+
+    def test_invalid_body(self, client, auth_headers):
+        """Test validace těla požadavku"""
+        for body in ({}, {'updates': []}, {'updates': [{'id': 1}]}, {'updates': [{'id': 1, 'site': ''}]},
+                     {'updates': [{'id': 1, 'site': 'a'}, {'id': 1, 'site': 'b'}]}, {'updates': [{'site': 'a'}]}):
+            assert client.patch('/api/passwords', headers=auth_headers, json=body).status_code == 400
+
+
+class TestBulkDelete:
+    """Testy pro DELETE /api/passwords"""
+
+    def test_delete_many(self, client, auth_headers):
+        """Test smazání více hesel s tombstony a výsledkem pro každé id"""
+        ids = [_create(client, auth_headers, f'site{i}.com') for i in range(3)]
+        response = client.delete('/api/passwords', headers=auth_headers, json={'ids': ids[:2] + [999]})
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['deleted'] == 2
+        assert [r['success'] for r in data['results']] == [True, True, False]
+        assert [p.id for p in Password.query.all()] == [ids[2]]
+        assert sorted(t.password_id for t in PasswordTombstone.query.all()) == ids[:2]
+
+    def test_delete_nothing_keeps_version(self, client, auth_headers):
+        """Test, že bez smazaného záznamu se verze trezoru nemění"""
+        _create(client, auth_headers, 'a.com')
+        version = User.query.first().vault_version
+        response = client.delete('/api/passwords', headers=auth_headers, json={'ids': [999]})
+        assert response.get_json()['deleted'] == 0
+        db.session.expire_all()
+        assert User.query.first().vault_version == version
+
+    def test_invalid_body(self, client, auth_headers, app):
+        """Test validace seznamu id a limitu"""
+        assert client.delete('/api/passwords', headers=auth_headers, json={'ids': []}).status_code == 400
+        assert client.delete('/api/passwords', headers=auth_headers, json={'ids': ['1']}).status_code == 400
+        app.config['BULK_MAX_IDS'] = 2
+        assert client.delete('/api/passwords', headers=auth_headers, json={'ids': [1, 2, 3]}).status_code == 400
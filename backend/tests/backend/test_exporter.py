@@ -0,0 +1,63 @@
+"""
+Testy pro streamovaný export hesel
+"""
+import csv
+import io
+import json
+from backend import exporter
+from backend.exporter import iter_export
+from backend.importer import import_vault
+
+
+class TestExport:
+    """Testy pro generátor exportu"""
+
+    def test_export_is_lazy(self, app, sample_user, monkeypatch):
+        """Test, že export dešifruje až při odesílání a po blocích"""
+        data = "site,username,password\n" + "".join(f"s{i}.cz,u,p{i}\n" for i in range(30))
+        import_vault(sample_user.id, io.BytesIO(data.encode()), "csv")
+        calls = []
+        monkeypatch.setattr(exporter, "decrypt_text", lambda token, user_id, site, username: calls.append(token) or "x")
+        monkeypatch.setattr(exporter, "_FLUSH_BYTES", 100)
+
+        chunks = iter_export(sample_user.id, "ndjson", yield_per=5)
+        assert calls == []
+        first = next(chunks)
+        assert 0 < len(calls) < 30
+        lines = (first + "".join(chunks)).splitlines()
+        assert len(lines) == 30
+        assert len(calls) == 30
+
+    def test_export_csv_roundtrip(self, app, sample_user):
+        """Test, že export CSV lze znovu naimportovat"""
+        data = b"site,username,password,note\na.cz,alice,Secret1!,pozn\xc3\xa1mka\n"
+        import_vault(sample_user.id, io.BytesIO(data), "csv")
+
+        exported = "".join(iter_export(sample_user.id, "csv"))
+        rows = list(csv.DictReader(io.StringIO(exported)))
+        assert rows[0]["password"] == "Secret1!"
+        assert rows[0]["note"] == "poznámka"
+
+
+class TestExportAPI:
+    """Testy pro /api/passwords/export"""
+
+    def test_export_ndjson(self, client, auth_headers):
+        """Test exportu NDJSON přes API"""
+        client.post('/api/passwords', headers=auth_headers, json={
+            'site': 'example.com',
+            'username': 'testuser',
+            'password': 'MySecretPassword123!'
+        })
+        response = client.get('/api/passwords/export?format=ndjson', headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.is_streamed
+        assert response.mimetype == 'application/x-ndjson'
+        rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert rows[0]['password'] == 'MySecretPassword123!'
+
+    def test_export_bad_format(self, client, auth_headers):
+        """Test nepodporovaného formátu"""
+        response = client.get('/api/passwords/export?format=xml', headers=auth_headers)
+        assert response.status_code == 400
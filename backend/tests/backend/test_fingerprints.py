@@ -0,0 +1,111 @@
+"""
+Testy pro otisky hesel a hledání opakovaně použitých hesel
+"""
+from sqlalchemy import update
+from backend import db
+from backend.fingerprints import backfill_fingerprints
+from backend.models import Password
+from backend.security import fingerprint_text
+
+
+def _create(client, headers, site, password='Secret123!'):
+    return client.post('/api/passwords', headers=headers, json={
+        'site': site, 'username': 'alice', 'password': password
+    }).get_json()['id']
+
+
+def _reuse(client, headers):
+    return client.get('/api/passwords/reuse', headers=headers).get_json()
+
+
+class TestFingerprint:
+    """Testy pro výpočet otisku"""
+
+    def test_keyed_per_user(self):
+        """Test, že otisk je stabilní a liší se mezi uživateli"""
+        assert fingerprint_text(1, "heslo") == fingerprint_text(1, "heslo")
+        assert fingerprint_text(1, "heslo") != fingerprint_text(2, "heslo")
+        assert fingerprint_text(1, "heslo") != fingerprint_text(1, "heslo2")
+        assert len(fingerprint_text(1, "heslo")) == 32
+
+    def test_set_on_write(self, client, auth_headers):
+        """Test, že vytvoření, úprava i import otisk nastaví"""
+        pid = _create(client, auth_headers, 'a.com')
+        entry = db.session.get(Password, pid)
+        assert entry.fingerprint == fingerprint_text(entry.user_id, 'Secret123!')
+
+        client.put(f'/api/passwords/{pid}', headers=auth_headers, json={'password': 'Other123!'})
+        db.session.expire_all()
+        assert db.session.get(Password, pid).fingerprint == fingerprint_text(entry.user_id, 'Other123!')
+
+        client.post('/api/passwords/import?format=ndjson', headers=auth_headers,
+                    data=b'{"site": "zoom.us", "username": "alice", "password": "Other123!"}\n')
+        imported = Password.query.filter_by(site='zoom.us').first()
+        assert imported.fingerprint == db.session.get(Password, pid).fingerprint
+
+
+class TestReuseAPI:
+    """Testy pro GET /api/passwords/reuse"""
+
+    def test_groups(self, client, auth_headers):
+        """Test seskupení záznamů se stejným heslem"""
+        a = _create(client, auth_headers, 'a.com', 'Shared123!')
+        b = _create(client, auth_headers, 'b.com', 'Shared123!')
+        c = _create(client, auth_headers, 'c.com', 'Shared123!')
+        d = _create(client, auth_headers, 'd.com', 'Pair123!')
+        e = _create(client, auth_headers, 'e.com', 'Pair123!')
+        _create(client, auth_headers, 'f.com', 'Unique123!')
+
+        data = _reuse(client, auth_headers)
+        assert [[x['id'] for x in g['entries']] for g in data['groups']] == [[a, b, c], [d, e]]
+        assert [g['count'] for g in data['groups']] == [3, 2]
+        assert data['pending'] == 0
+
+    def test_bulk_update_refreshes(self, client, auth_headers):
+        """Test, že hromadná změna hesel otisky přepočítá"""
+        a = _create(client, auth_headers, 'a.com', 'Shared123!')
+        b = _create(client, auth_headers, 'b.com', 'Shared123!')
+        assert len(_reuse(client, auth_headers)['groups']) == 1
+        client.patch('/api/passwords', headers=auth_headers, json={'updates': [{'id': b, 'password': 'New123!'}]})
+        assert _reuse(client, auth_headers)['groups'] == []
+        client.patch('/api/passwords', headers=auth_headers, json={'updates': [{'id': a, 'password': 'New123!'}]})
+        assert len(_reuse(client, auth_headers)['groups']) == 1
+
+    def test_other_users_not_mixed(self, client, auth_headers):
+        """Test, že se stejná hesla různých uživatelů neseskupí"""
+        _create(client, auth_headers, 'a.com', 'Shared123!')
+        client.post('/api/register', json={'username': 'other', 'email': 'other@example.com', 'password': 'Test123!'})
+        token = client.post('/api/login', json={'email': 'other@example.com', 'password': 'Test123!'}).get_json()['access_token']
+        _create(client, {'Authorization': f'Bearer {token}'}, 'a.com', 'Shared123!')
+        assert _reuse(client, auth_headers)['groups'] == []
+
+
+class TestBackfill:
+    """Testy pro doplnění otisků existujících hesel"""
+
+    def test_backfill(self, app, client, auth_headers):
+        """Test doplnění chybějících otisků po dávkách"""
+        for i in range(5):
+            _create(client, auth_headers, f'site{i}.com', 'Shared123!')
+        db.session.execute(update(Password.__table__).values(fingerprint=None))
+        db.session.commit()
+        assert _reuse(client, auth_headers)['pending'] == 5
+
+        state = backfill_fingerprints(batch_size=2, workers=1)
+        assert state['scanned'] == 5 and state['updated'] == 5 and state['failed'] == 0
+        data = _reuse(client, auth_headers)
+        assert data['pending'] == 0
+        assert data['groups'][0]['count'] == 5
+
+        # Druhý běh nemá co dělat, --all přepočítá vše
+        assert backfill_fingerprints()['scanned'] == 0
+        assert backfill_fingerprints(recompute=True)['updated'] == 5
+
+    def test_undecryptable_rows(self, app, client, auth_headers):
+        """Test, že nedešifrovatelný záznam se započítá jako chyba"""
+        pid = _create(client, auth_headers, 'a.com')
+        db.session.execute(update(Password.__table__).values(fingerprint=None, password_encrypted='broken'))
+        db.session.commit()
+        result = app.test_cli_runner().invoke(args=['backfill-fingerprints'])
+        assert result.exit_code != 0
+        assert str(pid) in result.output
@@ -0,0 +1,108 @@
+"""
+Testy pro hromadný generátor hesel
+"""
+import pytest
+from collections import Counter
+from backend.generator import build_charset, generate_passwords, generate_password, NUMBERS, SYMBOLS
+
+
+class TestGenerator:
+    """Unit testy generátoru"""
+
+    def test_generate_count_and_length(self):
+        """Test počtu a délky vygenerovaných hesel"""
+        charset = build_charset()
+        passwords = generate_passwords(1000, 24, charset)
+
+        assert len(passwords) == 1000
+        assert all(len(p) == 24 for p in passwords)
+        assert all(set(p) <= set(charset) for p in passwords)
+
+    def test_generate_unique(self):
+        """Test, že hesla se neopakují"""
+        passwords = generate_passwords(500, 16, build_charset())
+        assert len(set(passwords)) == 500
+
+    def test_generate_distribution(self):
+        """Test, že rejection sampling nezvýhodňuje žádný znak"""
+        # 88 znaků -> 256 % 88 != 0, bez zahazování by byly první znaky častější
+        charset = build_charset()
+        counts = Counter("".join(generate_passwords(2000, 50, charset)))
+        expected = 2000 * 50 / len(charset)
+
+        assert set(counts) == set(charset)
+        assert all(abs(c - expected) < expected * 0.15 for c in counts.values())
+
+    def test_build_charset(self):
+        """Test sestavení sady znaků"""
+        assert build_charset(uppercase=False, lowercase=False, symbols=False) == NUMBERS
+        assert build_charset(uppercase=False, lowercase=False, numbers=False) == SYMBOLS
+        assert build_charset(False, False, False, False) == ""
+
+    def test_generate_single(self):
+        """Test generování jednoho hesla"""
+        password = generate_password(12, NUMBERS)
+        assert len(password) == 12
+        assert password.isdigit()
+
+    def test_generate_zero_count(self):
+        """Test nulového počtu"""
+        assert generate_passwords(0, 16, NUMBERS) == []
+
+    def test_generate_invalid_input(self):
+        """Test neplatných parametrů"""
+        with pytest.raises(ValueError):
+            generate_passwords(10, 0, NUMBERS)
+        with pytest.raises(ValueError):
+            generate_passwords(10, 8, "")
+        with pytest.raises(ValueError):
+            generate_passwords(10, 8, "aab")
+        with pytest.raises(ValueError):
+            generate_passwords(10, 8, "áé")
+
+
+class TestGenerateAPI:
+    """Testy pro /api/generate"""
+
+    def test_generate_endpoint(self, client, auth_headers):
+        """Test hromadného generování přes API"""
+        response = client.post('/api/generate', headers=auth_headers, json={
+            'count': 50,
+            'length': 20,
+            'symbols': False
+        })
+
+        assert response.status_code == 200
+        data = response.json
+        assert data['success'] is True
+        assert data['count'] == 50
+        assert all(len(p) == 20 and p.isalnum() for p in data['passwords'])
+
+    def test_generate_endpoint_limits(self, client, auth_headers):
+        """Test odmítnutí příliš velkého požadavku"""
+        response = client.post('/api/generate', headers=auth_headers, json={
+            'count': 10 ** 9,
+            'length': 16
+        })
+        assert response.status_code == 400
+
+    def test_generate_endpoint_empty_charset(self, client, auth_headers):
+        """Test odmítnutí prázdné sady znaků"""
+        response = client.post('/api/generate', headers=auth_headers, json={
+            'uppercase': False,
+            'lowercase': False,
+            'numbers': False,
+            'symbols': False
+        })
+        assert response.status_code == 400
+
+    def test_generate_endpoint_non_boolean_sets(self, client, auth_headers):
+        """Test, že volby sad znaků musí být JSON booleany"""
+        for value in ("false", 0, None, "true"):
+            response = client.post('/api/generate', headers=auth_headers, json={'symbols': value})
+            assert response.status_code == 400
+
+    def test_generate_endpoint_no_auth(self, client):
+        """Test generování bez autentizace"""
+        response = client.post('/api/generate', json={'count': 1})
+        assert response.status_code == 401
@@ -0,0 +1,86 @@
+"""
+Testy pro hashování uživatelských hesel
+"""
+import pytest
+from werkzeug.security import generate_password_hash
+from backend import db, hashing
+from backend.hashing import canonical_method, hash_password, needs_rehash, verify_password
+from backend.models import User
+
+
+@pytest.fixture
+def hash_workers(app):
+    """Nastaví velikost poolu a po testu ho ukončí"""
+    original = hashing._workers
+
+    def set_workers(count):
+        hashing.shutdown_pool()
+        hashing._workers = count
+
+    yield set_workers
+    hashing.shutdown_pool()
+    hashing._workers = original
+
+
+class TestHashing:
+    """Unit testy hashovací služby"""
+
+    def test_canonical_method(self):
+        """Test doplnění výchozích parametrů"""
+        assert canonical_method("scrypt") == "scrypt:32768:8:1"
+        assert canonical_method("pbkdf2") == "pbkdf2:sha256:1000000"
+        assert canonical_method("pbkdf2:sha512:1000") == "pbkdf2:sha512:1000"
+        with pytest.raises(ValueError):
+            canonical_method("md5")
+
+    @pytest.mark.parametrize("workers", [0, 2])
+    def test_hash_and_verify(self, hash_workers, workers):
+        """Test hashování inline i v poolu procesů"""
+        hash_workers(workers)
+        password_hash = hash_password("Test123!")
+
+        assert verify_password(password_hash, "Test123!")
+        assert not verify_password(password_hash, "Wrong123!")
+        assert not needs_rehash(password_hash)
+
+    def test_needs_rehash(self, app):
+        """Test detekce hashe se starými parametry"""
+        old_hash = generate_password_hash("Test123!", "pbkdf2:sha256:1000")
+        assert needs_rehash(old_hash)
+
+
+class TestLoginRehash:
+    """Testy pro přehashování při přihlášení"""
+
+    def test_login_rehashes_old_hash(self, client, hash_workers):
+        """Test, že přihlášení nahradí hash se starými parametry"""
+        hash_workers(0)
+        user = User(
+            username='olduser',
+            email='old@example.com',
+            password_hash=generate_password_hash('Test123!', 'pbkdf2:sha256:1000')
+        )
+        db.session.add(user)
+        db.session.commit()
+
+        response = client.post('/api/login', json={'email': 'old@example.com', 'password': 'Test123!'})
+
+        assert response.status_code == 200
+        db.session.refresh(user)
+        assert user.password_hash.startswith('scrypt:32768:8:1$')
+        assert verify_password(user.password_hash, 'Test123!')
+
+
+class TestHashingTimeout:
+    """Testy pro vypršení čekání na KDF"""
+
+    def test_login_returns_503(self, client, hash_workers, monkeypatch):
+        """Test, že přetížený pool vrátí 503 s Retry-After místo 500"""
+        hash_workers(1)
+        monkeypatch.setattr(hashing, "_timeout", 0.001)
+
+        response = client.post('/api/register', json={'username': 'u', 'email': 'u@example.com', 'password': 'Test123!'})
+
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '1'
+        assert response.get_json()['error'] == 'Služba je přetížená'
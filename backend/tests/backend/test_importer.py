@@ -0,0 +1,150 @@
+"""
+Testy pro hromadný import hesel
+"""
+import io
+import json
+import pytest
+from backend import db, importer
+from backend.importer import VaultImportError, detect_format, import_vault, iter_records
+from backend.models import Password
+from backend.security import decrypt_text
+
+
+CSV_DATA = (
+    "site,username,password,note\n"
+    "example.com,alice,Secret1!,first\n"
+    "github.com,alice,Secret2!,\n"
+    ",bob,missing-site,\n"
+).encode()
+
+
+class TestImportParsing:
+    """Testy pro čtení vstupních formátů"""
+
+    def test_detect_format(self):
+        """Test určení formátu"""
+        assert detect_format("vault.csv") == "csv"
+        assert detect_format("vault.jsonl") == "ndjson"
+        assert detect_format("vault.txt", "json") == "json"
+        with pytest.raises(VaultImportError):
+            detect_format("vault.xml")
+
+    def test_iter_json_array_small_chunks(self, monkeypatch):
+        """Test inkrementálního čtení JSON pole po malých blocích"""
+        monkeypatch.setattr(importer, "_READ_CHUNK", 7)
+        records = [{"site": f"site{i}.cz", "username": "ž" * i, "password": "x"} for i in range(50)]
+        stream = io.BytesIO(json.dumps(records, ensure_ascii=False).encode())
+
+        assert list(iter_records(stream, "json")) == records
+
+    def test_iter_json_invalid(self):
+        """Test neplatného JSON"""
+        with pytest.raises(VaultImportError):
+            list(iter_records(io.BytesIO(b'{"site": "a"}'), "json"))
+        with pytest.raises(VaultImportError):
+            list(iter_records(io.BytesIO(b'[{"site": "a"'), "json"))
+
+    def test_iter_ndjson(self):
+        """Test čtení NDJSON"""
+        stream = io.BytesIO(b'{"site": "a"}\n\n{"site": "b"}\n')
+        assert [r["site"] for r in iter_records(stream, "ndjson")] == ["a", "b"]
+
+
+class TestImportVault:
+    """Testy pro zápis importovaných dat"""
+
+    def test_import_csv(self, app, sample_user):
+        """Test importu CSV po dávkách"""
+        stats = import_vault(sample_user.id, io.BytesIO(CSV_DATA), "csv", batch_size=1, workers=2)
+
+        assert stats["processed"] == 3
+        assert stats["imported"] == 2
+        assert stats["invalid"] == 1
+        assert stats["errors"][0]["row"] == 3
+        item = Password.query.filter_by(user_id=sample_user.id, site="example.com").one()
+        assert decrypt_text(item.password_encrypted) == "Secret1!"
+        assert item.note == "first"
+
+    def test_import_conflict_skip_and_update(self, app, sample_user):
+        """Test chování při konfliktu s existujícím záznamem"""
+        import_vault(sample_user.id, io.BytesIO(CSV_DATA), "csv")
+        changed = b"site,username,password\nexample.com,alice,Changed1!\n"
+
+        stats = import_vault(sample_user.id, io.BytesIO(changed), "csv")
+        assert stats["imported"] == 0
+        assert stats["skipped"] == 1
+
+        stats = import_vault(sample_user.id, io.BytesIO(changed), "csv", on_conflict="update")
+        assert stats["imported"] == 1
+        item = Password.query.filter_by(user_id=sample_user.id, site="example.com").one()
+        db.session.refresh(item)
+        assert decrypt_text(item.password_encrypted) == "Changed1!"
+
+    def test_import_duplicates_in_batch(self, app, sample_user):
+        """Test duplicitních záznamů v jedné dávce"""
+        data = b"site,username,password\na.cz,x,one\na.cz,x,two\n"
+        stats = import_vault(sample_user.id, io.BytesIO(data), "csv", on_conflict="update")
+
+        assert stats["imported"] == 1
+        assert stats["skipped"] == 1
+        assert Password.query.filter_by(user_id=sample_user.id).count() == 1
+
+
+    def test_import_invalid_note(self, app, sample_user):
+        """Test, že poznámka, která není text, je chyba řádku"""
+        data = (b'{"site": "a.cz", "username": "u", "password": "p", "note": {"x": 1}}\n'
+                b'{"site": "b.cz", "username": "u", "password": "p", "note": "ok"}\n')
+        stats = import_vault(sample_user.id, io.BytesIO(data), "ndjson")
+
+        assert stats["imported"] == 1 and stats["invalid"] == 1
+        assert stats["errors"] == [{"row": 1, "message": "Poznámka musí být text"}]
+
+
+class TestImportAPI:
+    """Testy pro /api/passwords/import"""
+
+    def test_import_upload(self, client, auth_headers):
+        """Test importu nahraného souboru"""
+        response = client.post('/api/passwords/import', headers=auth_headers, data={
+            'file': (io.BytesIO(CSV_DATA), 'vault.csv')
+        }, content_type='multipart/form-data')
+
+        assert response.status_code == 200
+        assert response.json['imported'] == 2
+        listing = client.get('/api/passwords', headers=auth_headers).json
+        assert {p['site'] for p in listing} == {'example.com', 'github.com'}
+
+    def test_import_raw_body(self, client, auth_headers):
+        """Test importu z těla požadavku"""
+        body = b'{"site": "a.cz", "username": "u", "password": "p"}\n'
+        response = client.post('/api/passwords/import?format=ndjson', headers=auth_headers, data=body)
+
+        assert response.status_code == 200
+        assert response.json['imported'] == 1
+
+    def test_import_bad_format(self, client, auth_headers):
+        """Test nepodporovaného formátu"""
+        response = client.post('/api/passwords/import?format=xml', headers=auth_headers, data=b'<x/>')
+        assert response.status_code == 400
+
+    def test_import_error_after_committed_batch(self, app, client, auth_headers):
+        """Test, že chyba po uložené dávce vrátí 400 s počtem uložených hesel"""
+        app.config['IMPORT_BATCH_SIZE'] = 2
+        body = b''.join(b'{"site": "s%d.cz", "username": "u", "password": "p"}\n' % i for i in range(3)) + b'{rozbite\n'
+        response = client.post('/api/passwords/import?format=ndjson', headers=auth_headers, data=body)
+
+        assert response.status_code == 400
+        assert response.json['imported'] == 2 and response.json['row'] == 4
+        assert len(client.get('/api/passwords', headers=auth_headers).json) == 2
+
+    def test_import_too_large(self, app, client, auth_headers):
+        """Test, že soubor nad IMPORT_MAX_BYTES vrátí 413 a nic se neuloží"""
+        app.config['IMPORT_MAX_BYTES'] = 100
+        body = b''.join(b'{"site": "s%d.cz", "username": "u", "password": "p"}\n' % i for i in range(5))
+        response = client.post('/api/passwords/import?format=ndjson', headers=auth_headers, data=body)
+        assert response.status_code == 413 and response.json['status_code'] == 413
+        response = client.post('/api/passwords/import', headers=auth_headers, data={
+            'file': (io.BytesIO(body), 'vault.ndjson')
+        }, content_type='multipart/form-data')
+        assert response.status_code == 413
+        assert client.get('/api/passwords', headers=auth_headers).json == []
@@ -0,0 +1,54 @@
+"""
+Testy pro /api/metrics
+"""
+
+
+def _sample(text, name, **labels):
+    """Vrátí hodnotu vzorku metriky z Prometheus textového výstupu"""
+    for line in text.splitlines():
+        if not line.startswith(name + "{") and not line.startswith(name + " "):
+            continue
+        if all(f'{key}="{value}"' in line for key, value in labels.items()):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+class TestMetricsAPI:
+    """Testy pro metriky v Prometheus formátu"""
+
+    def test_request_metrics(self, client):
+        """Test počítání požadavků a latencí podle endpointu"""
+        before = _sample(client.get('/api/metrics').get_data(as_text=True),
+                         'http_requests_total', endpoint='api_bp.health', status='200')
+        client.get('/api/health')
+        client.get('/api/health')
+
+        response = client.get('/api/metrics')
+        text = response.get_data(as_text=True)
+
+        assert response.status_code == 200
+        assert response.mimetype == 'text/plain'
+        assert _sample(text, 'http_requests_total', endpoint='api_bp.health', status='200') == before + 2
+        assert _sample(text, 'http_request_duration_seconds_count', endpoint='api_bp.health') >= 2
+
+    def test_db_and_crypto_metrics(self, client, auth_headers):
+        """Test měření SQL dotazů, šifrování a KDF"""
+        client.post('/api/passwords', headers=auth_headers, json={
+            'site': 'example.com',
+            'username': 'testuser',
+            'password': 'MySecretPassword123!'
+        })
+        text = client.get('/api/metrics').get_data(as_text=True)
+
+        assert _sample(text, 'db_query_duration_seconds_count', operation='INSERT') >= 1
+        assert _sample(text, 'db_query_duration_seconds_count', operation='SELECT') >= 1
+        assert _sample(text, 'crypto_operation_duration_seconds_count', operation='encrypt') >= 1
+        assert _sample(text, 'password_kdf_duration_seconds_count', operation='verify') >= 1
+
+    def test_metrics_token(self, app, client):
+        """Test ochrany metrik tokenem"""
+        app.config['METRICS_TOKEN'] = 'secret'
+
+        assert client.get('/api/metrics').status_code == 401
+        response = client.get('/api/metrics', headers={'Authorization': 'Bearer secret'})
+        assert response.status_code == 200
@@ -82,7 +82,7 @@ class TestPassword:
             assert password.user_id == sample_user.id
             assert password.site == 'example.com'
             assert password.username == 'testuser'
-            assert password.password_encrypted == 'encrypted_password'
+            assert password.password_encrypted == b'encrypted_password'
             assert password.note == 'Test note'
             assert isinstance(password.created_at, datetime)
     
@@ -0,0 +1,94 @@
+"""
+Testy pro stránkování a filtrování seznamu hesel
+"""
+import io
+import pytest
+from backend.importer import import_vault
+from backend.pagination import InvalidCursor, decode_cursor, encode_cursor, list_passwords
+
+
+def _seed(user_id, count=25):
+    data = "site,username,password\n" + "".join(f"site{i:02d}.cz,user{i % 3},p\n" for i in range(count))
+    import_vault(user_id, io.BytesIO(data.encode()), "csv")
+
+
+class TestKeysetPagination:
+    """Testy pro list_passwords"""
+
+    @pytest.mark.parametrize("sort", ["site", "created"])
+    def test_pages_cover_all_rows(self, app, sample_user, sort):
+        """Test, že stránky projdou všechny řádky bez duplicit"""
+        _seed(sample_user.id)
+        seen = []
+        cursor = None
+        while True:
+            rows, cursor = list_passwords(sample_user.id, limit=10, cursor=cursor, sort=sort)
+            seen.extend(r.id for r in rows)
+            if not cursor:
+                break
+
+        assert len(seen) == 25
+        assert len(set(seen)) == 25
+
+    def test_sort_by_site(self, app, sample_user):
+        """Test řazení podle webu"""
+        _seed(sample_user.id)
+        rows, cursor = list_passwords(sample_user.id, limit=5)
+
+        assert [r.site for r in rows] == [f"site{i:02d}.cz" for i in range(5)]
+        assert cursor is not None
+
+    def test_prefix_filter(self, app, sample_user):
+        """Test prefixového filtru na web i uživatelské jméno"""
+        _seed(sample_user.id)
+
+        rows, _ = list_passwords(sample_user.id, q="site1")
+        assert {r.site for r in rows} == {f"site{i}.cz" for i in range(10, 20)}
+        rows, _ = list_passwords(sample_user.id, q="user2")
+        assert len(rows) == 8
+        rows, _ = list_passwords(sample_user.id, q="site_")
+        assert rows == []
+
+    def test_prefix_filter_ignores_case(self, app, sample_user):
+        """Test, že filtr nerozlišuje velikost písmen (v PostgreSQL je LIKE citlivé)"""
+        data = "site,username,password\nGoogle.com,Admin,p\ngithub.com,ADMIN2,p\nČSOB.cz,u,p\n"
+        import_vault(sample_user.id, io.BytesIO(data.encode()), "csv")
+
+        assert [r.site for r in list_passwords(sample_user.id, q="goo")[0]] == ["Google.com"]
+        assert [r.site for r in list_passwords(sample_user.id, q="GIT")[0]] == ["github.com"]
+        assert len(list_passwords(sample_user.id, q="admin")[0]) == 2
+
+    def test_cursor_roundtrip(self):
+        """Test kódování kurzoru"""
+        cursor = encode_cursor("site", "example.com", 42)
+        assert decode_cursor(cursor, "site") == ("example.com", 42)
+        with pytest.raises(InvalidCursor):
+            decode_cursor(cursor, "created")
+        with pytest.raises(InvalidCursor):
+            decode_cursor("not-a-cursor", "site")
+
+
+class TestPasswordListAPI:
+    """Testy pro parametry GET /api/passwords"""
+
+    def test_list_with_limit(self, client, auth_headers):
+        """Test stránkování přes API"""
+        for i in range(3):
+            client.post('/api/passwords', headers=auth_headers, json={
+                'site': f'site{i}.cz', 'username': 'u', 'password': 'p'
+            })
+
+        response = client.get('/api/passwords?limit=2', headers=auth_headers)
+        assert response.status_code == 200
+        assert [p['site'] for p in response.json] == ['site0.cz', 'site1.cz']
+        cursor = response.headers['X-Next-Cursor']
+
+        response = client.get(f'/api/passwords?limit=2&cursor={cursor}', headers=auth_headers)
+        assert [p['site'] for p in response.json] == ['site2.cz']
+        assert 'X-Next-Cursor' not in response.headers
+
+    def test_list_invalid_params(self, client, auth_headers):
+        """Test neplatných parametrů"""
+        assert client.get('/api/passwords?limit=0', headers=auth_headers).status_code == 400
+        assert client.get('/api/passwords?cursor=xyz', headers=auth_headers).status_code == 400
+        assert client.get('/api/passwords?sort=password', headers=auth_headers).status_code == 400
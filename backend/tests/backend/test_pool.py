@@ -0,0 +1,143 @@
+"""
+Testy pro profily a metriky poolu spojení
+"""
+import sqlite3
+import threading
+import pytest
+from sqlalchemy import text
+from backend import db
+from backend.pool import (InstrumentedNullPool, InstrumentedQueuePool, SQLiteWriter, engine_options, pool_stats,
+                          sqlite_pragmas)
+
+
+BASE_CONFIG = {
+    "DB_POOL_SIZE": 3,
+    "DB_MAX_OVERFLOW": 2,
+    "DB_POOL_TIMEOUT": 5,
+    "DB_POOL_RECYCLE": 600,
+    "DB_POOL_PRE_PING": True,
+}
+
+
+class TestEngineOptions:
+    """Testy pro výběr profilu"""
+
+    def test_direct_profile(self):
+        """Test profilu pro přímé spojení na PostgreSQL"""
+        options = engine_options({**BASE_CONFIG, "SQLALCHEMY_DATABASE_URI": "postgresql+psycopg://h/db"})
+
+        assert options["poolclass"] is InstrumentedQueuePool
+        assert options["pool_pre_ping"] is True
+        assert options["pool_recycle"] == 600
+
+    def test_pgbouncer_profile(self):
+        """Test profilu pro PgBouncer"""
+        options = engine_options({**BASE_CONFIG, "SQLALCHEMY_DATABASE_URI": "postgresql+psycopg://h/db",
+                                  "DB_POOL_PROFILE": "pgbouncer"})
+
+        assert options["poolclass"] is InstrumentedNullPool
+        assert options["connect_args"] == {"prepare_threshold": None}
+
+    def test_sqlite_profile(self):
+        """Test automatického profilu pro SQLite"""
+        options = engine_options({**BASE_CONFIG, "SQLALCHEMY_DATABASE_URI": "sqlite:///x.db"})
+        assert options["poolclass"] is InstrumentedQueuePool
+        assert "pool_pre_ping" not in options
+        assert engine_options({**BASE_CONFIG, "SQLALCHEMY_DATABASE_URI": "sqlite://"}) == {}
+
+    def test_unknown_profile(self):
+        """Test neznámého profilu"""
+        with pytest.raises(ValueError):
+            engine_options({**BASE_CONFIG, "SQLALCHEMY_DATABASE_URI": "sqlite://", "DB_POOL_PROFILE": "nope"})
+
+
+class TestPoolMetrics:
+    """Testy pro čítače poolu"""
+
+    def test_counters(self, app):
+        """Test čítačů výpůjček a vypůjčených spojení"""
+        before = pool_stats()["primary"]["checkouts"]
+        with db.engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            assert pool_stats()["primary"]["checked_out"] >= 1
+        stats = pool_stats()["primary"]
+
+        assert stats["checkouts"] == before + 1
+        assert stats["pool_class"] == "InstrumentedQueuePool"
+        assert stats["wait_seconds_total"] >= 0
+
+    def test_metrics_survive_dispose(self, app):
+        """Test, že čítače zůstanou po engine.dispose()"""
+        with db.engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        db.engine.dispose()
+        before = pool_stats()["primary"]["checkouts"]
+        with db.engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+        assert db.engine.pool.metrics is not None
+        assert pool_stats()["primary"]["checkouts"] == before + 1
+
+    def test_pool_endpoint(self, client):
+        """Test /api/health/pool"""
+        response = client.get('/api/health/pool')
+        assert response.status_code == 200
+        assert 'primary' in response.json['pools']
+
+
+class TestSQLiteProfile:
+    """Testy pro PRAGMA a serializaci zápisů u SQLite"""
+
+    def test_pragmas(self, app):
+        """Test PRAGMA nastavených na novém spojení"""
+        with db.engine.connect() as connection:
+            assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert connection.execute(text("PRAGMA synchronous")).scalar() == 1
+            assert connection.execute(text("PRAGMA busy_timeout")).scalar() == app.config["SQLITE_BUSY_TIMEOUT_MS"]
+            assert connection.execute(text("PRAGMA cache_size")).scalar() == -app.config["SQLITE_CACHE_SIZE_KB"]
+
+    def test_invalid_pragma(self, app):
+        """Test, že neznámý režim žurnálu se odmítne (hodnota jde přímo do PRAGMA)"""
+        with pytest.raises(ValueError):
+            sqlite_pragmas({**app.config, "SQLITE_JOURNAL_MODE": "WAL; DROP TABLE user"})
+
+    def test_writes_serialized(self, app):
+        """Test, že druhý zápis čeká na konec první transakce, čtení ne"""
+        engine = db.engine
+        with engine.begin() as connection:
+            connection.execute(text("CREATE TABLE zapis (x INTEGER)"))
+        order = []
+
+        def second_writer():
+            with engine.begin() as connection:
+                connection.execute(text("INSERT INTO zapis VALUES (2)"))
+            order.append("druhý")
+
+        first = engine.connect()
+        first.execute(text("INSERT INTO zapis VALUES (1)"))
+        thread = threading.Thread(target=second_writer)
+        thread.start()
+        thread.join(0.3)
+        assert thread.is_alive()
+        with engine.connect() as reader:
+            assert reader.execute(text("SELECT count(*) FROM zapis")).scalar() == 0
+
+        order.append("první")
+        first.commit()
+        first.close()
+        thread.join(5)
+        assert order == ["první", "druhý"]
+        with engine.connect() as reader:
+            assert reader.execute(text("SELECT count(*) FROM zapis")).scalar() == 2
+        stats = pool_stats()["primary"]
+        assert stats["writer_wait_seconds_max"] >= 0.3
+        assert stats["writer_timeouts"] == 0
+
+    def test_writer_timeout(self):
+        """Test, že zápis po vypršení čekání skončí chybou "database is locked\""""
+        writer = SQLiteWriter(timeout=0.05)
+        writer.acquire()
+        with pytest.raises(sqlite3.OperationalError, match="database is locked"):
+            writer.acquire()
+        writer.release()
+        assert writer.snapshot()["writer_timeouts"] == 1
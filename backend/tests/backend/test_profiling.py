@@ -0,0 +1,89 @@
+"""
+Testy pro profilování požadavků na vyžádání
+"""
+import os
+import pstats
+import pytest
+from backend import create_app, db
+from backend.profiling import PROFILE_HEADER, PROFILE_ID_HEADER, prune_directory
+
+
+@pytest.fixture
+def make_client(tmp_path):
+    """Vrací továrnu na testovacího klienta se zapnutým profilováním"""
+    db_path = tmp_path / "app.db"
+
+    def factory(**overrides):
+        config = {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{db_path}",
+            "SCHEMA_AUTO_MIGRATE": False,
+            "PROFILING_ENABLED": True,
+            "PROFILING_TOKEN": "profile-secret",
+            "PROFILING_DIR": str(tmp_path / "profiles"),
+        }
+        config.update(overrides)
+        app = create_app(config)
+        with app.app_context():
+            db.create_all()
+        return app.test_client()
+
+    return factory
+
+
+class TestProfiling:
+    """Testy pro výběr požadavků a zápis profilů"""
+
+    def test_disabled_registers_no_hooks(self, app):
+        """Test, že vypnuté profilování nepřidá žádný hook"""
+        hooks = [f.__name__ for funcs in app.before_request_funcs.values() for f in funcs]
+        assert "_start_profile" not in hooks
+
+    def test_profile_with_token(self, make_client, tmp_path):
+        """Test cProfile profilu na vyžádání hlavičkou"""
+        client = make_client()
+        response = client.get('/api/health', headers={PROFILE_HEADER: 'profile-secret'})
+
+        name = response.headers[PROFILE_ID_HEADER]
+        assert name.endswith('.pstats')
+        stats = pstats.Stats(str(tmp_path / "profiles" / name))
+        assert any(func[2] == 'health' for func in stats.stats)
+
+    def test_wrong_token_not_profiled(self, make_client, tmp_path):
+        """Test, že bez platného tokenu se neprofiluje"""
+        client = make_client()
+        response = client.get('/api/health', headers={PROFILE_HEADER: 'wrong'})
+
+        assert PROFILE_ID_HEADER not in response.headers
+        assert not (tmp_path / "profiles").exists()
+
+    def test_sampling_collapsed_stacks(self, make_client, tmp_path):
+        """Test náhodného vzorkování s výstupem pro flamegraph"""
+        client = make_client(PROFILING_SAMPLE_RATE=1.0, PROFILING_MODE="sample", PROFILING_SAMPLE_INTERVAL_MS=0.1)
+        client.post('/api/register', json={
+            'username': 'profiled', 'email': 'profiled@example.com', 'password': 'Test123!'
+        })
+        response = client.post('/api/login', json={'email': 'profiled@example.com', 'password': 'Test123!'})
+
+        name = response.headers[PROFILE_ID_HEADER]
+        assert name.endswith('.collapsed')
+        lines = (tmp_path / "profiles" / name).read_text().splitlines()
+        assert lines
+        assert all(int(line.rsplit(" ", 1)[1]) >= 1 for line in lines)
+        assert any("login (routes.py" in line for line in lines)
+
+    def test_non_api_routes_not_profiled(self, make_client):
+        """Test, že se profilují jen routy blueprintu api_bp"""
+        client = make_client(PROFILING_SAMPLE_RATE=1.0)
+        assert PROFILE_ID_HEADER not in client.get('/api/metrics').headers
+
+    def test_prune_directory(self, tmp_path):
+        """Test mazání nejstarších profilů nad limit velikosti"""
+        for i in range(5):
+            path = tmp_path / f"{i}.pstats"
+            path.write_bytes(b"x" * 100)
+            os.utime(path, (i, i))
+
+        prune_directory(str(tmp_path), 250)
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["3.pstats", "4.pstats"]
@@ -0,0 +1,121 @@
+"""
+Testy pro směrování čtení na read repliku (dva SQLite soubory)
+"""
+import sqlite3
+import pytest
+from sqlalchemy import func, select
+from backend import create_app, db
+from backend.models import User
+from backend.replica import REPLICA_BIND, check_pin_storage
+
+
+def _create(tmp_path, replica_uri):
+    app = create_app({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'primary.db'}",
+        "SQLALCHEMY_REPLICA_URI": replica_uri,
+        "SCHEMA_AUTO_MIGRATE": False,
+        "JWT_SECRET_KEY": "test-secret-key",
+        "PASSWORD_HASH_WORKERS": 0,
+    })
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+@pytest.fixture
+def app(tmp_path):
+    """Aplikace s primárem a replikou se stejným (zatím prázdným) schématem"""
+    app = _create(tmp_path, f"sqlite:///{tmp_path / 'replica.db'}")
+    with app.app_context():
+        db.metadata.create_all(bind=db.engines[REPLICA_BIND])
+        yield app
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+def _replicate():
+    """Zkopíruje primár do repliky (replikace dohnala zpoždění)"""
+    replica = db.engines[REPLICA_BIND]
+    replica.dispose()
+    source = sqlite3.connect(db.engine.url.database)
+    target = sqlite3.connect(replica.url.database)
+    source.backup(target)
+    source.close()
+    target.close()
+
+
+def _unpin(app):
+    """Zruší připnutí na primár (okno po zápisu uplynulo)"""
+    app.extensions["replica"].pins._until.clear()
+
+
+class TestReadRouting:
+    """Testy pro čtení z repliky a připnutí na primár po zápisu"""
+
+    def test_reads_from_replica(self, app, client, auth_headers):
+        """Test, že /me, seznam a zobrazení hesla čtou z repliky"""
+        created = client.post('/api/passwords', headers=auth_headers, json={'site': 'a.com', 'username': 'u', 'password': 'Heslo123!'})
+        pid = created.get_json()['id']
+        _unpin(app)
+        # Replika zápis ještě nemá
+        assert client.get('/api/me', headers=auth_headers).status_code == 404
+
+        _replicate()
+        assert client.get('/api/me', headers=auth_headers).status_code == 200
+        assert client.get(f'/api/passwords/{pid}/reveal', headers=auth_headers).get_json()['password'] == 'Heslo123!'
+        with sqlite3.connect(db.engines[REPLICA_BIND].url.database) as replica:
+            replica.execute("UPDATE password SET site = 'replika.com'")
+        listed = client.get('/api/passwords', headers=auth_headers).get_json()
+        assert [e['site'] for e in listed] == ['replika.com']
+
+    def test_pinned_after_write(self, app, client, auth_headers):
+        """Test, že po zápisu čte uživatel z primáru, dokud nevyprší okno"""
+        client.post('/api/passwords', headers=auth_headers, json={'site': 'a.com', 'username': 'u', 'password': 'Heslo123!'})
+        assert client.get('/api/me', headers=auth_headers).status_code == 200
+        assert [e['site'] for e in client.get('/api/passwords', headers=auth_headers).get_json()] == ['a.com']
+
+        _unpin(app)
+        assert client.get('/api/passwords', headers=auth_headers).get_json() == []
+        app.extensions['replica'].pin_seconds = 0
+        client.post('/api/passwords', headers=auth_headers, json={'site': 'b.com', 'username': 'u', 'password': 'Heslo123!'})
+        assert client.get('/api/me', headers=auth_headers).status_code == 404
+
+    def test_writes_stay_on_primary(self, app):
+        """Test, že flush jde na primár i při zapnutém čtení z repliky"""
+        session = db.session()
+        session.info["use_replica"] = True
+        session.add(User(username='u', email='u@example.com', password_hash='x'))
+        session.commit()
+        assert session.scalar(select(func.count()).select_from(User)) == 0
+        session.info.pop("use_replica")
+        assert session.scalar(select(func.count()).select_from(User)) == 1
+
+    def test_fallback_to_primary(self, tmp_path):
+        """Test, že při nedostupné replice se čte z primáru"""
+        app = _create(tmp_path, f"sqlite:///{tmp_path / 'chybi' / 'replica.db'}")
+        client = app.test_client()
+        client.post('/api/register', json={'username': 'u', 'email': 'u@example.com', 'password': 'Test123!'})
+        token = client.post('/api/login', json={'email': 'u@example.com', 'password': 'Test123!'}).get_json()['access_token']
+        _unpin(app)
+        response = client.get('/api/me', headers={'Authorization': f'Bearer {token}'})
+        assert response.status_code == 200 and response.get_json()['username'] == 'u'
+
+    def test_without_replica(self, tmp_path):
+        """Test, že bez SQLALCHEMY_REPLICA_URI se směrování nezapne"""
+        app = _create(tmp_path, None)
+        assert "replica" not in app.extensions
+        with app.app_context():
+            assert list(db.engines) == [None]
+
+    def test_multiple_workers_need_shared_pins(self, tmp_path, monkeypatch):
+        """Test, že s více workery a připnutím jen v paměti procesu aplikace nenastartuje"""
+        check_pin_storage(None, 5, None, 4)
+        check_pin_storage("sqlite://", 5, "redis://localhost", 4)
+        check_pin_storage("sqlite://", 5, None, 1)
+        with pytest.raises(RuntimeError):
+            check_pin_storage("sqlite://", 5, "memory://", 4)
+        monkeypatch.setenv("WEB_CONCURRENCY", "2")
+        with pytest.raises(RuntimeError):
+            _create(tmp_path, f"sqlite:///{tmp_path / 'replica.db'}")
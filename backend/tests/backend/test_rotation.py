@@ -0,0 +1,163 @@
+"""
+Testy pro rotaci šifrovacích klíčů
+"""
+import json
+import pytest
+from sqlalchemy import update
+from cryptography.fernet import Fernet, MultiFernet
+from backend import db, security
+from backend.models import Password, User
+from backend.rotation import migrate_to_envelope, rotate_keys
+
+
+@pytest.fixture
+def old_key_vault(sample_user):
+    """Uloží hesla šifrovaná původním klíčem a vrátí (id, plaintext) dvojice"""
+    ids = []
+    for i in range(25):
+        entry = Password(user_id=sample_user.id, site=f"site{i}.com", username="user",
+                         password_encrypted=security.encrypt_text(f"Secret{i}!"))
+        db.session.add(entry)
+        db.session.flush()
+        ids.append((entry.id, f"Secret{i}!"))
+    db.session.commit()
+    return ids
+
+
+@pytest.fixture
+def new_primary_key(monkeypatch):
+    """Nastaví nový primární klíč, původní zůstane jen pro dešifrování"""
+    new = Fernet(Fernet.generate_key())
+    monkeypatch.setattr(security, "fernet", MultiFernet([new, security.primary_fernet]))
+    monkeypatch.setattr(security, "primary_fernet", new)
+    monkeypatch.setattr(security, "PRIMARY_KEY_ID", "new-key")
+    return new
+
+
+class TestKeyRotation:
+    """Testy pro přešifrování trezoru novým klíčem"""
+
+    def test_old_tokens_still_decrypt(self, old_key_vault, new_primary_key):
+        """Test, že po změně klíče jdou stará hesla dešifrovat"""
+        entry_id, plaintext = old_key_vault[0]
+        assert security.decrypt_text(db.session.get(Password, entry_id).password_encrypted) == plaintext
+
+    def test_rotate_all(self, old_key_vault, new_primary_key, tmp_path):
+        """Test přešifrování všech hesel po dávkách s checkpointem"""
+        checkpoint = tmp_path / "rotation.json"
+        state = rotate_keys(batch_size=10, workers=2, checkpoint=str(checkpoint))
+
+        assert state["scanned"] == 25
+        assert state["rotated"] == 25
+        assert state["failed"] == 0
+        assert json.loads(checkpoint.read_text())["last_id"] == old_key_vault[-1][0]
+        db.session.expire_all()
+        for entry_id, plaintext in old_key_vault:
+            token = db.session.get(Password, entry_id).password_encrypted
+            assert new_primary_key.decrypt(token).decode() == plaintext
+
+    def test_resume_from_checkpoint(self, old_key_vault, new_primary_key, tmp_path):
+        """Test pokračování za posledním zpracovaným id"""
+        checkpoint = tmp_path / "rotation.json"
+        checkpoint.write_text(json.dumps({
+            "key_id": "new-key", "last_id": old_key_vault[9][0], "scanned": 10,
+            "rotated": 10, "unchanged": 0, "failed": 0, "failed_ids": []
+        }))
+
+        state = rotate_keys(batch_size=10, workers=2, checkpoint=str(checkpoint))
+
+        assert state["scanned"] == 25
+        assert state["rotated"] == 25
+        db.session.expire_all()
+        first = db.session.get(Password, old_key_vault[0][0]).password_encrypted
+        assert security.rotate_text(first) is not None
+
+    def test_rerun_is_noop(self, old_key_vault, new_primary_key):
+        """Test, že hesla s aktuálním klíčem se nepřepisují"""
+        rotate_keys(batch_size=10, workers=2)
+        state = rotate_keys(batch_size=10, workers=2)
+
+        assert state["rotated"] == 0
+        assert state["unchanged"] == 25
+
+    def test_unknown_key_reported(self, sample_user, new_primary_key):
+        """Test, že heslo šifrované neznámým klíčem se nahlásí a nezmění"""
+        foreign = Fernet(Fernet.generate_key()).encrypt(b"lost").decode()
+        entry = Password(user_id=sample_user.id, site="lost.com", username="user", password_encrypted=foreign)
+        db.session.add(entry)
+        db.session.commit()
+
+        state = rotate_keys(batch_size=10, workers=1)
+
+        assert state["failed"] == 1
+        assert state["failed_ids"] == [entry.id]
+        assert db.session.get(Password, entry.id).password_encrypted == foreign.encode()
+
+    def test_cli(self, app, old_key_vault, new_primary_key, tmp_path):
+        """Test příkazu flask rotate-keys"""
+        runner = app.test_cli_runner()
+        result = runner.invoke(args=["rotate-keys", "--batch-size", "10", "--checkpoint", str(tmp_path / "cp.json")])
+
+        assert result.exit_code == 0, result.output
+        assert "přešifrováno 25" in result.output
+
+
+@pytest.fixture
+def envelope_user(sample_user):
+    """Uživatel s datovým klíčem a heslem jím šifrovaným; vrací (id uživatele, id hesla, token)"""
+    user = db.session.get(User, sample_user.id)
+    user.data_key = security.new_data_key()
+    db.session.commit()
+    token = security.encrypt_text("Secret1!", user.id, "a.com", "user")
+    entry = Password(user_id=user.id, site="a.com", username="user", password_encrypted=token)
+    db.session.add(entry)
+    db.session.commit()
+    return user.id, entry.id, token
+
+
+class TestEnvelopeRotation:
+    """Testy pro obálkové šifrování při změně hlavního klíče"""
+
+    def test_rotation_rewraps_keys_only(self, envelope_user, new_primary_key):
+        """Test, že rotace přebalí datový klíč a hesla šifrovaná datovým klíčem nemění"""
+        user_id, entry_id, token = envelope_user
+
+        state = rotate_keys(batch_size=10, workers=1)
+
+        assert state["keys"] == {"rewrapped": 1, "unchanged": 0, "failed": 0}
+        assert state["scanned"] == 0
+        db.session.expire_all()
+        new_primary_key.decrypt(db.session.get(User, user_id).data_key.encode())
+        assert db.session.get(Password, entry_id).password_encrypted == token
+        security.clear_data_key_cache()
+        assert security.decrypt_text(token, user_id, "a.com", "user") == "Secret1!"
+
+    def test_migrate_to_envelope(self, app, old_key_vault, sample_user):
+        """Test převodu starších hesel na datový klíč uživatele"""
+        state = migrate_to_envelope(batch_size=10, workers=2)
+
+        assert state["keys_created"] == 1
+        assert state["migrated"] == 25 and state["failed"] == 0
+        db.session.expire_all()
+        for entry_id, plaintext in old_key_vault:
+            entry = db.session.get(Password, entry_id)
+            assert entry.password_encrypted.startswith(security.AEAD_V1)
+            assert security.decrypt_text(entry.password_encrypted, sample_user.id, entry.site, entry.username) == plaintext
+
+        assert migrate_to_envelope()["scanned"] == 0
+        result = app.test_cli_runner().invoke(args=["envelope-migrate"])
+        assert result.exit_code == 0, result.output
+
+    def test_migrate_older_envelope_format(self, envelope_user):
+        """Test převodu tokenu hlavního klíče u uživatele, který už datový klíč má"""
+        user_id, entry_id, _ = envelope_user
+        legacy = security.encrypt_text("Old1!")
+        db.session.execute(update(Password.__table__).where(Password.id == entry_id).values(password_encrypted=legacy))
+        db.session.commit()
+
+        state = migrate_to_envelope(batch_size=10, workers=1)
+
+        assert state["keys_created"] == 0 and state["migrated"] == 1
+        token = db.session.get(Password, entry_id).password_encrypted
+        assert token.startswith(security.AEAD_V1)
+        assert security.decrypt_text(token, user_id, "a.com", "user") == "Old1!"
@@ -0,0 +1,62 @@
+"""
+Testy pro kontrolu verze schématu při startu aplikace
+"""
+import pytest
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import Engine
+from backend import create_app, db
+from backend.schema import current_revision, head_revision
+
+
+@pytest.fixture
+def db_uri(tmp_path):
+    """Cesta k prázdné dočasné databázi"""
+    return f"sqlite:///{tmp_path / 'app.db'}"
+
+
+def _create(db_uri, auto_migrate=True):
+    return create_app({"SQLALCHEMY_DATABASE_URI": db_uri, "SCHEMA_AUTO_MIGRATE": auto_migrate})
+
+
+class TestEnsureSchema:
+    """Testy pro ensure_schema"""
+
+    def test_migrates_empty_database(self, db_uri):
+        """Test, že prázdná databáze se při startu zmigruje na head"""
+        app = _create(db_uri)
+        with app.app_context(), db.engine.connect() as connection:
+            assert current_revision(connection) == head_revision()
+            assert {"user", "password"} <= set(inspect(connection).get_table_names())
+
+    def test_current_schema_runs_no_ddl(self, db_uri):
+        """Test, že při aktuálním schématu start provede jen jeden SELECT"""
+        _create(db_uri)
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(Engine, "before_cursor_execute", record)
+        try:
+            _create(db_uri)
+        finally:
+            event.remove(Engine, "before_cursor_execute", record)
+
+        assert statements == ["SELECT version_num FROM alembic_version"]
+
+    def test_stamps_legacy_schema(self, db_uri):
+        """Test, že schéma vytvořené bez Alembicu se označí a dozmigruje"""
+        app = _create(db_uri, auto_migrate=False)
+        with app.app_context():
+            db.create_all()
+
+        app = _create(db_uri)
+        with app.app_context(), db.engine.connect() as connection:
+            assert current_revision(connection) == head_revision()
+
+    def test_auto_migrate_disabled(self, db_uri):
+        """Test, že bez SCHEMA_AUTO_MIGRATE se DDL nespouští"""
+        app = _create(db_uri, auto_migrate=False)
+        with app.app_context(), db.engine.connect() as connection:
+            assert current_revision(connection) is None
+            assert not inspect(connection).has_table("password")
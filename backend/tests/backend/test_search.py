@@ -0,0 +1,185 @@
+"""
+Testy pro vyhledávání a našeptávání hesel
+"""
+import pytest
+from sqlalchemy import text
+from backend import db
+from backend.models import Password
+from backend.search import PrefixIndex, get_prefix_index, score, search_passwords, similarity
+
+SITES = [
+    ("github.com", "alice"),
+    ("gitlab.com", "alice"),
+    ("mail.google.com", "alice.work"),
+    ("accounts.google.com", "bob"),
+    ("netflix.com", "family"),
+    ("digital-ocean.com", "ops"),
+]
+
+
+@pytest.fixture
+def vault(client, auth_headers):
+    """Naplní trezor testovacího uživatele přes API"""
+    for site, username in SITES:
+        client.post('/api/passwords', headers=auth_headers, json={
+            'site': site, 'username': username, 'password': 'Secret123!'
+        })
+    return auth_headers
+
+
+class TestRanking:
+    """Testy pro skóre shody"""
+
+    def test_similarity(self):
+        """Test trigramové podobnosti"""
+        assert similarity("github", "github") == 1.0
+        assert similarity("githbu", "github") > 0.3
+        assert similarity("netflix", "github") < 0.1
+
+    def test_score_order(self):
+        """Test pořadí přesná > prefix > slovo > podřetězec > fuzzy"""
+        exact = score("github.com", "github.com", "x")
+        prefix = score("git", "github.com", "x")
+        word = score("google", "mail.google.com", "x")
+        substring = score("oogle", "mail.google.com", "x")
+        fuzzy = score("githb", "github.com", "x")
+        assert exact > prefix > word > substring > fuzzy > 0
+
+
+class TestSearchIndex:
+    """Testy pro databázové indexy"""
+
+    def test_fts_table_in_sync(self, app, vault):
+        """Test, že FTS5 tabulku udržují triggery"""
+        count = db.session.execute(text("SELECT count(*) FROM password_fts WHERE password_fts MATCH 'google'")).scalar()
+        assert count == 2
+
+        entry = Password.query.filter_by(site="netflix.com").first()
+        entry.site = "hulu-google.com"
+        db.session.commit()
+        count = db.session.execute(text("SELECT count(*) FROM password_fts WHERE password_fts MATCH 'google'")).scalar()
+        assert count == 3
+
+    def test_no_fts_on_old_sqlite(self, app, monkeypatch):
+        """Test, že bez FTS5 s trigramy (SQLite < 3.34) se tabulka nevytvoří a hledá se přes LIKE"""
+        from backend import search
+        monkeypatch.setattr(search, "sqlite_has_fts5_trigram", lambda connection: False)
+        db.session.remove()
+        db.drop_all()
+        db.create_all()
+        search._fts_available.pop(str(db.engine.url), None)
+        try:
+            exists = db.session.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'password_fts'")).first()
+            assert exists is None
+            assert search_passwords(1, "google") == []
+        finally:
+            search._fts_available.pop(str(db.engine.url), None)
+
+
+class TestSearchAPI:
+    """Testy pro GET /api/passwords/search"""
+
+    def test_substring(self, client, vault):
+        """Test hledání podřetězce ve webu i uživatelském jménu"""
+        response = client.get('/api/passwords/search?q=google', headers=vault)
+        assert response.status_code == 200
+        sites = [r['site'] for r in response.get_json()['results']]
+        assert sorted(sites) == ["accounts.google.com", "mail.google.com"]
+
+        response = client.get('/api/passwords/search?q=work', headers=vault)
+        assert [r['username'] for r in response.get_json()['results']] == ["alice.work"]
+
+    def test_fuzzy(self, client, vault):
+        """Test nalezení záznamu s překlepem"""
+        response = client.get('/api/passwords/search?q=netflx', headers=vault)
+        results = response.get_json()['results']
+        assert results[0]['site'] == "netflix.com"
+
+    def test_ranking_and_limit(self, client, vault):
+        """Test řazení podle skóre a omezení počtu"""
+        response = client.get('/api/passwords/search?q=git&limit=1', headers=vault)
+        results = response.get_json()['results']
+        assert len(results) == 1
+        assert results[0]['site'] == "github.com"
+
+    def test_short_query(self, client, vault):
+        """Test dotazu kratšího než trigram"""
+        response = client.get('/api/passwords/search?q=ix', headers=vault)
+        assert [r['site'] for r in response.get_json()['results']] == ["netflix.com"]
+
+    def test_other_users_not_visible(self, client, vault):
+        """Test, že se hledá jen v trezoru přihlášeného uživatele"""
+        client.post('/api/register', json={'username': 'other', 'email': 'other@example.com', 'password': 'Test123!'})
+        token = client.post('/api/login', json={'email': 'other@example.com', 'password': 'Test123!'}).get_json()['access_token']
+        response = client.get('/api/passwords/search?q=google', headers={'Authorization': f'Bearer {token}'})
+        assert response.get_json()['results'] == []
+
+    def test_invalid_params(self, client, vault):
+        """Test validace parametrů"""
+        assert client.get('/api/passwords/search', headers=vault).status_code == 400
+        assert client.get('/api/passwords/search?q=git&limit=0', headers=vault).status_code == 400
+
+    def test_without_fts(self, app, vault):
+        """Test záložního hledání přes LIKE, pokud FTS5 tabulka neexistuje"""
+        from backend import search
+        search._fts_available[str(db.engine.url)] = False
+        try:
+            user_id = Password.query.first().user_id
+            results = search_passwords(user_id, "google")
+            assert len(results) == 2
+        finally:
+            search._fts_available.pop(str(db.engine.url))
+
+
+class TestSuggestAPI:
+    """Testy pro GET /api/passwords/suggest"""
+
+    def test_prefix(self, client, vault):
+        """Test návrhů podle prefixu webu, slova webu a uživatele"""
+        response = client.get('/api/passwords/suggest?q=gi', headers=vault)
+        assert response.status_code == 200
+        assert [r['site'] for r in response.get_json()['results']] == ["github.com", "gitlab.com"]
+
+        response = client.get('/api/passwords/suggest?q=goo', headers=vault)
+        assert sorted(r['site'] for r in response.get_json()['results']) == ["accounts.google.com", "mail.google.com"]
+
+        response = client.get('/api/passwords/suggest?q=fam', headers=vault)
+        assert [r['site'] for r in response.get_json()['results']] == ["netflix.com"]
+
+    def test_invalidated_on_write(self, client, vault):
+        """Test, že vytvoření, úprava i smazání hned změní návrhy"""
+        assert client.get('/api/passwords/suggest?q=spot', headers=vault).get_json()['results'] == []
+
+        pid = client.post('/api/passwords', headers=vault, json={
+            'site': 'spotify.com', 'username': 'alice', 'password': 'Secret123!'
+        }).get_json()['id']
+        assert len(client.get('/api/passwords/suggest?q=spot', headers=vault).get_json()['results']) == 1
+
+        client.put(f'/api/passwords/{pid}', headers=vault, json={'site': 'tidal.com'})
+        assert client.get('/api/passwords/suggest?q=spot', headers=vault).get_json()['results'] == []
+
+        client.delete(f'/api/passwords/{pid}', headers=vault)
+        assert client.get('/api/passwords/suggest?q=tid', headers=vault).get_json()['results'] == []
+
+    def test_invalidated_on_import(self, client, vault):
+        """Test zneplatnění indexu po hromadném importu"""
+        client.get('/api/passwords/suggest?q=a', headers=vault)
+        client.post('/api/passwords/import?format=ndjson', headers=vault,
+                    data=b'{"site": "zoom.us", "username": "alice", "password": "x"}\n')
+        assert len(client.get('/api/passwords/suggest?q=zoo', headers=vault).get_json()['results']) == 1
+
+    def test_prefix_index_lookup(self):
+        """Test prefixového indexu bez databáze"""
+        index = PrefixIndex([(i, f"site{i:05d}.example", "user") for i in range(10000)])
+        results = index.lookup("site0012", 5)
+        assert [r[0] for r in results] == [120, 121, 122, 123, 124]
+        assert len(index.lookup("user", 3)) == 3
+        assert index.lookup("nothing", 3) == []
+
+    def test_lru_limit(self, app, vault):
+        """Test omezení počtu indexů v paměti"""
+        from backend import search
+        user_id = Password.query.first().user_id
+        get_prefix_index(user_id, max_users=1)
+        get_prefix_index(user_id + 1000, max_users=1)
+        assert list(search._indexes) == [user_id + 1000]
@@ -2,8 +2,11 @@
 Unit testy pro security modul (šifrování)
 """
 import pytest
-from backend.security import encrypt_text, decrypt_text
-from cryptography.fernet import Fernet
+from sqlalchemy import update
+from backend import db, security
+from backend.models import Password, User
+from backend.security import encrypt_text, decrypt_text, decrypt_many
+from cryptography.fernet import Fernet, InvalidToken
 
 
 class TestEncryption:
@@ -18,7 +21,7 @@ class TestEncryption:
         
         # Ověření, že šifrovaný text je jiný než originál
         assert encrypted != original_text
-        assert isinstance(encrypted, str)
+        assert isinstance(encrypted, bytes)
         assert len(encrypted) > 0
         
         # Dešifrování
@@ -69,6 +72,24 @@ class TestEncryption:
         with pytest.raises(Exception):
             decrypt_text(None)
     
+    def test_decrypt_many(self):
+        """Test hromadného dešifrování s chybnou položkou"""
+        originals = [f"password{i}" for i in range(40)]
+        tokens = [encrypt_text(p) for p in originals]
+        tokens[5] = "invalid_encrypted_text"
+
+        results = decrypt_many(tokens, max_workers=4)
+
+        assert len(results) == 40
+        assert isinstance(results[5], Exception)
+        assert [r for i, r in enumerate(results) if i != 5] == [p for i, p in enumerate(originals) if i != 5]
+
+    def test_executor_per_size(self):
+        """Test, že pool vláken má velikost podle volajícího, ne podle prvního volání"""
+        assert security._get_executor(2)._max_workers == 2
+        assert security._get_executor(3)._max_workers == 3
+        assert security._get_executor(2) is security._get_executor(2)
+
     def test_generate_key(self):
         """Test generování klíče"""
         key = Fernet.generate_key()
@@ -82,3 +103,93 @@ class TestEncryption:
         key2 = Fernet.generate_key()
         
         assert key1 != key2
+
+
+class TestEnvelopeEncryption:
+    """Testy pro šifrování datovým klíčem uživatele"""
+
+    def test_registered_user_gets_data_key(self, client, auth_headers):
+        """Test, že nový uživatel má datový klíč a jeho hesla nesou prefix"""
+        client.post('/api/passwords', headers=auth_headers, json={'site': 'a.com', 'username': 'u', 'password': 'Secret1!'})
+        user = User.query.filter_by(email='test@example.com').one()
+        token = Password.query.filter_by(site='a.com').one().password_encrypted
+        assert user.data_key
+        assert token.startswith(security.AEAD_V1)
+        assert decrypt_text(token, user.id, 'a.com', 'u') == 'Secret1!'
+        assert client.get(f'/api/passwords/{Password.query.one().id}/reveal', headers=auth_headers).get_json()['password'] == 'Secret1!'
+
+    def test_bound_to_record(self, client, auth_headers):
+        """Test, že šifrový text přesunutý do jiného záznamu téhož uživatele nejde dešifrovat"""
+        for site, password in (('a.com', 'Secret1!'), ('b.com', 'Other1!')):
+            client.post('/api/passwords', headers=auth_headers, json={'site': site, 'username': 'u', 'password': password})
+        a = Password.query.filter_by(site='a.com').one()
+        b = Password.query.filter_by(site='b.com').one()
+        user_id = a.user_id
+        with pytest.raises(InvalidToken):
+            decrypt_text(a.password_encrypted, user_id, 'b.com', 'u')
+        b.password_encrypted = a.password_encrypted
+        db.session.commit()
+        response = client.post('/api/passwords/reveal', headers=auth_headers, json={'ids': [a.id, b.id]})
+        assert [r['success'] for r in response.get_json()['results']] == [True, False]
+
+        # Přejmenování záznam přešifruje, heslo zůstane čitelné
+        client.put(f'/api/passwords/{a.id}', headers=auth_headers, json={'site': 'c.com'})
+        assert client.get(f'/api/passwords/{a.id}/reveal', headers=auth_headers).get_json()['password'] == 'Secret1!'
+
+    def test_keys_are_per_user(self, app):
+        """Test, že token jednoho uživatele nejde dešifrovat klíčem jiného"""
+        alice = User(username='alice', email='alice@example.com', password_hash='x', data_key=security.new_data_key())
+        bob = User(username='bob', email='bob@example.com', password_hash='x', data_key=security.new_data_key())
+        db.session.add_all([alice, bob])
+        db.session.commit()
+        token = encrypt_text('Secret1!', alice.id, 'a.com', 'u')
+        with pytest.raises(InvalidToken):
+            decrypt_text(token, bob.id, 'a.com', 'u')
+        with pytest.raises(InvalidToken):
+            decrypt_text(token)
+        assert decrypt_many([token, encrypt_text('Other1!', bob.id, 'a.com', 'u')], user_id=[alice.id, bob.id],
+                            records=[('a.com', 'u')] * 2) == ['Secret1!', 'Other1!']
+
+    def test_legacy_user_uses_master_key(self, sample_user):
+        """Test, že uživatel bez datového klíče šifruje hlavním klíčem jako dřív"""
+        token = encrypt_text('Secret1!', sample_user.id)
+        assert not token.startswith(security.AEAD_V1)
+        assert decrypt_text(token) == 'Secret1!'
+
+    def test_binary_format(self, app):
+        """Test velikosti binárního formátu a odmítnutí upravených dat"""
+        user = User(username='alice', email='alice@example.com', password_hash='x', data_key=security.new_data_key())
+        db.session.add(user)
+        db.session.commit()
+        token = encrypt_text('Secret1!', user.id, 'a.com', 'u')
+        assert len(token) == 1 + 12 + len('Secret1!') + 16
+        assert len(token) < len(encrypt_text('Secret1!')) / 2
+        tampered = token[:-1] + bytes([token[-1] ^ 1])
+        with pytest.raises(InvalidToken):
+            decrypt_text(tampered, user.id, 'a.com', 'u')
+
+    def test_older_formats_readable(self, app):
+        """Test, že tokeny hlavního klíče (i jako text) jdou přečíst i po vytvoření datového klíče"""
+        user = User(username='alice', email='alice@example.com', password_hash='x', data_key=security.new_data_key())
+        db.session.add(user)
+        db.session.commit()
+        assert decrypt_text(security.fernet.encrypt(b'Master1!'), user.id) == 'Master1!'
+        assert decrypt_text(security.fernet.encrypt(b'Master1!').decode(), user.id) == 'Master1!'
+
+    def test_cache_bounded_and_expiring(self, app, monkeypatch):
+        """Test, že cache rozbalených klíčů má omezenou velikost a platnost"""
+        users = [User(username=f'u{i}', email=f'u{i}@example.com', password_hash='x', data_key=security.new_data_key())
+                 for i in range(3)]
+        db.session.add_all(users)
+        db.session.commit()
+        monkeypatch.setattr(security, '_data_key_cache_size', 2)
+        for user in users:
+            security.user_data_key(user.id)
+        assert list(security._data_keys) == [users[1].id, users[2].id]
+
+        monkeypatch.setattr(security, '_data_key_cache_ttl', -1)
+        security.clear_data_key_cache()
+        first = security.user_data_key(users[0].id)
+        db.session.execute(update(User).where(User.id == users[0].id).values(data_key=security.new_data_key()))
+        db.session.commit()
+        assert security.user_data_key(users[0].id) is not first
@@ -0,0 +1,94 @@
+"""
+Testy pro servírování buildu frontendu
+"""
+import gzip
+import pytest
+from backend import create_app
+from backend.static import CACHE_IMMUTABLE, CACHE_REVALIDATE, build_manifest, precompress
+
+INDEX_HTML = b"<!doctype html><html><body>" + b"<div id='root'></div>" * 100 + b"</body></html>"
+BUNDLE_JS = b"console.log('bundle');" * 200
+
+
+@pytest.fixture
+def build_dir(tmp_path):
+    """Vytvoří minimální build adresář"""
+    (tmp_path / "static" / "js").mkdir(parents=True)
+    (tmp_path / "index.html").write_bytes(INDEX_HTML)
+    (tmp_path / "static" / "js" / "main.1a2b3c4d.js").write_bytes(BUNDLE_JS)
+    (tmp_path / "robots.txt").write_bytes(b"User-agent: *\n")
+    return tmp_path
+
+
+@pytest.fixture
+def static_client(build_dir, tmp_path_factory):
+    """Testovací klient s buildem v dočasném adresáři"""
+    precompress(str(build_dir))
+    db_path = tmp_path_factory.mktemp("db") / "app.db"
+    app = create_app({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{db_path}",
+        "SCHEMA_AUTO_MIGRATE": False,
+        "STATIC_BUILD_DIR": str(build_dir),
+    })
+    return app.test_client()
+
+
+class TestManifest:
+    """Testy pro manifest a předkomprimaci"""
+
+    def test_precompress(self, build_dir):
+        """Test vytvoření .gz variant (malé soubory se přeskočí)"""
+        precompress(str(build_dir))
+
+        assert (build_dir / "static" / "js" / "main.1a2b3c4d.js.gz").exists()
+        assert not (build_dir / "robots.txt.gz").exists()
+
+    def test_manifest_entries(self, build_dir):
+        """Test cache politiky a variant v manifestu"""
+        precompress(str(build_dir))
+        manifest = build_manifest(str(build_dir))
+
+        bundle = manifest["static/js/main.1a2b3c4d.js"]
+        assert bundle.cache_control == CACHE_IMMUTABLE
+        assert "gzip" in bundle.variants
+        assert manifest["robots.txt"].cache_control == CACHE_REVALIDATE
+        assert "static/js/main.1a2b3c4d.js.gz" not in manifest
+        assert manifest["index.html"].data == INDEX_HTML
+
+
+class TestStaticServing:
+    """Testy pro HTTP odpovědi"""
+
+    def test_hashed_bundle_gzip(self, static_client):
+        """Test gzip varianty s immutable cache"""
+        response = static_client.get('/static/js/main.1a2b3c4d.js', headers={'Accept-Encoding': 'gzip, deflate'})
+
+        assert response.status_code == 200
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert response.headers['Cache-Control'] == CACHE_IMMUTABLE
+        assert response.headers['Vary'] == 'Accept-Encoding'
+        assert gzip.decompress(response.get_data()) == BUNDLE_JS
+
+    def test_identity_and_etag(self, static_client):
+        """Test nekomprimované odpovědi a 304 na If-None-Match"""
+        response = static_client.get('/static/js/main.1a2b3c4d.js')
+        assert 'Content-Encoding' not in response.headers
+        assert response.get_data() == BUNDLE_JS
+        etag = response.headers['ETag']
+
+        response = static_client.get('/static/js/main.1a2b3c4d.js', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.get_data() == b''
+
+    def test_spa_fallback(self, static_client):
+        """Test, že neznámá cesta vrátí index.html z paměti"""
+        response = static_client.get('/dashboard')
+
+        assert response.status_code == 200
+        assert response.get_data() == INDEX_HTML
+        assert response.headers['Cache-Control'] == CACHE_REVALIDATE
+
+    def test_api_paths_not_served(self, static_client):
+        """Test, že neznámé /api cesty nevrací index.html"""
+        assert static_client.get('/api/neexistuje').status_code == 404
@@ -0,0 +1,136 @@
+"""
+Testy pro odhad síly hesel
+"""
+import os
+import pytest
+from backend.strength import StrengthDictionary, build_dictionary, estimate_strength, fold, get_dictionary, is_stale, score_many
+
+
+@pytest.fixture(scope="module")
+def dictionary(tmp_path_factory):
+    """Zkompilovaný slovník v dočasném adresáři"""
+    path = str(tmp_path_factory.mktemp("strength") / "strength.dict")
+    build_dictionary(path)
+    return StrengthDictionary(path)
+
+
+@pytest.fixture
+def strength_app(app, tmp_path):
+    """Aplikace se slovníkem v dočasném adresáři"""
+    app.config["STRENGTH_DICT_PATH"] = str(tmp_path / "strength.dict")
+    build_dictionary(app.config["STRENGTH_DICT_PATH"])
+    return app
+
+
+def _patterns(result):
+    return [(m["pattern"], m["token"]) for m in result["sequence"]]
+
+
+class TestDictionary:
+    """Testy pro kompilovaný slovník"""
+
+    def test_lookup(self, dictionary):
+        """Test vyhledání slov a pořadí podle četnosti"""
+        assert dictionary.rank("123456") == 1
+        assert dictionary.rank("password") == 2
+        assert dictionary.rank("Heslo") is not None
+        assert dictionary.rank("xqzvw") is None
+        assert set(dictionary.names) == {"czech", "english", "names", "passwords"}
+
+    def test_fold(self):
+        """Test odstranění diakritiky se zachováním délky"""
+        assert fold("Sluníčko") == "slunicko"
+        assert len(fold("ﬁÅß")) == 3
+
+    def test_not_built_on_request(self, tmp_path):
+        """Test, že chybějící nebo zastaralý slovník se nekompiluje, ale vrátí None"""
+        path = str(tmp_path / "lazy.dict")
+        assert get_dictionary(path) is None
+        assert not os.path.exists(path)
+        wordlists = tmp_path / "wordlists"
+        wordlists.mkdir()
+        (wordlists / "passwords.txt").write_text("heslo\n")
+        build_dictionary(path, wordlist_dir=str(wordlists))
+        assert is_stale(path)
+        assert get_dictionary(path) is None
+
+        # Rozhoduje obsah seznamů, ne čas změny souborů
+        build_dictionary(path)
+        os.utime(path, (0, 0))
+        assert not is_stale(path)
+        assert get_dictionary(path).rank("password") == 2
+
+
+class TestEstimate:
+    """Testy pro rozpoznání vzorů a skóre"""
+
+    def test_common_passwords_weak(self, dictionary):
+        """Test, že běžná hesla mají skóre 0"""
+        for password in ("password", "123456", "heslo123", "qwertz"):
+            assert estimate_strength(password, dictionary=dictionary)["score"] == 0
+
+    def test_patterns(self, dictionary):
+        """Test slovníku, l33t, obrácení, klávesnice, sekvence a opakování"""
+        assert _patterns(estimate_strength("P@ssw0rd", dictionary=dictionary)) == [("dictionary", "P@ssw0rd")]
+        assert _patterns(estimate_strength("drowssap", dictionary=dictionary)) == [("dictionary", "drowssap")]
+        assert _patterns(estimate_strength("poiuytr", dictionary=dictionary))[0][0] == "spatial"
+        assert _patterns(estimate_strength("mnopqr", dictionary=dictionary)) == [("sequence", "mnopqr")]
+        assert _patterns(estimate_strength("xyzxyzxyz", dictionary=dictionary)) == [("repeat", "xyzxyzxyz")]
+
+    def test_random_stronger_than_words(self, dictionary):
+        """Test, že náhodné heslo je silnější než slova s číslem"""
+        weak = estimate_strength("Summer2024!", dictionary=dictionary)
+        strong = estimate_strength("kLx9#vQ2!mZr", dictionary=dictionary)
+        assert strong["score"] == 4
+        assert strong["guesses"] > weak["guesses"] * 1000
+        assert weak["warning"] and strong["warning"] is None
+
+    def test_user_inputs(self, dictionary):
+        """Test, že jméno uživatele v hesle sílu sníží"""
+        plain = estimate_strength("zdenda.krtek", dictionary=dictionary)
+        personal = estimate_strength("zdenda.krtek", user_inputs=["krtek", "zdenda"], dictionary=dictionary)
+        assert personal["guesses"] < plain["guesses"]
+
+    def test_long_password(self, dictionary):
+        """Test, že dlouhé heslo se rozebere jen do limitu"""
+        result = estimate_strength("a" * 1000, dictionary=dictionary)
+        assert result["score"] == 4
+
+    def test_score_many(self, dictionary):
+        """Test dávkového hodnocení ve stejném pořadí"""
+        results = score_many(["password", "kLx9#vQ2!mZr", "password"], dictionary=dictionary)
+        assert [r["score"] for r in results] == [0, 4, 0]
+
+
+class TestStrengthAPI:
+    """Testy pro API odhadu síly"""
+
+    def test_strength_endpoint(self, strength_app, client):
+        """Test POST /api/strength"""
+        response = client.post('/api/strength', json={'password': 'password1'})
+        assert response.status_code == 200
+        assert response.get_json()['score'] == 0
+        assert client.post('/api/strength', json={}).status_code == 400
+
+    def test_missing_dictionary(self, app, client, auth_headers, tmp_path):
+        """Test, že bez zkompilovaného slovníku vrací odhad síly 503"""
+        app.config["STRENGTH_DICT_PATH"] = str(tmp_path / "chybi.dict")
+        assert client.post('/api/strength', json={'password': 'password1'}).status_code == 503
+        assert client.get('/api/passwords/strength', headers=auth_headers).status_code == 503
+
+    def test_vault_strength(self, strength_app, client, auth_headers):
+        """Test GET /api/passwords/strength, nejslabší napřed"""
+        for site, password in (('a.com', 'kLx9#vQ2!mZr'), ('b.com', 'qwerty')):
+            client.post('/api/passwords', headers=auth_headers, json={'site': site, 'username': 'u', 'password': password})
+        data = client.get('/api/passwords/strength', headers=auth_headers).get_json()
+        assert [e['site'] for e in data['entries']] == ['b.com', 'a.com']
+        assert data['summary']['0'] == 1 and data['summary']['4'] == 1
+
+    def test_registration_policy(self, strength_app, client):
+        """Test minimálního skóre při registraci"""
+        strength_app.config['PASSWORD_MIN_STRENGTH'] = 3
+        weak = client.post('/api/register', json={'username': 'u1', 'email': 'u1@example.com', 'password': 'Password1!'})
+        assert weak.status_code == 400
+        assert weak.get_json()['error'] == 'Slabé heslo'
+        strong = client.post('/api/register', json={'username': 'u2', 'email': 'u2@example.com', 'password': 'kLx9#vQ2!mZr'})
+        assert strong.status_code == 200
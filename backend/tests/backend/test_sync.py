@@ -0,0 +1,130 @@
+"""
+Testy pro synchronizaci změn (GET /api/passwords/changes) a tombstony
+"""
+from datetime import datetime, timedelta
+from backend import db
+from backend.models import PasswordTombstone, User
+from backend.sync import purge_tombstones
+
+
+def _create(client, headers, site):
+    return client.post('/api/passwords', headers=headers, json={
+        'site': site, 'username': 'alice', 'password': 'Secret123!'
+    }).get_json()['id']
+
+
+def _changes(client, headers, since=None, limit=None):
+    params = {}
+    if since:
+        params['since'] = since
+    if limit:
+        params['limit'] = limit
+    return client.get('/api/passwords/changes', headers=headers, query_string=params)
+
+
+class TestChangesAPI:
+    """Testy pro GET /api/passwords/changes"""
+
+    def test_initial_sync(self, client, auth_headers):
+        """Test, že bez kurzoru se vrátí celý trezor a kurzor"""
+        _create(client, auth_headers, 'a.com')
+        _create(client, auth_headers, 'b.com')
+        response = _changes(client, auth_headers)
+        assert response.status_code == 200
+        data = response.get_json()
+        assert [c['site'] for c in data['changes']] == ['a.com', 'b.com']
+        assert all(c['deleted'] is False and c['updated_at'] for c in data['changes'])
+        assert data['cursor'] and data['has_more'] is False
+
+    def test_only_changes_since_cursor(self, client, auth_headers):
+        """Test, že se vrátí jen vložené, upravené a smazané záznamy od kurzoru"""
+        a = _create(client, auth_headers, 'a.com')
+        b = _create(client, auth_headers, 'b.com')
+        _create(client, auth_headers, 'c.com')
+        cursor = _changes(client, auth_headers).get_json()['cursor']
+
+        assert _changes(client, auth_headers, cursor).get_json()['changes'] == []
+
+        client.put(f'/api/passwords/{a}', headers=auth_headers, json={'site': 'a2.com'})
+        client.delete(f'/api/passwords/{b}', headers=auth_headers)
+        d = _create(client, auth_headers, 'd.com')
+        data = _changes(client, auth_headers, cursor).get_json()
+        assert [(c['id'], c['deleted']) for c in data['changes']] == [(a, False), (b, True), (d, False)]
+        assert data['changes'][0]['site'] == 'a2.com'
+
+        assert _changes(client, auth_headers, data['cursor']).get_json()['changes'] == []
+
+    def test_import_changes(self, client, auth_headers):
+        """Test, že import se projeví jako změna"""
+        cursor = _changes(client, auth_headers).get_json()['cursor']
+        client.post('/api/passwords/import?format=ndjson', headers=auth_headers,
+                    data=b'{"site": "zoom.us", "username": "alice", "password": "x"}\n'
+                         b'{"site": "slack.com", "username": "alice", "password": "y"}\n')
+        changes = _changes(client, auth_headers, cursor).get_json()['changes']
+        assert sorted(c['site'] for c in changes) == ['slack.com', 'zoom.us']
+
+    def test_pagination(self, client, auth_headers):
+        """Test stránkování změn po limitu včetně tombstonů"""
+        ids = [_create(client, auth_headers, f'site{i}.com') for i in range(5)]
+        cursor = _changes(client, auth_headers).get_json()['cursor']
+        for pid in ids[:3]:
+            client.delete(f'/api/passwords/{pid}', headers=auth_headers)
+        _create(client, auth_headers, 'new.com')
+
+        seen, has_more = [], True
+        while has_more:
+            data = _changes(client, auth_headers, cursor, limit=2).get_json()
+            assert len(data['changes']) <= 2
+            seen += [(c['id'], c['deleted']) for c in data['changes']]
+            cursor, has_more = data['cursor'], data['has_more']
+        assert seen[:3] == [(pid, True) for pid in ids[:3]]
+        assert len(seen) == 4
+
+    def test_other_users_not_visible(self, client, auth_headers):
+        """Test, že se synchronizuje jen vlastní trezor"""
+        _create(client, auth_headers, 'a.com')
+        client.post('/api/register', json={'username': 'other', 'email': 'other@example.com', 'password': 'Test123!'})
+        token = client.post('/api/login', json={'email': 'other@example.com', 'password': 'Test123!'}).get_json()['access_token']
+        response = _changes(client, {'Authorization': f'Bearer {token}'})
+        assert response.get_json()['changes'] == []
+
+    def test_invalid_params(self, client, auth_headers):
+        """Test neplatného kurzoru a limitu"""
+        assert _changes(client, auth_headers, since='garbage').status_code == 400
+        assert _changes(client, auth_headers, limit=100000).status_code == 400
+
+
+class TestTombstones:
+    """Testy pro čištění tombstonů"""
+
+    def test_purge_expires_old_cursors(self, app, client, auth_headers):
+        """Test, že po vyčištění se starší kurzor odmítne s 410"""
+        a = _create(client, auth_headers, 'a.com')
+        old_cursor = _changes(client, auth_headers).get_json()['cursor']
+        client.delete(f'/api/passwords/{a}', headers=auth_headers)
+        assert PasswordTombstone.query.count() == 1
+
+        assert purge_tombstones(datetime.utcnow() - timedelta(days=1)) == 0
+        assert purge_tombstones(datetime.utcnow() + timedelta(seconds=1)) == 1
+        assert PasswordTombstone.query.count() == 0
+        assert User.query.first().tombstone_horizon > 0
+
+        response = _changes(client, auth_headers, old_cursor)
+        assert response.status_code == 410
+
+        # Nový celý seznam dá platný kurzor
+        cursor = _changes(client, auth_headers).get_json()['cursor']
+        _create(client, auth_headers, 'b.com')
+        response = _changes(client, auth_headers, cursor)
+        assert response.status_code == 200
+        assert [c['site'] for c in response.get_json()['changes']] == ['b.com']
+
+    def test_purge_command(self, app, client, auth_headers):
+        """Test CLI příkazu flask purge-tombstones"""
+        a = _create(client, auth_headers, 'a.com')
+        client.delete(f'/api/passwords/{a}', headers=auth_headers)
+        result = app.test_cli_runner().invoke(args=['purge-tombstones', '--days', '0'])
+        assert result.exit_code == 0
+        assert 'Smazáno 1' in result.output
+        db.session.expire_all()
+        assert PasswordTombstone.query.count() == 0
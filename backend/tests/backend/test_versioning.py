@@ -0,0 +1,102 @@
+"""
+Testy pro verzi trezoru a podmíněný GET seznamu hesel
+"""
+from sqlalchemy import event
+from backend import db
+from backend.models import User
+from backend.versioning import list_etag
+
+
+def _version():
+    return db.session.execute(db.select(User.vault_version)).scalar()
+
+
+def _create(client, headers, site='example.com'):
+    return client.post('/api/passwords', headers=headers, json={
+        'site': site, 'username': 'alice', 'password': 'Secret123!'
+    }).get_json()['id']
+
+
+class TestVaultVersion:
+    """Testy pro zvyšování verze trezoru"""
+
+    def test_bumped_on_writes(self, client, auth_headers):
+        """Test, že vytvoření, úprava, smazání i import zvýší verzi"""
+        assert _version() == 0
+        pid = _create(client, auth_headers)
+        assert _version() == 1
+        client.put(f'/api/passwords/{pid}', headers=auth_headers, json={'site': 'other.com'})
+        assert _version() == 2
+        client.delete(f'/api/passwords/{pid}', headers=auth_headers)
+        assert _version() == 3
+        client.post('/api/passwords/import?format=ndjson', headers=auth_headers,
+                    data=b'{"site": "zoom.us", "username": "alice", "password": "x"}\n')
+        assert _version() == 4
+
+    def test_not_bumped_on_failed_write(self, client, auth_headers):
+        """Test, že neúspěšný zápis verzi nezmění"""
+        _create(client, auth_headers)
+        duplicate = client.post('/api/passwords', headers=auth_headers, json={
+            'site': 'example.com', 'username': 'alice', 'password': 'Secret123!'
+        })
+        assert duplicate.status_code == 409
+        assert _version() == 1
+        client.put('/api/passwords/999', headers=auth_headers, json={'site': 'x.com'})
+        assert _version() == 1
+
+    def test_list_etag(self):
+        """Test, že ETag závisí na verzi i parametrech dotazu"""
+        assert list_etag(1) != list_etag(2)
+        assert list_etag(1, b"limit=10") != list_etag(1, b"limit=20")
+        assert list_etag(1, b"limit=10") == list_etag(1, b"limit=10")
+
+
+class TestConditionalGet:
+    """Testy pro ETag a 304 u GET /api/passwords"""
+
+    def test_etag_and_304(self, client, auth_headers):
+        """Test odpovědi 304 na shodný If-None-Match"""
+        _create(client, auth_headers)
+        response = client.get('/api/passwords', headers=auth_headers)
+        etag = response.headers['ETag']
+        assert etag and not etag.startswith('W/')
+        assert response.headers['Cache-Control'] == 'private, no-cache'
+
+        response = client.get('/api/passwords', headers={**auth_headers, 'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.data == b''
+        assert response.headers['ETag'] == etag
+
+    def test_changed_after_write(self, client, auth_headers):
+        """Test, že po zápisu se vrátí nový seznam"""
+        etag = client.get('/api/passwords', headers=auth_headers).headers['ETag']
+        _create(client, auth_headers)
+        response = client.get('/api/passwords', headers={**auth_headers, 'If-None-Match': etag})
+        assert response.status_code == 200
+        assert len(response.get_json()) == 1
+        assert response.headers['ETag'] != etag
+
+    def test_query_params_in_etag(self, client, auth_headers):
+        """Test, že jiná stránka má jiný ETag"""
+        _create(client, auth_headers)
+        etag = client.get('/api/passwords', headers=auth_headers).headers['ETag']
+        response = client.get('/api/passwords?limit=1', headers={**auth_headers, 'If-None-Match': etag})
+        assert response.status_code == 200
+
+    def test_304_skips_list_query(self, client, auth_headers):
+        """Test, že 304 nespouští dotaz na tabulku hesel"""
+        _create(client, auth_headers)
+        etag = client.get('/api/passwords', headers=auth_headers).headers['ETag']
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", record)
+        try:
+            response = client.get('/api/passwords', headers={**auth_headers, 'If-None-Match': etag})
+        finally:
+            event.remove(db.engine, "before_cursor_execute", record)
+        assert response.status_code == 304
+        assert statements
+        assert not any("FROM password" in s for s in statements)
@@ -0,0 +1,36 @@
+import hashlib
+
+from sqlalchemy import select, update
+
+from backend import db
+from backend.models import User
+
+
+def bump_vault_version(user_id: int) -> int | None:
+    """
+    Zvýší verzi trezoru uživatele a vrátí novou hodnotu. Volá se před commitem
+    zápisu, takže změna dat a nová verze jsou v jedné transakci. UPDATE s +1 je
+    atomický a zamkne řádek uživatele do commitu, souběžné zápisy do jednoho
+    trezoru tak dostanou verze ve stejném pořadí, v jakém se commitnou.
+    """
+    table = User.__table__
+    return db.session.execute(
+        update(table).where(table.c.id == user_id)
+        .values(vault_version=table.c.vault_version + 1)
+        .returning(table.c.vault_version)
+    ).scalar()
+
+
+def get_vault_version(user_id: int) -> int | None:
+    """Aktuální verze trezoru (jeden dotaz podle primárního klíče)."""
+    table = User.__table__
+    return db.session.execute(select(table.c.vault_version).where(table.c.id == user_id)).scalar()
+
+
+def list_etag(version: int, query_string: bytes = b"") -> str:
+    """
+    Silný ETag odpovědi se seznamem: verze trezoru a parametry dotazu (jiná stránka
+    nebo filtr je jiná reprezentace).
+    """
+    params = hashlib.sha1(query_string).hexdigest()[:12] if query_string else "all"
+    return f"v{version}-{params}"